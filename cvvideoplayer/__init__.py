@@ -3,3 +3,4 @@ from .recorder import SimpleRecorder, AbstractRecorder
 from .video_players.create_video_player import create_video_player
 from .utils.bbox_utils import Bbox
 from .utils.video_player_utils import KeyFunction
+from .video_exporter import export_video
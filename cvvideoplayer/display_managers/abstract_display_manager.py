@@ -1,5 +1,8 @@
 import abc
 
+import cv2
+import numpy as np
+
 
 class DisplayManager(abc.ABC):
     @abc.abstractmethod
@@ -13,3 +16,19 @@ class DisplayManager(abc.ABC):
 
     @abc.abstractmethod
     def set_icon(self, window_id, window_name): ...
+
+    def show_frame(self, window_name: str, frame: np.ndarray) -> None:
+        cv2.imshow(winname=window_name, mat=frame)
+        cv2.pollKey()
+
+    def process_events(self, wait_ms: int = 0) -> None:
+        """
+        Lets the windows handle their pending events (e.g. repainting), waiting up to wait_ms milliseconds
+        """
+        if wait_ms > 0:
+            cv2.waitKey(wait_ms)
+        else:
+            cv2.pollKey()
+
+    def close_windows(self) -> None:
+        cv2.destroyAllWindows()
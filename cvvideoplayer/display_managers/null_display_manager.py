@@ -0,0 +1,50 @@
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import numpy as np
+
+from .abstract_display_manager import DisplayManager
+
+_NULL_WINDOW_ID = 1
+
+
+class NullDisplayManager(DisplayManager):
+    """
+    An offscreen display for running the player without a desktop (e.g. benchmarks and CI on servers). The player
+    window is always in focus, and the shown frames are collected instead of being drawn in a window.
+    """
+
+    def __init__(self, screen_size: Tuple[int, int] = (1920, 1080), max_collected_frames: Optional[int] = 1):
+        """
+        Args:
+            screen_size: the (width, height) the frames are fitted to, like the size of a real screen.
+            max_collected_frames: the number of latest shown frames that are kept in collected_frames, None to keep
+             all of them. The frames are kept as they are shown, without copying them.
+        """
+        self._screen_size = screen_size
+        self.collected_frames: Deque[np.ndarray] = deque(maxlen=max_collected_frames)
+        self.num_shown_frames = 0
+
+    def get_in_focus_window_id(self):
+        return _NULL_WINDOW_ID
+
+    def get_player_window_id(self, window_name):
+        return _NULL_WINDOW_ID
+
+    def get_screen_size(self):
+        return self._screen_size
+
+    def set_icon(self, window_id, window_name):
+        pass
+
+    def show_frame(self, window_name: str, frame: np.ndarray) -> None:
+        self.collected_frames.append(frame)
+        self.num_shown_frames += 1
+
+    def process_events(self, wait_ms: int = 0) -> None:
+        if wait_ms > 0:
+            time.sleep(wait_ms / 1000)
+
+    def close_windows(self) -> None:
+        pass
@@ -1,4 +1,4 @@
-from .base_frame_edit_callback import BaseFrameEditCallback
+from .base_frame_edit_callback import BaseFrameEditCallback, FrameResolution
 from .base_bbox_plotter import BaseBboxPlotter
 from .frame_normlizer import FrameNormalizer
 from .optical_flow_plotter import OpticalFlowPlotter
@@ -9,3 +9,4 @@ from .histogram_equalizer import HistogramEqualizer
 from .frame_snapshot import FrameSnapshot
 from .fit_frame_to_screen import FitFrameToScreen
 from .background_substraction import BackgroundSub
+from .latency_stats_overlay import LatencyStatsOverlay
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import numpy as np
 import cv2
 
@@ -5,6 +7,9 @@ from . import BaseFrameEditCallback
 
 
 class BackgroundSub(BaseFrameEditCallback):
+    memoize_output = False  # the background model depends on all the previously seen frames
+    warmup_frames = 500  # the history of the background model
+    concurrent_analysis = True  # the background model only reads the frames
 
     def __init__(
         self,
@@ -19,25 +24,28 @@ class BackgroundSub(BaseFrameEditCallback):
     def setup(self, video_player: "VideoPlayer", frame) -> None:
         self._back_sub = cv2.createBackgroundSubtractorMOG2(history=500, varThreshold=50, detectShadows=True)
 
+    def analyze_frame(self, video_player: "VideoPlayer", original_frame: np.ndarray, frame_num: int) -> np.ndarray:
+        if frame_num != self._prev_frame_num:
+            # the background model is only updated once per frame, also when the same frame is shown again
+            self._fg_mask = self._back_sub.apply(self._convert_to_gray(original_frame))
+            self._prev_frame_num = frame_num
+        return self._fg_mask
+
     def edit_frame(
         self,
         video_player: "VideoPlayer",
         frame: np.ndarray,
         original_frame: np.ndarray,
         frame_num: int,
+        analysis_result: Optional[np.ndarray] = None,
     ) -> np.ndarray:
 
-        if frame_num == self._prev_frame_num:
-            return self._fg_mask
+        if analysis_result is None:
+            # called without the analysis of the video player (e.g. directly or by a subclass)
+            analysis_result = self.analyze_frame(video_player, original_frame, frame_num)
 
-        gray_frame = self._convert_to_gray(original_frame)
-        fg_mask = self._back_sub.apply(gray_frame)
-        fg_mask = cv2.resize(fg_mask, (frame.shape[1], frame.shape[0]))
-
-        self._fg_mask = np.dstack([fg_mask] * 3)
-        self._prev_frame_num = frame_num
-
-        return self._fg_mask
+        fg_mask = cv2.resize(analysis_result, (frame.shape[1], frame.shape[0]))
+        return np.dstack([fg_mask] * 3)
 
     @staticmethod
     def _convert_to_gray(frame):
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Tuple, List
 
-from ..frame_editors import BaseFrameEditCallback
-from ..utils.bbox_utils import Bbox, BboxFormat
+from ..frame_editors import BaseFrameEditCallback, FrameResolution
+from ..utils.bbox_utils import Bbox
 from ..utils.drawing_utils import draw_rectangle, draw_label
 from ..utils.video_player_utils import KeyFunction
 
@@ -11,8 +11,12 @@ class BaseBboxPlotter(BaseFrameEditCallback, ABC):
     """
     An abstract class that can be used a parent to any FrameEditor that needs to print bounding boxes on the frame.
     The self._edit_frame is already implemented and instead the derived class must implement the "get_bboxes" method.
+    The bboxes are given in the pixel coordinates of the video source and are mapped to the edited frame with the
+    frame_transform of the video player, so they are drawn correctly on downscaled and zoomed frames.
     """
 
+    required_resolution = FrameResolution.display
+
     def __init__(
         self,
         enable_by_default: bool = False,
@@ -49,24 +53,14 @@ class BaseBboxPlotter(BaseFrameEditCallback, ABC):
             KeyFunction(key="ctrl+u", func=lambda: self._change_font_size(-0.1), description="decrease label size"),
         ]
 
-    def edit_frame(self, frame, frame_num, original_frame, **kwargs):
+    def edit_frame(self, video_player, frame, frame_num, original_frame, **kwargs):
         for bbox in self.get_bboxes(
             edited_frame=frame,
             original_frame=original_frame,
             frame_num=frame_num,
         ):
-            norm_bbox = bbox.get_normalized_bbox(
-                frame_width=original_frame.shape[1],
-                frame_height=original_frame.shape[0],
-                bbox_format=BboxFormat.xywh,
-            )
-
-            resized_bbox_coords = (
-                int(norm_bbox[0] * frame.shape[1]),
-                int(norm_bbox[1] * frame.shape[0]),
-                int(norm_bbox[2] * frame.shape[1]),
-                int(norm_bbox[3] * frame.shape[0]),
-            )
+            resized_bbox = video_player.frame_transform.map_bbox(bbox)
+            resized_bbox_coords = (resized_bbox.x1, resized_bbox.y1, resized_bbox.width, resized_bbox.height)
 
             draw_rectangle(
                 frame,
@@ -1,4 +1,5 @@
-from typing import List, TYPE_CHECKING, Optional
+from enum import Enum
+from typing import Any, List, TYPE_CHECKING, Optional
 
 import numpy as np
 
@@ -8,7 +9,32 @@ if TYPE_CHECKING:
     from ..video_players.base_video_player import VideoPlayer
 
 
+class FrameResolution(Enum):
+    native = "native"  # the callback needs the frames at the resolution of the video source
+    display = "display"  # the callback also works on frames that were downscaled to the size of the screen
+
+
 class BaseFrameEditCallback:
+    # callbacks that also work on downscaled frames should set this to FrameResolution.display, which lets the video
+    # player run them after fitting the frame to the screen and show proxy frames while playing and scrubbing (see
+    # VideoPlayer's use_proxy)
+    required_resolution = FrameResolution.native
+    # callbacks whose output only depends on the frame, the zoom of the video player and their own settings (see
+    # bump_state_version) can set this to True: while the video is paused their output is then reused as long as these
+    # did not change. Callbacks whose output depends on anything else (e.g. on previously seen frames) or that have side
+    # effects should keep it False
+    memoize_output = False
+    # export_video (see video_exporter.py) renders separate segments of the video in parallel, each with its own copy of
+    # the callback. Callbacks whose output depends on the previous frames should set warmup_frames to the number of
+    # frames they need to see before the first frame of a segment, or set must_run_sequentially to True if their output
+    # depends on all the previous frames
+    warmup_frames = 0
+    must_run_sequentially = False
+    # callbacks whose heavy part only reads the original frame (e.g. computing optical flow or a foreground mask) should
+    # move it to analyze_frame and set this to True. The video player runs the analyze_frame of all these callbacks
+    # concurrently on a thread pool (OpenCV releases the GIL while it computes), and then runs the edit_frame of all the
+    # callbacks in order, passing each its analysis_result
+    concurrent_analysis = False
 
     def __init__(
         self,
@@ -17,6 +43,7 @@ class BaseFrameEditCallback:
     ):
         self._enabled = enable_by_default
         self._enable_disable_key = enable_disable_key
+        self._state_version = 0
 
     """
     All implemented callbacks need to inherit this Base class
@@ -39,6 +66,16 @@ class BaseFrameEditCallback:
         Optionally define how the callback should close when the video player is closed
         """
 
+    def analyze_frame(self, video_player: "VideoPlayer", original_frame: np.ndarray, frame_num: int) -> Any:
+        """
+        Optionally analyze the frame before it is edited (see concurrent_analysis). It runs concurrently with the
+        analysis of the other callbacks, so it should only read the original frame and the frame reader of the video
+        player (e.g. for the previous frame), and not edit them or depend on frame_transform.
+
+        Returns: the analysis result, which is passed to edit_frame as analysis_result
+        """
+        return None
+
     def edit_frame(
         self,
         video_player: "VideoPlayer",
@@ -51,7 +88,8 @@ class BaseFrameEditCallback:
         after it has been altered in any way desirable by the user
 
         Args:
-            video_player: an instance fo VideoPlayer
+            video_player: an instance fo VideoPlayer, its frame_transform maps pixel coordinates in the frames of the
+             video source to pixel coordinates in the given frame (which may be downscaled and zoomed in)
             frame (): the frame to be edited and displayed
             frame_num ():
             original_frame () the frame before any alterations
@@ -63,6 +101,17 @@ class BaseFrameEditCallback:
     def enable_disable(self):
         self._enabled = not self._enabled
 
+    @property
+    def state_version(self) -> int:
+        return self._state_version
+
+    def bump_state_version(self) -> None:
+        """
+        Should be called whenever a setting that affects the output of edit_frame changes, so that memoized outputs
+        are not reused. The video player calls it after every key function registered by the callback.
+        """
+        self._state_version += 1
+
     @property
     def additional_keyboard_shortcuts(self) -> List[KeyFunction]:
         """
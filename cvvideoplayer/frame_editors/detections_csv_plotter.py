@@ -13,6 +13,8 @@ class DetectionsCsvPlotter(BaseBboxPlotter):
     frame_id,label,x1,y1,width,height,score
     """
 
+    memoize_output = True  # the detections are read once from the csv
+
     def __init__(
         self,
         detections_csv_path: Path,
@@ -1,14 +1,17 @@
 import numpy as np
-from .base_frame_edit_callback import BaseFrameEditCallback
+from .base_frame_edit_callback import BaseFrameEditCallback, FrameResolution
 
 
 class FitFrameToScreen(BaseFrameEditCallback):
+    required_resolution = FrameResolution.display
+    memoize_output = True
+
     def __init__(
         self,
         enable_by_default: bool = True,
     ):
         super().__init__(enable_by_default)
 
-    def edit_frame(self, video_player, frame: np.ndarray, **kwargs) -> np.ndarray:
-        frame = video_player.crop_and_resize_frame(frame)
+    def edit_frame(self, video_player, frame: np.ndarray, frame_num: int, **kwargs) -> np.ndarray:
+        frame = video_player.crop_and_resize_frame(frame, cache_key=(frame_num, id(self)))
         return frame
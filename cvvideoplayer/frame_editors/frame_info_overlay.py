@@ -2,11 +2,14 @@ from typing import Tuple
 
 import numpy as np
 
-from .base_frame_edit_callback import BaseFrameEditCallback
-from ..utils.drawing_utils import write_text_on_img
+from .base_frame_edit_callback import BaseFrameEditCallback, FrameResolution
+from ..utils.drawing_utils import CachedTextLayer, Text, write_text_on_img
 
 
 class FrameInfoOverlay(BaseFrameEditCallback):
+    required_resolution = FrameResolution.display
+    memoize_output = True
+
     def __init__(
         self,
         enable_by_default: bool = True,
@@ -19,6 +22,7 @@ class FrameInfoOverlay(BaseFrameEditCallback):
         self._font_scale = font_scale
         self._font_thickness = font_thickness
         self._tl_coordinate = top_left_coordinate
+        self._resolution_text_layer = CachedTextLayer()
 
     def edit_frame(
         self,
@@ -41,12 +45,42 @@ class FrameInfoOverlay(BaseFrameEditCallback):
             thickness=self._font_thickness,
         )
 
-        write_text_on_img(
+        resolution_text = f"{original_frame.shape[1]}x{original_frame.shape[0]}"
+        if video_player.is_editing_proxy:
+            resolution_text += " (proxy)"
+        # the resolution rarely changes, so it is drawn from a cached layer
+        self._resolution_text_layer.draw(
             frame,
-            f"{original_frame.shape[1]}x{original_frame.shape[0]}",
-            row=line,
-            col=self._tl_coordinate[1],
-            font_scale=self._font_scale / 1.5,
-            thickness=self._font_thickness,
+            [
+                Text(
+                    resolution_text,
+                    col=self._tl_coordinate[1],
+                    row=line,
+                    font_scale=self._font_scale / 1.5,
+                    thickness=self._font_thickness,
+                )
+            ],
         )
+
+        playback_text = self._get_playback_text(video_player)
+        if playback_text:
+            line_spacing = line - self._tl_coordinate[0]
+            write_text_on_img(
+                frame,
+                playback_text,
+                row=line + line_spacing,
+                col=self._tl_coordinate[1],
+                font_scale=self._font_scale / 1.5,
+                thickness=self._font_thickness,
+            )
         return frame
+
+    @staticmethod
+    def _get_playback_text(video_player) -> str:
+        texts = []
+        if video_player.playback_speed != 1:
+            texts.append(f"speed: {video_player.playback_speed:g}x")
+        playback_clock = video_player.playback_clock
+        if playback_clock is not None and playback_clock.is_running:
+            texts.append(f"dropped: {playback_clock.num_dropped_frames} late: {playback_clock.lateness_ms:.0f}ms")
+        return " ".join(texts)
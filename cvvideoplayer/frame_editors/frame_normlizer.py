@@ -2,11 +2,14 @@ from typing import Union
 
 import numpy as np
 
-from .base_frame_edit_callback import BaseFrameEditCallback
+from .base_frame_edit_callback import BaseFrameEditCallback, FrameResolution
 from ..utils.video_player_utils import KeyFunction
 
 
 class FrameNormalizer(BaseFrameEditCallback):
+    required_resolution = FrameResolution.display
+    memoize_output = True
+
     def __init__(
         self,
         enable_by_default: bool = True,
@@ -28,19 +31,20 @@ class FrameNormalizer(BaseFrameEditCallback):
             norm_factor = 2**8 - 1
         elif frame.dtype == "uint16":
             norm_factor = 2**16 - 1
+        elif frame.dtype.kind == "f":
+            norm_factor = 1  # float frames are expected to be in [0, 1] unless a dynamic range is set
         else:
-            raise ValueError(f"image must be either Uint8 or Uint16 but got {frame.dtype}")
+            raise ValueError(f"image must be either Uint8, Uint16 or float but got {frame.dtype}")
 
         frame = frame.astype("float")
         frame /= norm_factor
 
         if self._range_min or self._range_max:
-            norm_min = int(self._range_min) / norm_factor if self._range_min else 0
-            norm_max = int(self._range_max) / norm_factor if self._range_max else norm_factor
+            norm_min = float(self._range_min) / norm_factor if self._range_min else 0
+            norm_max = float(self._range_max) / norm_factor if self._range_max else norm_factor
             frame = (frame - norm_min) / (norm_max - norm_min)
-            frame = np.clip(frame, 0, 1)
 
-        frame = (frame * 255).astype("uint8")
+        frame = (np.clip(frame, 0, 1) * 255).astype("uint8")
         return frame
 
     def _set_dynamic_range(self):
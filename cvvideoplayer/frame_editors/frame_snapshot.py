@@ -11,6 +11,8 @@ class FrameSnapshot(BaseFrameEditCallback):
     In charge of saving a specific frame to a file
     """
 
+    memoize_output = False  # saving the frame is a side effect
+
     def __init__(self, output_video_path: Path, output_shape: Tuple[int, int], frame_num: int):
         super().__init__(enable_by_default=True)
         self._output_video_path = output_video_path
@@ -1,10 +1,13 @@
 import numpy as np
 
-from .base_frame_edit_callback import BaseFrameEditCallback
+from .base_frame_edit_callback import BaseFrameEditCallback, FrameResolution
 from ..utils.video_player_utils import hist_eq, KeyFunction
 
 
 class HistogramEqualizer(BaseFrameEditCallback):
+    required_resolution = FrameResolution.display
+    memoize_output = True
+
     def __init__(
         self,
         enable_by_default: bool = False,
@@ -1,12 +1,15 @@
-from typing import Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 
-from ..utils.drawing_utils import write_text_on_img
-from .base_frame_edit_callback import BaseFrameEditCallback
+from ..utils.drawing_utils import CachedTextLayer, Text
+from .base_frame_edit_callback import BaseFrameEditCallback, FrameResolution
 
 
 class KeyMapOverlay(BaseFrameEditCallback):
+    required_resolution = FrameResolution.display
+    memoize_output = True
+
     def __init__(
         self,
         enable_by_default: bool = True,
@@ -21,54 +24,65 @@ class KeyMapOverlay(BaseFrameEditCallback):
         self._font_thickness = font_thickness
         self._font_color = font_color
         self._tl_coordinate = top_left_coordinate
+        self._text_layer = CachedTextLayer()
 
     def edit_frame(self, video_player, frame: np.ndarray, frame_num: int, **kwargs) -> np.ndarray:
-        row = self._tl_coordinate[0]
-        write_text_on_img(
-            frame,
-            "Available keyboard shortcuts (hide with ctrl+k):",
-            row=row,
-            col=self._tl_coordinate[1],
-            font_scale=self._font_scale * 1.2,
-            thickness=self._font_thickness + 1,
-            color=self._font_color,
-        )
-        row += int(30 * self._font_scale)
-
-        keymap_description = video_player.input_handler.get_keymap_description()
+        keymap_description = dict(video_player.input_handler.get_keymap_description())
         if hasattr(video_player, "second_input_handler"):
             keymap_description.update(video_player.second_input_handler.get_keymap_description())
 
-        for callback_name, keys in video_player.input_handler.get_keymap_description().items():
-            write_text_on_img(
-                frame,
-                f"{callback_name}:",
+        # the texts only change when the keymap changes, so they are drawn from a cached layer
+        self._text_layer.draw(frame, self._get_texts(keymap_description))
+        return frame
+
+    def _get_texts(self, keymap_description: Dict[str, List[Tuple[str, str]]]) -> List[Text]:
+        row = self._tl_coordinate[0]
+        col = self._tl_coordinate[1]
+        texts = [
+            Text(
+                "Available keyboard shortcuts (hide with ctrl+k):",
+                col=col,
                 row=row,
-                col=self._tl_coordinate[1],
-                font_scale=self._font_scale,
+                font_scale=self._font_scale * 1.2,
                 thickness=self._font_thickness + 1,
                 color=self._font_color,
             )
-            row += int(20 * self._font_scale)
-            for key, desc in keys:
-                write_text_on_img(
-                    frame,
-                    key,
+        ]
+        row += int(30 * self._font_scale)
+
+        for callback_name, keys in keymap_description.items():
+            texts.append(
+                Text(
+                    f"{callback_name}:",
+                    col=col,
                     row=row,
-                    col=self._tl_coordinate[1],
                     font_scale=self._font_scale,
-                    thickness=self._font_thickness,
+                    thickness=self._font_thickness + 1,
                     color=self._font_color,
                 )
-                write_text_on_img(
-                    frame,
-                    f": {desc}",
-                    row=row,
-                    col=self._tl_coordinate[1] + 150,
-                    font_scale=self._font_scale,
-                    thickness=self._font_thickness,
-                    color=self._font_color,
+            )
+            row += int(20 * self._font_scale)
+            for key, desc in keys:
+                texts.append(
+                    Text(
+                        key,
+                        col=col,
+                        row=row,
+                        font_scale=self._font_scale,
+                        thickness=self._font_thickness,
+                        color=self._font_color,
+                    )
+                )
+                texts.append(
+                    Text(
+                        f": {desc}",
+                        col=col + 150,
+                        row=row,
+                        font_scale=self._font_scale,
+                        thickness=self._font_thickness,
+                        color=self._font_color,
+                    )
                 )
                 row += int(20 * self._font_scale)
             row += int(10 * self._font_scale)
-        return frame
+        return texts
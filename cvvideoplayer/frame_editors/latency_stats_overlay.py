@@ -0,0 +1,74 @@
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from .base_frame_edit_callback import BaseFrameEditCallback, FrameResolution
+from ..utils.drawing_utils import write_text_on_img
+from ..utils.video_player_utils import KeyFunction
+
+
+class LatencyStatsOverlay(BaseFrameEditCallback):
+    """
+    Shows the rolling p50/p95/p99 latencies of every stage of playing a frame (decode, each enabled frame edit
+    callback, record and display), as timed by the latency_tracker of the video player, at the bottom left of the
+    frame. The spans timed so far can be exported as a Chrome/Perfetto trace.
+    """
+
+    required_resolution = FrameResolution.display
+    memoize_output = False  # the latencies change on every frame
+
+    def __init__(
+        self,
+        enable_by_default: bool = False,
+        enable_disable_key: str = "ctrl+l",
+        export_trace_key: str = "ctrl+t",
+        trace_dir: Path = Path("./outputs"),
+        font_scale: float = 1,
+        font_thickness: int = 1,
+        font_color: Tuple[int, int, int] = (125, 255, 255),
+        bottom_left_coordinate: Tuple[int, int] = (10, 10),
+    ):
+        super().__init__(enable_by_default, enable_disable_key)
+        self._export_trace_key = export_trace_key
+        self._trace_dir = Path(trace_dir)
+        self._font_scale = font_scale
+        self._font_thickness = font_thickness
+        self._font_color = font_color
+        self._bl_coordinate = bottom_left_coordinate
+        self._video_player = None
+
+    def setup(self, video_player, frame) -> None:
+        self._video_player = video_player
+
+    @property
+    def additional_keyboard_shortcuts(self) -> List[KeyFunction]:
+        return [KeyFunction(self._export_trace_key, self._export_trace, "Export a trace of the frame latencies")]
+
+    def edit_frame(self, video_player, frame: np.ndarray, frame_num: int, **kwargs) -> np.ndarray:
+        rows = [("stage", "p50 ms", "p95 ms", "p99 ms")]
+        for stage, latency in video_player.latency_tracker.get_stage_latencies().items():
+            rows.append((stage, f"{latency.p50_ms:.1f}", f"{latency.p95_ms:.1f}", f"{latency.p99_ms:.1f}"))
+
+        line_spacing = int(20 * self._font_scale)
+        column_cols = [self._bl_coordinate[1] + int(offset * self._font_scale) for offset in (0, 180, 250, 320)]
+        row = frame.shape[0] - self._bl_coordinate[0] - line_spacing * len(rows)
+        for cells in rows:
+            for col, cell in zip(column_cols, cells):
+                write_text_on_img(
+                    frame,
+                    cell,
+                    col=col,
+                    row=row,
+                    font_scale=self._font_scale,
+                    color=self._font_color,
+                    thickness=self._font_thickness,
+                )
+            row += line_spacing
+        return frame
+
+    def _export_trace(self) -> None:
+        trace_path = self._trace_dir / f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        self._video_player.latency_tracker.export_chrome_trace(trace_path)
+        print(f"Saved the trace of the frame latencies to {trace_path}, open it in https://ui.perfetto.dev")
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import numpy as np
 import cv2
 
@@ -5,6 +7,8 @@ from . import BaseFrameEditCallback
 
 
 class OpticalFlowPlotter(BaseFrameEditCallback):
+    memoize_output = True
+    concurrent_analysis = True  # the optical flow only reads the frame and the previous frame
 
     def __init__(
         self,
@@ -17,23 +21,36 @@ class OpticalFlowPlotter(BaseFrameEditCallback):
         self._min_arrow_size_to_draw = min_arrow_size_to_draw
         self._draw_every_n_arrow = draw_every_n_arrow
 
+    def analyze_frame(
+        self, video_player: "VideoPlayer", original_frame: np.ndarray, frame_num: int
+    ) -> Optional[np.ndarray]:
+        if frame_num == 0:
+            return None
+
+        prev_frame = video_player.frame_reader.get_frame(frame_num - 1)
+        if prev_frame is None:
+            return None  # dropped from the buffer of a live stream
+        gray_frame, prev_gray_frame = self._convert_frames_to_gray(original_frame, prev_frame)
+        return self._calc_optical_flow(gray_frame, prev_gray_frame)
+
     def edit_frame(
         self,
         video_player: "VideoPlayer",
         frame: np.ndarray,
         original_frame: np.ndarray,
         frame_num: int,
+        analysis_result: Optional[np.ndarray] = None,
     ) -> np.ndarray:
 
-        if frame_num == 0:
-            return frame
+        if analysis_result is None:
+            # called without the analysis of the video player (e.g. directly or by a subclass)
+            analysis_result = self.analyze_frame(video_player, original_frame, frame_num)
+            if analysis_result is None:
+                return frame
 
-        prev_frame = video_player.frame_reader.get_frame(frame_num - 1)
-        gray_frame, prev_gray_frame = self._convert_frames_to_gray(original_frame, prev_frame)
-        flow = self._calc_optical_flow(gray_frame, prev_gray_frame)
         frame = self._create_optical_flow_arrows_image(
             frame=frame,
-            optical_flow_image=flow,
+            optical_flow_image=analysis_result,
         )
 
         return frame
@@ -1,13 +1,44 @@
 import abc
+import hashlib
+import os
 import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import contextmanager
+from enum import Enum
 from pathlib import Path
 import mimetypes
-from typing import Optional
+from typing import Optional, Dict, Deque, Tuple, Callable, Union, Sequence, Iterator, List, BinaryIO
 
 import cv2
 import numpy as np
 
+from .utils.cache_utils import CacheStats, LRUByteCache, get_cache_dir
+from .utils.video_index_utils import load_or_build_video_index, VideoIndex
+from .utils.archive_utils import ARCHIVE_SUFFIXES, load_or_build_archive_index, read_archive_member
+from .utils.frame_listing_utils import (
+    extract_digits_from_str,
+    get_dir_mtime,
+    get_extension,
+    list_frame_dir,
+    load_frame_dir_manifest,
+    save_frame_dir_manifest,
+)
+
 RANDOM_STATE = random.Random(42)
+# (decode scale, flag for color images, flag for grayscale images), from the most reduced decoding
+REDUCED_IMREAD_FLAGS = [
+    (8, cv2.IMREAD_REDUCED_COLOR_8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+]
+# seeking costs about as much as decoding a group of pictures, so shorter gaps are skipped by grabbing instead
+MAX_FRAMES_TO_GRAB = 32
+# a seek costs about as much as grabbing a few frames, so keyframes that are closer are reached by grabbing
+MIN_FRAMES_TO_SKIP_BY_SEEKING_KEYFRAME = 4
+# frames decoded at once while playing a video backwards, two chunks of them are held in memory
+REVERSE_PLAYBACK_CHUNK_SIZE = 16
 
 
 class FrameReader(abc.ABC):
@@ -23,6 +54,88 @@ class FrameReader(abc.ABC):
     def __len__(self) -> int:
         pass
 
+    def teardown(self) -> None:
+        """
+        Optionally release any resources held by the reader (threads, file handles) when the video player is closed
+        """
+
+    @property
+    def is_live(self) -> bool:
+        """
+        True for readers of live streams, whose length grows while the video is played (see LiveStreamReader)
+        """
+        return False
+
+    @property
+    def fps(self) -> Optional[float]:
+        """
+        The frame rate of the video, None if it is unknown (e.g. for directories of frames)
+        """
+        return None
+
+    def get_timestamp_ms(self, frame_num: int) -> Optional[float]:
+        """
+        The presentation timestamp of the frame in milliseconds, None if it is unknown. By default it is derived from
+        the frame rate, readers of videos with a variable frame rate override this method.
+        """
+        if self.fps is None:
+            return None
+        return frame_num * 1000 / self.fps
+
+    def get_keyframe_nums(self) -> Optional[np.ndarray]:
+        """
+        The sorted frame numbers of the frames that can be decoded without decoding the frames before them, None if
+        every frame can be (e.g. for directories of frames) or if they are unknown. Fast forward decodes only them.
+        """
+        return None
+
+    @property
+    def oldest_buffered_frame(self) -> int:
+        """
+        The first frame that can still be read. Readers that keep only the latest frames (e.g. LiveStreamReader)
+        return None for the frames before it.
+        """
+        return 0
+
+    def set_reverse_playback(self, is_reverse: bool) -> None:
+        """
+        Called by the video player when it starts playing and after it stops. Readers that read frames faster in a
+        different way when they are requested backwards (see LocalVideoFileReader) do so only while is_reverse is True.
+        """
+        pass
+
+    def get_frames(self, frame_nums: Sequence[int]) -> np.ndarray:
+        """
+        Returns the requested frames stacked in a single array of shape (len(frame_nums), H, W[, C]).
+        Readers that can read several frames at once more efficiently than one by one override this method.
+        """
+        frame_nums = self._validate_frame_nums(frame_nums)
+        first_frame = self.get_frame(frame_nums[0])
+        frames = np.empty((len(frame_nums), *first_frame.shape), dtype=first_frame.dtype)
+        frames[0] = first_frame
+        for i, frame_num in enumerate(frame_nums[1:], start=1):
+            frames[i] = self.get_frame(frame_num)
+        return frames
+
+    def iter_frames(
+        self, start: int = 0, stop: Optional[int] = None, step: int = 1, batch_size: int = 32
+    ) -> Iterator[np.ndarray]:
+        """
+        Iterates over the frames in range(start, stop, step), which are read batch_size frames at a time with
+        get_frames
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for batch_start in range(start, stop, step * batch_size):
+            yield from self.get_frames(range(batch_start, min(stop, batch_start + step * batch_size), step))
+
+    def _validate_frame_nums(self, frame_nums: Sequence[int]) -> List[int]:
+        frame_nums = [int(frame_num) for frame_num in frame_nums]
+        assert len(frame_nums) > 0, "no frames were requested"
+        for frame_num in frame_nums:
+            if not 0 <= frame_num < len(self):
+                raise IndexError(f"frame number = {frame_num} is out of range, the video has {len(self)} frames")
+        return frame_nums
+
 
 class LocalFrameReader(FrameReader):
     """
@@ -46,56 +159,1133 @@ class LocalFrameReader(FrameReader):
     def get_frame(self, frame_num: int):
         return self._reader.get_frame(frame_num)
 
+    def get_frames(self, frame_nums):
+        return self._reader.get_frames(frame_nums)
+
     def __len__(self):
         return len(self._reader)
 
+    def set_reverse_playback(self, is_reverse: bool) -> None:
+        self._reader.set_reverse_playback(is_reverse)
+
+    def teardown(self):
+        self._reader.teardown()
+
 
 class LocalVideoFileReader(FrameReader):
-    def __init__(self, local_video_path: str):
+    def __init__(self, local_video_path: str, use_seek_index: bool = False, reverse_chunk_size: int = 0):
+        """
+        Args:
+            local_video_path: path to a local video file.
+            use_seek_index: if True, an index of the keyframes and frame timestamps is built on the first open and
+            saved next to the video (see utils/video_index_utils.py). It gives an exact frame count and frame-accurate
+            seeks that only decode forward from the nearest keyframe.
+            reverse_chunk_size: if given, frames that are requested backwards are always decoded in chunks of this
+            many frames (see _ReverseChunkDecoder). By default it is done only while the video player plays backwards,
+            and a step backwards while paused seeks to the frame instead.
+        """
         self._video_path = Path(local_video_path)
         assert self._video_path.is_file()
-        self._video_reader = cv2.VideoCapture(str(self._video_path))
-        self._total_frames = int(self._video_reader.get(cv2.CAP_PROP_FRAME_COUNT))
-        self._last_frame = -1
+        self._index = load_or_build_video_index(self._video_path) if use_seek_index else None
+        self._decoder = _VideoDecoder(self._video_path, self._index)
+        if self._index is not None:
+            self._total_frames = self._index.frame_count
+        else:
+            self._total_frames = self._decoder.estimated_frame_count
+        self._reverse_chunk_size = reverse_chunk_size
+        self._reverse_decoder: Optional[_ReverseChunkDecoder] = None
+        if reverse_chunk_size > 0:
+            self._reverse_decoder = _ReverseChunkDecoder(self._video_path, self._index, reverse_chunk_size)
+        self._last_requested_frame = -1
+        # callbacks often ask for the previous frame as well, it should not be mistaken for a step backwards
+        self._recent_frames: Deque[Tuple[int, np.ndarray]] = deque(maxlen=2)
 
     def get_frame(self, frame_num):
         if frame_num >= len(self):
             return
-        if not frame_num == self._last_frame + 1:
-            self._video_reader.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-        ret, frame = self._video_reader.read()
-        assert ret, f"frame number = {frame_num} is corrupted"
-        self._last_frame = frame_num
+        frame = next((frame for recent_frame_num, frame in self._recent_frames if recent_frame_num == frame_num), None)
+        if frame is None and self._reverse_decoder is not None:
+            frame = self._reverse_decoder.get_frame(frame_num, self._last_requested_frame, self._decoder)
+        if frame is None:
+            # frames skipped while playing (e.g. to keep up with real time) are grabbed without decoding them
+            frame = self._decoder.read(frame_num, max_frames_to_grab=MAX_FRAMES_TO_GRAB)
+            self._recent_frames.append((frame_num, frame))
+        self._last_requested_frame = frame_num
         return frame
 
+    def get_frames(self, frame_nums):
+        """
+        The frames are decoded in increasing order, so that a batch of nearby frames costs at most one seek followed by
+        sequential decoding (small gaps between the frames are skipped by grabbing without decoding)
+        """
+        frame_nums = self._validate_frame_nums(frame_nums)
+        frames = None
+        for i in sorted(range(len(frame_nums)), key=lambda i: frame_nums[i]):
+            frame_num = frame_nums[i]
+            frame = next((frame for recent_num, frame in self._recent_frames if recent_num == frame_num), None)
+            if frame is None:
+                frame = self._decoder.read(frame_num, max_frames_to_grab=MAX_FRAMES_TO_GRAB)
+                self._recent_frames.append((frame_num, frame))
+            if frames is None:
+                frames = np.empty((len(frame_nums), *frame.shape), dtype=frame.dtype)
+            frames[i] = frame
+        self._last_requested_frame = max(frame_nums)
+        return frames
+
     def __len__(self):
         return self._total_frames
 
+    @property
+    def fps(self) -> Optional[float]:
+        return self._decoder.fps
+
+    def get_timestamp_ms(self, frame_num: int) -> Optional[float]:
+        if self._index is not None:
+            return float(self._index.timestamps_ms[min(frame_num, self._index.frame_count - 1)])
+        return super().get_timestamp_ms(frame_num)
+
+    def get_keyframe_nums(self) -> Optional[np.ndarray]:
+        return self._index.keyframes if self._index is not None else None
+
+    def set_reverse_playback(self, is_reverse: bool) -> None:
+        if self._reverse_chunk_size > 0:
+            return  # backward frames are always decoded in chunks
+        if is_reverse and self._reverse_decoder is None:
+            self._reverse_decoder = _ReverseChunkDecoder(self._video_path, self._index, REVERSE_PLAYBACK_CHUNK_SIZE)
+        elif not is_reverse and self._reverse_decoder is not None:
+            self._reverse_decoder.release()
+            self._reverse_decoder = None
+
+    def teardown(self):
+        if self._reverse_decoder is not None:
+            self._reverse_decoder.release()
+        self._decoder.release()
+
+
+class _VideoDecoder:
+    """
+    Reads frames from a video file by number, seeking only when the requested frame is not the next one
+    """
+
+    def __init__(self, video_path: Path, index: Optional[VideoIndex]):
+        self._video_reader = cv2.VideoCapture(str(video_path))
+        self._index = index
+        self.last_frame = -1
+
+    @property
+    def estimated_frame_count(self) -> int:
+        return int(self._video_reader.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    @property
+    def fps(self) -> Optional[float]:
+        fps = self._video_reader.get(cv2.CAP_PROP_FPS)
+        return fps if fps > 0 else None
+
+    def read(self, frame_num: int, max_frames_to_grab: int = 0) -> np.ndarray:
+        """
+        Args:
+            frame_num: the number of the frame to read.
+            max_frames_to_grab: frames that are at most this many frames ahead of the last read frame are reached by
+            grabbing (reading without decoding) the frames in between instead of seeking.
+        """
+        # seeking to a keyframe decodes only the keyframe, which is faster than grabbing many frames before it
+        frames_to_grab = frame_num - self.last_frame - 1
+        seek_to_keyframe = (
+            frames_to_grab >= MIN_FRAMES_TO_SKIP_BY_SEEKING_KEYFRAME
+            and self._index is not None
+            and self._index.keyframes is not None
+            and self._index.get_keyframe_before(frame_num) == frame_num
+        )
+        if 0 < frames_to_grab <= max_frames_to_grab and not seek_to_keyframe:
+            for _ in range(frames_to_grab):
+                self._video_reader.grab()
+            self.last_frame = frame_num - 1
+
+        if frame_num == self.last_frame + 1:
+            ret, frame = self._video_reader.read()
+        elif self._index is not None and self._index.keyframes is not None:
+            ret, frame = self._read_using_index(frame_num)
+        else:
+            self._video_reader.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
+            ret, frame = self._video_reader.read()
+        assert ret, f"frame number = {frame_num} is corrupted"
+        self.last_frame = frame_num
+        return frame
+
+    def release(self) -> None:
+        self._video_reader.release()
+
+    def _read_using_index(self, frame_num):
+        keyframe = self._index.get_keyframe_before(frame_num)
+        if not keyframe <= self.last_frame < frame_num:
+            self._video_reader.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+
+        while self._video_reader.grab():
+            # the decoded frame is identified by its timestamp since seeking may land on a wrong frame
+            decoded_frame_num = self._index.get_frame_num(self._video_reader.get(cv2.CAP_PROP_POS_MSEC))
+            if decoded_frame_num == frame_num:
+                return self._video_reader.retrieve()
+            if decoded_frame_num > frame_num:
+                assert keyframe > 0, f"could not seek to frame number = {frame_num}"
+                keyframe = self._index.get_keyframe_before(keyframe - 1)
+                self._video_reader.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+        return False, None
+
+
+class _ReverseChunkDecoder:
+    """
+    Serves the frames of a video that are requested backwards (stepping back or playing in reverse). Instead of
+    seeking for every frame, the chunk of frames ending at the requested frame is decoded forward once, starting at
+    its keyframe when a seek index is available, and the frames are then served from memory. The chunk before it is
+    decoded in a background thread with a second decoder, so that reverse playback does not stall at chunk borders.
+    """
+
+    def __init__(self, video_path: Path, index: Optional[VideoIndex], chunk_size: int):
+        self._video_path = video_path
+        self._index = index
+        self._chunk_size = chunk_size
+        # opened on the first chunk, since most readers never get a backward request
+        self._background_decoder: Optional[_VideoDecoder] = None
+        self._chunk: Dict[int, np.ndarray] = {}
+        self._previous_chunk: Dict[int, np.ndarray] = {}
+        self._prefetch_thread: Optional[threading.Thread] = None
+
+    def get_frame(self, frame_num: int, last_requested_frame: int, decoder: _VideoDecoder) -> Optional[np.ndarray]:
+        """
+        Returns the frame if it is (or should be) served from a chunk, or None if it should be read normally
+        """
+        if frame_num in self._chunk:
+            return self._chunk[frame_num]
+
+        if not 0 < last_requested_frame - frame_num <= self._chunk_size:
+            self._chunk = {}
+            return None
+
+        self._wait_for_prefetch()
+        if frame_num in self._previous_chunk:
+            self._chunk = self._previous_chunk
+        else:
+            chunk_frame_nums = range(self._get_chunk_start(frame_num), frame_num + 1)
+            self._chunk = {chunk_frame_num: decoder.read(chunk_frame_num) for chunk_frame_num in chunk_frame_nums}
+
+        chunk_start = min(self._chunk)
+        self._previous_chunk = {}
+        if chunk_start > 0:
+            self._prefetch_thread = threading.Thread(target=self._decode_previous_chunk, args=(chunk_start - 1,))
+            self._prefetch_thread.start()
+        return self._chunk[frame_num]
+
+    def release(self) -> None:
+        self._wait_for_prefetch()
+        self._chunk, self._previous_chunk = {}, {}
+        if self._background_decoder is not None:
+            self._background_decoder.release()
+
+    def _get_chunk_start(self, chunk_end: int) -> int:
+        start = max(0, chunk_end - self._chunk_size + 1)
+        if self._index is not None and self._index.keyframes is not None:
+            start = max(start, self._index.get_keyframe_before(chunk_end))
+        return start
+
+    def _decode_previous_chunk(self, chunk_end: int) -> None:
+        if self._background_decoder is None:
+            self._background_decoder = _VideoDecoder(self._video_path, self._index)
+        chunk_frame_nums = range(self._get_chunk_start(chunk_end), chunk_end + 1)
+        self._previous_chunk = {frame_num: self._background_decoder.read(frame_num) for frame_num in chunk_frame_nums}
+
+    def _wait_for_prefetch(self) -> None:
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+
 
 class LocalDirReader(FrameReader):
-    def __init__(self, local_frame_dir):
+    def __init__(
+        self,
+        local_frame_dir,
+        num_decode_threads: Optional[int] = None,
+        decode_ahead: int = 16,
+        target_size: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        Args:
+            local_frame_dir: path to a directory containing frames as single images. the images need to contain an
+            integer in their name specifying the frame order.
+            num_decode_threads: number of threads decoding images concurrently (default is min(8, number of cores)).
+            decode_ahead: number of frames decoded ahead of the last requested frame. Set to 0 to decode every image
+            only when it is requested.
+            target_size: if given, the (width, height) the frames are displayed at. JPEG frames are then decoded at
+            1/2, 1/4 or 1/8 of their resolution when that is still at least the target size, which is several times
+            faster. Other formats (e.g. lossless or 16 bit images) are always decoded at full resolution.
+        """
         self.local_frame_dir = local_frame_dir
-        self._frame_paths = self._create_frame_list()
+        self._decode_pool = None
+        self._frame_names = self._create_frame_list()
+        self._frame_list_refresh: Optional[threading.Thread] = None
+        if self._frame_list_is_outdated:
+            self._frame_list_refresh = threading.Thread(target=self._refresh_frame_list, daemon=True)
+            self._frame_list_refresh.start()
+
+        self.decode_scale = 1
+        self._imread_flags = cv2.IMREAD_UNCHANGED
+        if target_size is not None:
+            self._set_reduced_decoding(target_size)
+
+        if decode_ahead > 0:
+            self._decode_pool = _DecodeAheadPool(
+                decode_func=self._read_image,
+                get_num_frames=self.__len__,
+                num_threads=num_decode_threads or min(8, os.cpu_count() or 1),
+                decode_ahead=decode_ahead,
+            )
 
     def _create_frame_list(self):
-        self._frame_paths = list(Path(self.local_frame_dir).glob("*"))
-        self._frame_paths = [path for path in self._frame_paths if mimetypes.guess_type(path)[0].startswith("image")]
+        frame_names, is_up_to_date = load_frame_dir_manifest(Path(self.local_frame_dir))
+        # an outdated listing is used until the directory is listed again in the background
+        self._frame_list_is_outdated = frame_names is not None and not is_up_to_date
+        if frame_names is None:
+            frame_names = self._list_frame_dir()
 
-        if len(self._frame_paths) == 0:
+        if len(frame_names) == 0:
             raise (Exception(f"No image files found in dir {self.local_frame_dir}"))
+        return frame_names
+
+    def _list_frame_dir(self):
+        frame_dir = Path(self.local_frame_dir)
+        # the modification time is taken before listing so that changes made during the listing are noticed next time
+        dir_mtime = get_dir_mtime(frame_dir)
+        frame_names = list_frame_dir(frame_dir)
+        save_frame_dir_manifest(frame_dir, frame_names, dir_mtime)
+        return frame_names
+
+    def _refresh_frame_list(self):
+        frame_names = self._list_frame_dir()
+        if len(frame_names) > 0:
+            self._frame_names = frame_names
+            if self._decode_pool is not None:
+                # the decoded frames are numbered by the outdated listing
+                self._decode_pool.clear()
+
+    def get_frame(self, frame_num):
+        if frame_num >= len(self):
+            return
+        if self._decode_pool is not None:
+            return self._decode_pool.get_frame(frame_num)
+        return self._read_image(frame_num)
+
+    def get_frames(self, frame_nums):
+        """
+        The images are decoded in parallel by the threads of the decode pool
+        """
+        if self._decode_pool is None:
+            return super().get_frames(frame_nums)
+        return self._decode_pool.decode_batch(self._validate_frame_nums(frame_nums))
 
-        self._frame_paths = sorted(self._frame_paths, key=lambda x: int(extract_digits_from_str(x.stem)))
-        return self._frame_paths
+    def _set_reduced_decoding(self, target_size: Tuple[int, int]) -> None:
+        # only the JPEG decoder skips work when decoding at a reduced resolution, other decoders decode and then resize
+        if get_extension(self._frame_names[0]).lower() not in (".jpg", ".jpeg"):
+            return
+        first_frame = self._read_image(0)
+        if first_frame.dtype != np.uint8 or (first_frame.ndim == 3 and first_frame.shape[2] != 3):
+            return
+
+        for decode_scale, color_flag, grayscale_flag in REDUCED_IMREAD_FLAGS:
+            frame_h, frame_w = first_frame.shape[:2]
+            if frame_w // decode_scale >= target_size[0] and frame_h // decode_scale >= target_size[1]:
+                self.decode_scale = decode_scale
+                # IMREAD_UNCHANGED ignores the EXIF orientation so the reduced decoding should ignore it as well
+                reduced_flag = grayscale_flag if first_frame.ndim == 2 else color_flag
+                self._imread_flags = reduced_flag | cv2.IMREAD_IGNORE_ORIENTATION
+                return
+
+    def _read_image(self, frame_num):
+        frame_path = os.path.join(self.local_frame_dir, self._frame_names[frame_num])
+        img = cv2.imread(frame_path, self._imread_flags)
+        if img is None and self._frame_list_refresh is not None:
+            # the image may have been deleted since the outdated listing was saved, the frame is read from the new
+            # listing (which skips it) once the directory is listed again
+            self._frame_list_refresh.join()
+            if frame_num < len(self):
+                frame_path = os.path.join(self.local_frame_dir, self._frame_names[frame_num])
+                img = cv2.imread(frame_path, self._imread_flags)
+        assert img is not None, f"no image found in {frame_path}"
+        return img
+
+    def __len__(self):
+        return len(self._frame_names)
+
+    def teardown(self):
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown()
+
+
+class ArchiveFrameReader(FrameReader):
+    """
+    Reads frames from a zip or an uncompressed tar archive of images without extracting it. An index of the offsets
+    of the images in the archive is built on the first open and saved in the cache dir (see utils/archive_utils.py),
+    after which every frame is read by seeking to its data. The frames are ordered by the number in their file names,
+    like in LocalDirReader.
+
+    Example:
+        video_source = ArchiveFrameReader("frames.zip")
+    """
+
+    def __init__(self, archive_path, num_decode_threads: Optional[int] = None, decode_ahead: int = 16):
+        """
+        Args:
+            archive_path: path to a .zip or .tar file containing frames as single images.
+            num_decode_threads: number of threads reading and decoding images concurrently (default is min(8, number
+            of cores)), each thread reads the archive through its own file handle.
+            decode_ahead: number of frames decoded ahead of the last requested frame. Set to 0 to decode every image
+            only when it is requested.
+        """
+        self._archive_path = Path(archive_path)
+        self._members = load_or_build_archive_index(self._archive_path)
+        if len(self._members) == 0:
+            raise Exception(f"No image files found in archive {archive_path}")
+        self._file_handles = _FileHandlePool(self._archive_path)
+
+        self._decode_pool = None
+        if decode_ahead > 0:
+            self._decode_pool = _DecodeAheadPool(
+                decode_func=self._read_image,
+                get_num_frames=self.__len__,
+                num_threads=num_decode_threads or min(8, os.cpu_count() or 1),
+                decode_ahead=decode_ahead,
+            )
 
     def get_frame(self, frame_num):
         if frame_num >= len(self):
             return
-        img = cv2.imread(str(self._frame_paths[frame_num]), -1)
-        assert img is not None, f"no image found in {self._frame_paths[frame_num]}"
+        if self._decode_pool is not None:
+            return self._decode_pool.get_frame(frame_num)
+        return self._read_image(frame_num)
+
+    def get_frames(self, frame_nums):
+        if self._decode_pool is None:
+            return super().get_frames(frame_nums)
+        return self._decode_pool.decode_batch(self._validate_frame_nums(frame_nums))
+
+    def _read_image(self, frame_num):
+        member = self._members[frame_num]
+        with self._file_handles.acquire() as archive_file:
+            data = read_archive_member(archive_file, member)
+        img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        assert img is not None, f"could not decode {member.name} in {self._archive_path}"
         return img
 
     def __len__(self):
-        return len(self._frame_paths)
+        return len(self._members)
+
+    def teardown(self):
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown()
+        self._file_handles.close()
+
+
+class _FileHandlePool:
+    """
+    Open handles of the same file that are lent to one thread at a time, so that several threads can seek and read
+    the file concurrently. A new handle is opened only when all the open handles are in use.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._free_handles = []
+        self._all_handles = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self) -> Iterator[BinaryIO]:
+        with self._lock:
+            if self._free_handles:
+                handle = self._free_handles.pop()
+            else:
+                handle = open(self._path, "rb")
+                self._all_handles.append(handle)
+        try:
+            yield handle
+        finally:
+            with self._lock:
+                self._free_handles.append(handle)
+
+    def close(self) -> None:
+        with self._lock:
+            for handle in self._all_handles:
+                handle.close()
+            self._all_handles.clear()
+            self._free_handles.clear()
+
+
+class _DecodeAheadPool:
+    """
+    Decodes frames in a thread pool ahead of the last requested frame, in the direction of the requests.
+    Only the frames in a bounded window around the last requested frame are kept. This is useful for decoders that
+    release the GIL (like cv2.imread and cv2.imdecode), so several frames are decoded concurrently.
+    """
+
+    def __init__(
+        self,
+        decode_func: Callable[[int], np.ndarray],
+        get_num_frames: Callable[[], int],
+        num_threads: int,
+        decode_ahead: int,
+    ):
+        self._decode_func = decode_func
+        self._get_num_frames = get_num_frames
+        self._decode_ahead = decode_ahead
+        self._executor = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix="frame_decoder")
+        self._futures: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._last_requested_frame = -1
+        self._direction = 1
+
+    def get_frame(self, frame_num: int) -> np.ndarray:
+        with self._lock:
+            if frame_num != self._last_requested_frame:
+                self._direction = 1 if frame_num > self._last_requested_frame else -1
+            self._last_requested_frame = frame_num
+            future = self._get_or_submit(frame_num)
+            self._update_window(frame_num)
+        return future.result()
+
+    def decode_batch(self, frame_nums: List[int]) -> np.ndarray:
+        """
+        Decodes the frames concurrently with the decoding threads (outside of the decode ahead window) directly into
+        a single array of shape (len(frame_nums), H, W[, C])
+        """
+        first_frame = self._decode_func(frame_nums[0])
+        frames = np.empty((len(frame_nums), *first_frame.shape), dtype=first_frame.dtype)
+        frames[0] = first_frame
+
+        def decode_into_frames(i):
+            frames[i] = self._decode_func(frame_nums[i])
+
+        for future in [self._executor.submit(decode_into_frames, i) for i in range(1, len(frame_nums))]:
+            future.result()
+        return frames
+
+    def clear(self) -> None:
+        """
+        Drops the frames decoded so far, e.g. after the frames were renumbered
+        """
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+            self._futures.clear()
+
+    def shutdown(self) -> None:
+        self.clear()
+        self._executor.shutdown(wait=False)
+
+    def _get_or_submit(self, frame_num: int) -> Future:
+        if frame_num not in self._futures:
+            self._futures[frame_num] = self._executor.submit(self._decode_func, frame_num)
+        return self._futures[frame_num]
+
+    def _update_window(self, frame_num: int) -> None:
+        for kept_frame_num in list(self._futures):
+            # the frame right behind the requested frame is kept since callbacks often ask for the previous frame
+            if not -1 <= (kept_frame_num - frame_num) * self._direction <= self._decode_ahead:
+                self._futures.pop(kept_frame_num).cancel()
+        for frames_ahead in range(1, self._decode_ahead + 1):
+            ahead_frame_num = frame_num + frames_ahead * self._direction
+            if 0 <= ahead_frame_num < self._get_num_frames():
+                self._get_or_submit(ahead_frame_num)
+
+
+class PrefetchingFrameReader(FrameReader):
+    """
+    Wraps another frame reader and decodes the frames that follow the last requested frame in a worker thread, so
+    that playback does not wait for the decoding. The read-ahead follows the direction of the requests (forward or
+    backward) and is dropped whenever a frame outside of it is requested (e.g. on a seek).
+
+    Example:
+        video_source = PrefetchingFrameReader(LocalVideoFileReader("video.mp4"), buffer_size=32)
+    """
+
+    def __init__(self, frame_reader: FrameReader, buffer_size: int = 32):
+        """
+        Args:
+            frame_reader: the reader to prefetch from. Once wrapped it is only accessed by the worker thread.
+            buffer_size: the maximal number of frames decoded ahead of the last requested frame.
+        """
+        self._reader = frame_reader
+        self._buffer_size = buffer_size
+        self.stats = CacheStats()
+
+        self._buffer: Dict[int, Optional[np.ndarray]] = {}
+        self._errors: Dict[int, Exception] = {}
+        self._position = -1
+        self._direction = 1
+        self._next_to_decode = -1  # nothing is prefetched before the first request
+        self._generation = 0
+        self._stop = False
+        # the wrapped reader is only accessed by the worker thread, which passes on the changes of playback direction
+        self._is_reverse_playback = False
+        self._reader_is_reverse_playback = False
+
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(target=self._prefetch_loop, daemon=True)
+        self._worker.start()
+
+    def get_frame(self, frame_num: int) -> Optional[np.ndarray]:
+        if frame_num >= len(self):
+            return
+        with self._condition:
+            if frame_num in self._buffer:
+                self.stats.hits += 1
+                if (frame_num - self._position) * self._direction > 0:
+                    self._position = frame_num
+                    self._drop_frames_behind_position()
+                    self._condition.notify_all()
+                return self._buffer[frame_num]
+
+            self.stats.misses += 1
+            if self._is_about_to_be_decoded(frame_num):
+                self._position = frame_num
+                self._drop_frames_behind_position()
+                self._condition.notify_all()
+            else:
+                self._restart_read_ahead(frame_num)
+            self._condition.wait_for(lambda: frame_num in self._buffer or frame_num in self._errors)
+            if frame_num in self._errors:
+                raise self._errors.pop(frame_num)
+            return self._buffer[frame_num]
+
+    def __len__(self) -> int:
+        return len(self._reader)
+
+    @property
+    def is_live(self) -> bool:
+        return self._reader.is_live
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self._reader.fps
+
+    def get_timestamp_ms(self, frame_num: int) -> Optional[float]:
+        return self._reader.get_timestamp_ms(frame_num)
+
+    def get_keyframe_nums(self) -> Optional[np.ndarray]:
+        return self._reader.get_keyframe_nums()
+
+    @property
+    def oldest_buffered_frame(self) -> int:
+        return self._reader.oldest_buffered_frame
+
+    def set_reverse_playback(self, is_reverse: bool) -> None:
+        with self._condition:
+            self._is_reverse_playback = is_reverse
+            self._condition.notify_all()
+
+    def teardown(self) -> None:
+        with self._condition:
+            self._stop = True
+            self._condition.notify_all()
+        self._worker.join()
+        self._reader.teardown()
+
+    def _is_about_to_be_decoded(self, frame_num: int) -> bool:
+        frames_ahead_of_worker = (frame_num - self._next_to_decode) * self._direction
+        return self._next_to_decode >= 0 and 0 <= frames_ahead_of_worker <= 1
+
+    def _restart_read_ahead(self, frame_num: int) -> None:
+        if frame_num != self._position:
+            self._direction = 1 if frame_num > self._position else -1
+        self._buffer.clear()
+        self._errors.clear()
+        self._position = frame_num
+        self._next_to_decode = frame_num
+        self._generation += 1
+        self._condition.notify_all()
+
+    def _drop_frames_behind_position(self) -> None:
+        # the frame right behind the current position is kept since callbacks often ask for the previous frame
+        for frame_num in list(self._buffer):
+            if (self._position - frame_num) * self._direction > 1:
+                del self._buffer[frame_num]
+
+    def _has_frames_to_prefetch(self) -> bool:
+        frames_ahead = (self._next_to_decode - self._position) * self._direction
+        return 0 <= self._next_to_decode < len(self._reader) and frames_ahead <= self._buffer_size
+
+    def _prefetch_loop(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stop
+                    or self._is_reverse_playback != self._reader_is_reverse_playback
+                    or self._has_frames_to_prefetch()
+                )
+                if self._stop:
+                    return
+                is_reverse_playback = self._is_reverse_playback
+                frame_num, generation = self._next_to_decode, self._generation
+
+            if is_reverse_playback != self._reader_is_reverse_playback:
+                self._reader.set_reverse_playback(is_reverse_playback)
+                self._reader_is_reverse_playback = is_reverse_playback
+                continue
+
+            frame, error = None, None
+            try:
+                frame = self._reader.get_frame(frame_num)
+            except Exception as e:
+                error = e
+
+            with self._condition:
+                if generation != self._generation:
+                    continue
+                if error is not None:
+                    self._errors[frame_num] = error
+                else:
+                    self._buffer[frame_num] = frame
+                self._next_to_decode += self._direction
+                self._condition.notify_all()
+
+
+class CachedFrameReader(FrameReader):
+    """
+    Wraps another frame reader and keeps the most recently used frames in memory, so that going back and forth
+    between frames (or callbacks asking for neighbouring frames) does not decode the same frames again.
+    The returned frames are read-only views of the cached frames.
+
+    Example:
+        video_source = CachedFrameReader(LocalVideoFileReader("video.mp4"), max_bytes=2 * 1024**3)
+    """
+
+    def __init__(self, frame_reader: FrameReader, max_bytes: int = 512 * 1024**2):
+        """
+        Args:
+            frame_reader: the reader to cache frames from.
+            max_bytes: the maximal total size of the cached frames, the least recently used frames are evicted first.
+        """
+        self._reader = frame_reader
+        self._cache = LRUByteCache(max_bytes)
+        self._reader_lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def get_frame(self, frame_num: int) -> Optional[np.ndarray]:
+        frame = self._cache.get(frame_num)
+        if frame is not None:
+            return frame
+
+        with self._reader_lock:
+            frame = self._reader.get_frame(frame_num)
+        if frame is None:
+            return
+
+        frame = frame.view()
+        frame.flags.writeable = False
+        self._cache.put(frame_num, frame)
+        return frame
+
+    def get_frames(self, frame_nums):
+        frame_nums = self._validate_frame_nums(frame_nums)
+        cached_frames = {frame_num: self._cache.get(frame_num) for frame_num in set(frame_nums)}
+        missing_frame_nums = sorted(frame_num for frame_num, frame in cached_frames.items() if frame is None)
+        if len(missing_frame_nums) > 0:
+            with self._reader_lock:
+                missing_frames = self._reader.get_frames(missing_frame_nums)
+            for frame_num, frame in zip(missing_frame_nums, missing_frames):
+                frame = frame.view()
+                frame.flags.writeable = False
+                self._cache.put(frame_num, frame)
+                cached_frames[frame_num] = frame
+
+        first_frame = cached_frames[frame_nums[0]]
+        frames = np.empty((len(frame_nums), *first_frame.shape), dtype=first_frame.dtype)
+        for i, frame_num in enumerate(frame_nums):
+            frames[i] = cached_frames[frame_num]
+        return frames
+
+    def __len__(self) -> int:
+        return len(self._reader)
+
+    @property
+    def is_live(self) -> bool:
+        return self._reader.is_live
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self._reader.fps
+
+    def get_timestamp_ms(self, frame_num: int) -> Optional[float]:
+        return self._reader.get_timestamp_ms(frame_num)
+
+    def get_keyframe_nums(self) -> Optional[np.ndarray]:
+        return self._reader.get_keyframe_nums()
+
+    @property
+    def oldest_buffered_frame(self) -> int:
+        return self._reader.oldest_buffered_frame
+
+    def set_reverse_playback(self, is_reverse: bool) -> None:
+        with self._reader_lock:
+            self._reader.set_reverse_playback(is_reverse)
+
+    def teardown(self) -> None:
+        self._cache.clear()
+        self._reader.teardown()
+
+
+class SynchronizedFrameReader(FrameReader):
+    """
+    Wraps another frame reader and serializes the access to it, so that a reader which is not thread safe (e.g. a
+    video decoder) can be shared by several threads. The pipelined playback of the video player decodes frames on
+    its own thread while callbacks may read other frames of the same reader (e.g. the previous frame).
+    """
+
+    def __init__(self, frame_reader: FrameReader):
+        self._reader = frame_reader
+        self._reader_lock = threading.Lock()
+
+    def get_frame(self, frame_num: int) -> Optional[np.ndarray]:
+        with self._reader_lock:
+            return self._reader.get_frame(frame_num)
+
+    def get_frames(self, frame_nums):
+        with self._reader_lock:
+            return self._reader.get_frames(frame_nums)
+
+    def __len__(self) -> int:
+        return len(self._reader)
+
+    @property
+    def is_live(self) -> bool:
+        return self._reader.is_live
+
+    @property
+    def fps(self) -> Optional[float]:
+        return self._reader.fps
+
+    def get_timestamp_ms(self, frame_num: int) -> Optional[float]:
+        return self._reader.get_timestamp_ms(frame_num)
+
+    def get_keyframe_nums(self) -> Optional[np.ndarray]:
+        return self._reader.get_keyframe_nums()
+
+    @property
+    def oldest_buffered_frame(self) -> int:
+        return self._reader.oldest_buffered_frame
+
+    def set_reverse_playback(self, is_reverse: bool) -> None:
+        with self._reader_lock:
+            self._reader.set_reverse_playback(is_reverse)
+
+    def teardown(self) -> None:
+        self._reader.teardown()
+
+
+class ArrayFrameReader(FrameReader):
+    """
+    Reads frames lazily from an array holding a stack of frames: a .npy file (memory mapped, so the stack is never
+    loaded as a whole), a numpy array, or any array-like object that supports slicing such as an h5py dataset or a zarr
+    array. Arrays that are stored in chunks (h5py/zarr arrays have a "chunks" attribute) are read a whole chunk of
+    frames at a time, and the most recently used chunks are kept in memory.
+    The frames keep the dtype of the array (e.g. uint16 or float32, see FrameNormalizer to map them for display).
+
+    Example:
+        video_source = ArrayFrameReader("frames.npy")
+        video_source = ArrayFrameReader(h5py.File("frames.h5")["frames"], axis_order="NCHW")
+    """
+
+    def __init__(self, array_source, axis_order: Optional[str] = None, chunk_cache_max_bytes: int = 256 * 1024**2):
+        """
+        Args:
+            array_source: path to a .npy file or an array-like object.
+            axis_order: the meaning of the axes of the array, N - frames, H - rows, W - columns and optionally C -
+            channels, e.g. "NCHW" for channels first frames or "HWN" for grayscale frames stacked along the last axis
+            (default is "NHWC" for 4 dimensional arrays and "NHW" for 3 dimensional arrays).
+            chunk_cache_max_bytes: the maximal total size of the chunks kept in memory, for chunked arrays only.
+        """
+        if isinstance(array_source, (str, Path)):
+            array_source = np.load(str(array_source), mmap_mode="r")
+        if axis_order is None:
+            axis_order = "NHWC" if len(array_source.shape) == 4 else "NHW"
+        axis_order = axis_order.upper()
+        assert sorted(axis_order) in (sorted("NHW"), sorted("NHWC")), f"{axis_order=} must be a permutation of NHW[C]"
+        assert len(axis_order) == len(array_source.shape), f"{axis_order=} does not match the array shape"
+
+        self._array = array_source
+        self._frame_axis = axis_order.index("N")
+        frame_axes = axis_order.replace("N", "")
+        self._frame_axes_order = tuple(frame_axes.index(axis) for axis in "HWC" if axis in frame_axes)
+
+        self._chunk_size = None
+        chunks = getattr(array_source, "chunks", None)
+        if isinstance(chunks, tuple) and not isinstance(array_source, np.ndarray):
+            self._chunk_size = chunks[self._frame_axis]
+            self._chunk_cache = LRUByteCache(chunk_cache_max_bytes)
+            self._array_lock = threading.Lock()
+
+    def get_frame(self, frame_num: int) -> Optional[np.ndarray]:
+        if frame_num >= len(self):
+            return
+        if self._chunk_size is None:
+            frame = self._array[self._get_index(frame_num)]
+        else:
+            chunk = self._get_chunk(frame_num // self._chunk_size)
+            frame = chunk[self._get_index(frame_num % self._chunk_size)]
+
+        if self._frame_axes_order != tuple(range(frame.ndim)):
+            frame = np.ascontiguousarray(frame.transpose(self._frame_axes_order))
+        return frame
+
+    def get_frames(self, frame_nums):
+        """
+        Evenly spaced increasing frames are read with a single slice of the array (a view when possible) and other
+        frames of a numpy array with a single fancy index
+        """
+        frame_nums = self._validate_frame_nums(frame_nums)
+        steps = set(np.diff(frame_nums))
+        if len(steps) <= 1 and all(step > 0 for step in steps):
+            index = slice(frame_nums[0], frame_nums[-1] + 1, steps.pop() if steps else 1)
+        elif isinstance(self._array, np.ndarray):
+            index = frame_nums
+        else:
+            return super().get_frames(frame_nums)
+
+        if self._chunk_size is not None:
+            with self._array_lock:
+                frames = np.asarray(self._array[self._get_index(index)])
+        else:
+            frames = self._array[self._get_index(index)]
+        frames = np.moveaxis(frames, self._frame_axis, 0)
+        return np.ascontiguousarray(frames.transpose(0, *(axis + 1 for axis in self._frame_axes_order)))
+
+    def __len__(self) -> int:
+        return self._array.shape[self._frame_axis]
+
+    def _get_index(self, frame_num) -> tuple:
+        return (slice(None),) * self._frame_axis + (frame_num,)
+
+    def _get_chunk(self, chunk_num: int) -> np.ndarray:
+        chunk = self._chunk_cache.get(chunk_num)
+        if chunk is None:
+            chunk_slice = slice(chunk_num * self._chunk_size, (chunk_num + 1) * self._chunk_size)
+            with self._array_lock:  # h5py and zarr arrays are not necessarily thread safe
+                chunk = np.asarray(self._array[(slice(None),) * self._frame_axis + (chunk_slice,)])
+            self._chunk_cache.put(chunk_num, chunk)
+        return chunk
+
+
+class MemmapFrameReader(ArrayFrameReader):
+    """
+    Reads frames from a raw frame cache built with utils/frame_cache_utils.py. The cache is memory mapped, so every
+    frame is a zero-copy read-only view that is loaded from disk (or from the OS page cache) when it is first accessed.
+
+    Example:
+        video_source = MemmapFrameReader("video.mp4.cvvp_cache.npy")
+    """
+
+    def __init__(self, cache_path):
+        """
+        Args:
+            cache_path: path to a .npy file holding all the frames in a single array of shape (num_frames, ...).
+        """
+        super().__init__(cache_path)
+
+
+class ProxyFrameReader(FrameReader):
+    """
+    A downscaled copy (proxy) of a local video source (file, frame directory or archive), generated in a background
+    thread with its own reader. The video player shows proxy frames while playing and scrubbing, which is much faster
+    than decoding and resizing every full resolution frame of a high resolution source. The proxy frames are
+    compressed and written to the cache dir (see utils/cache_utils.get_cache_dir), so the proxy is only generated once
+    per source and frame size.
+
+    Only the frames that were already generated are available, len() grows until the generation is done.
+    """
+
+    def __init__(self, source_path, frame_size: Tuple[int, int]):
+        """
+        Args:
+            source_path: path to a local video file, a directory of frames, an archive of frames or a .npy file.
+            frame_size: the (width, height) of the proxy frames, usually the size of the frames on the screen.
+        """
+        self._source_path = Path(source_path)
+        self._frame_size = frame_size
+        self._lock = threading.Lock()
+        self._stop = False
+        self._generation_thread = None
+
+        proxy_path = self._get_proxy_path()
+        self._offsets_path = proxy_path.with_suffix(".offsets.npy")
+        if proxy_path.is_file() and self._offsets_path.is_file():
+            self._offsets = np.load(str(self._offsets_path)).tolist()
+            self._proxy_file = open(proxy_path, "rb")
+        else:
+            proxy_path.parent.mkdir(parents=True, exist_ok=True)
+            self._offsets = [0]
+            self._proxy_file = open(proxy_path, "w+b")
+            self._generation_thread = threading.Thread(target=self._generate_proxy, daemon=True)
+            self._generation_thread.start()
+
+    @property
+    def is_complete(self) -> bool:
+        return self._generation_thread is None or not self._generation_thread.is_alive()
+
+    def get_frame(self, frame_num: int) -> Optional[np.ndarray]:
+        if frame_num >= len(self):
+            return
+        with self._lock:
+            self._proxy_file.seek(self._offsets[frame_num])
+            encoded_frame = self._proxy_file.read(self._offsets[frame_num + 1] - self._offsets[frame_num])
+        return cv2.imdecode(np.frombuffer(encoded_frame, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def teardown(self) -> None:
+        self._stop = True
+        if self._generation_thread is not None:
+            self._generation_thread.join()
+        self._proxy_file.close()
+        if not self._offsets_path.is_file():
+            # an unfinished proxy is generated again from the start next time
+            Path(self._proxy_file.name).unlink(missing_ok=True)
+
+    def _get_proxy_path(self) -> Path:
+        source_stat = self._source_path.stat()
+        width, height = self._frame_size
+        proxy_key = f"{self._source_path.resolve()}|{source_stat.st_mtime_ns}|{width}x{height}"
+        return get_cache_dir() / "proxies" / f"{hashlib.sha1(proxy_key.encode()).hexdigest()}.bin"
+
+    def _generate_proxy(self) -> None:
+        if self._source_path.is_dir():
+            reader = LocalDirReader(self._source_path)
+        elif self._source_path.suffix.lower() in ARCHIVE_SUFFIXES:
+            reader = ArchiveFrameReader(self._source_path)
+        elif self._source_path.suffix == ".npy":
+            reader = ArrayFrameReader(self._source_path)
+        else:
+            reader = LocalVideoFileReader(self._source_path, reverse_chunk_size=0)
+        try:
+            for frame_num in range(len(reader)):
+                if self._stop:
+                    return
+                frame = reader.get_frame(frame_num)
+                if frame is None:
+                    break
+                frame = cv2.resize(frame, self._frame_size, interpolation=cv2.INTER_AREA)
+                # jpeg is much smaller but only supports 8 bit images
+                ret, encoded_frame = cv2.imencode(".jpg" if frame.dtype == np.uint8 else ".png", frame)
+                assert ret, f"could not encode the proxy of frame number = {frame_num}"
+                with self._lock:
+                    self._proxy_file.seek(0, os.SEEK_END)
+                    self._proxy_file.write(encoded_frame.tobytes())
+                    self._offsets.append(self._proxy_file.tell())
+        except AssertionError:
+            pass  # the frame count of video files is only an estimate, the proxy ends at the last readable frame
+        finally:
+            reader.teardown()
+
+        with self._lock:
+            self._proxy_file.flush()
+        np.save(str(self._offsets_path), np.array(self._offsets, dtype=np.int64))
+
+
+class DropPolicy(Enum):
+    oldest = "oldest"  # the oldest buffered frames are overwritten, so the buffer always ends at the live frame
+    newest = "newest"  # new frames are dropped while the buffer is full of frames the viewer did not reach yet
+
+
+class LiveStreamReader(FrameReader):
+    """
+    Reads a live stream (a camera, a network stream or a pipe) that is captured in a thread into a ring buffer of a
+    fixed size, so that capturing never waits for the viewer. The frames are numbered from the start of the capture
+    and len() grows as frames arrive. Going back is possible within the buffered frames, the frames that were already
+    overwritten (before oldest_buffered_frame) are read as None.
+
+    Example:
+        video_source = LiveStreamReader(0)  # the first camera device
+        video_source = LiveStreamReader("rtsp://camera/stream", buffer_max_bytes=4 * 1024**3)
+    """
+
+    def __init__(
+        self,
+        source: Union[int, str, cv2.VideoCapture],
+        buffer_max_bytes: int = 1024**3,
+        drop_policy: DropPolicy = DropPolicy.oldest,
+    ):
+        """
+        Args:
+            source: a camera index, a stream url or path (anything cv2.VideoCapture can open), or an opened
+            cv2.VideoCapture.
+            buffer_max_bytes: the size of the ring buffer, which is allocated once according to the first frame.
+            drop_policy: which frames are dropped when the buffer is full and the viewer falls behind (see DropPolicy).
+        """
+        self._capture = source if isinstance(source, cv2.VideoCapture) else cv2.VideoCapture(source)
+        ret, first_frame = self._capture.read() if self._capture.isOpened() else (False, None)
+        if not ret:
+            raise IOError(f"could not read from the live stream {source}")
+
+        self._drop_policy = drop_policy
+        capacity = max(2, buffer_max_bytes // first_frame.nbytes)
+        self._buffer = np.empty((capacity, *first_frame.shape), dtype=first_frame.dtype)
+        self._buffer[0] = first_frame
+        self._num_captured = 1
+        self._last_requested_frame = 0
+        self.num_dropped_frames = 0
+
+        self._lock = threading.Lock()
+        self._stop = False
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+
+    @property
+    def is_live(self) -> bool:
+        return True
+
+    @property
+    def oldest_buffered_frame(self) -> int:
+        return max(0, self._num_captured - len(self._buffer))
+
+    def get_frame(self, frame_num: int) -> Optional[np.ndarray]:
+        with self._lock:
+            if not self.oldest_buffered_frame <= frame_num < self._num_captured:
+                return
+            self._last_requested_frame = frame_num
+            # the buffer slot is overwritten by the capture thread later on
+            return self._buffer[frame_num % len(self._buffer)].copy()
+
+    def __len__(self) -> int:
+        return self._num_captured
+
+    def teardown(self) -> None:
+        self._stop = True
+        # reading from a stream may block, so the capture thread is not waited for indefinitely (it releases the
+        # capture once the read returns)
+        self._capture_thread.join(timeout=1)
+
+    def _should_drop_new_frame(self, frame: np.ndarray) -> bool:
+        if frame.shape != self._buffer.shape[1:]:
+            return True
+        if self._drop_policy == DropPolicy.newest and self._num_captured >= len(self._buffer):
+            # the new frame would overwrite a frame that the viewer did not pass yet
+            return self._num_captured - len(self._buffer) >= self._last_requested_frame
+        return False
+
+    def _capture_loop(self) -> None:
+        try:
+            while not self._stop:
+                ret, frame = self._capture.read()
+                if not ret:
+                    print("The live stream ended")
+                    return
+                with self._lock:
+                    if self._should_drop_new_frame(frame):
+                        self.num_dropped_frames += 1
+                        continue
+                    self._buffer[self._num_captured % len(self._buffer)] = frame
+                    self._num_captured += 1
+        finally:
+            self._capture.release()
 
 
 class TestingFrameReader(FrameReader):
@@ -109,7 +1299,3 @@ class TestingFrameReader(FrameReader):
 
     def __len__(self) -> int:
         return self._video.shape[0]
-
-
-def extract_digits_from_str(string):
-    return "".join([char for char in string if char.isdigit()])
@@ -1,11 +1,12 @@
 import abc
 from queue import Queue
-from typing import Union
+from typing import Union, TYPE_CHECKING
 
-from pynput import keyboard, mouse
-from pynput.mouse import Button
+from ..utils.ui_utils import Singleton, SingleInput, get_mouse_button_name, InputType, MODIFIERS
 
-from ..utils.ui_utils import Singleton, SingleInput, mouse_button_parser, InputType, MODIFIERS
+if TYPE_CHECKING:
+    from pynput import keyboard
+    from pynput.mouse import Button
 
 
 class BaseInputParser(metaclass=Singleton):
@@ -29,6 +30,9 @@ class BaseInputParser(metaclass=Singleton):
         return self._ui_queue.get(timeout=0.1)
 
     def start(self) -> None:
+        # pynput needs a desktop to be imported, so it is not imported before the player starts listening to it
+        from pynput import keyboard, mouse
+
         self._listeners.append(
             keyboard.Listener(
                 on_press=self._add_key_press_to_queue,
@@ -56,8 +60,8 @@ class BaseInputParser(metaclass=Singleton):
     def _queue_is_open_for_business(self) -> bool:
         return not self._queue_is_blocked and (not self.has_input() or self._allow_queue_buildup)
 
-    def _add_mouse_click_to_queue(self, x: int, y: int, button: Button, is_clicked: bool) -> None:
-        mouse_button = mouse_button_parser[button]
+    def _add_mouse_click_to_queue(self, x: int, y: int, button: "Button", is_clicked: bool) -> None:
+        mouse_button = get_mouse_button_name(button)
         if self._queue_is_open_for_business():
             if is_clicked:
                 self._ui_queue.put(SingleInput(InputType.MouseClick, (x, y, mouse_button)))
@@ -68,7 +72,7 @@ class BaseInputParser(metaclass=Singleton):
         if self._queue_is_open_for_business():
             self._ui_queue.put(SingleInput(InputType.MouseScroll, (x, y, dx, dy)))
 
-    def _add_key_press_to_queue(self, key: keyboard.Key) -> None:
+    def _add_key_press_to_queue(self, key: "keyboard.Key") -> None:
         key_str = self._parse_pynput_key(key)
         if key_str in MODIFIERS:
             self._modifiers.add(key_str)
@@ -78,12 +82,12 @@ class BaseInputParser(metaclass=Singleton):
             if self._queue_is_open_for_business():
                 self._ui_queue.put(SingleInput(InputType.KeyPress, key_str))
 
-    def _add_key_release_to_queue(self, key: Union[keyboard.Key, str]) -> None:
+    def _add_key_release_to_queue(self, key: Union["keyboard.Key", str]) -> None:
         key_str = self._parse_pynput_key(key)
         if key_str in MODIFIERS:
             self._modifiers.discard(key_str)
 
-    def _parse_pynput_key(self, key: Union[keyboard.Key, keyboard.KeyCode]) -> str:
+    def _parse_pynput_key(self, key: Union["keyboard.Key", "keyboard.KeyCode"]) -> str:
         if str(key) == "<65437>":  # work around for a bug in pynput model that does not convert 5 for some reason
             key = "5"
 
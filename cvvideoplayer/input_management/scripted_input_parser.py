@@ -0,0 +1,84 @@
+import time
+from collections import deque
+from queue import Empty
+from typing import Optional, Sequence, Tuple, Union
+
+from .base_input_parser import BaseInputParser
+from ..utils.ui_utils import NotSingleton, SingleInput, InputType
+
+ScriptedInput = Union[str, SingleInput]
+
+
+class ScriptedInputParser(BaseInputParser, metaclass=NotSingleton):
+    """
+    Feeds the player with inputs from a script instead of listening to the keyboard and the mouse, for running the
+    player without a desktop (e.g. benchmarks and CI on servers). Keys are given by their names in the keymap of the
+    player (e.g. "space", "ctrl+right").
+
+    The timeline holds two kinds of inputs:
+        - untimed inputs ("right" or a SingleInput) are given once the player is idle and asks for the next input,
+         like a user who waits for the player to respond before pressing the next key. A video that is played by
+         "space" is played until its end before the next untimed input is given.
+        - timed inputs ((seconds, "space")) are given once that many seconds passed since the player started, even
+         while the video is playing (which stops playing it), like a user pressing a key at a given moment.
+    """
+
+    def __init__(self, timeline: Sequence[Union[ScriptedInput, Tuple[float, ScriptedInput]]], exit_at_end=True):
+        """
+        Args:
+            timeline: the inputs in the order they are given.
+            exit_at_end: if True, the player exits ("esc") once all the inputs were handled.
+        """
+        super().__init__(allow_queue_buildup=True)
+        self._timeline = deque(self._parse_timeline_entry(entry) for entry in timeline)
+        if exit_at_end:
+            self._timeline.append((None, SingleInput(InputType.KeyPress, "esc")))
+        self._start_time: Optional[float] = None
+
+    def start(self) -> None:
+        self._start_time = time.perf_counter()
+
+    def has_input(self) -> bool:
+        self._queue_due_inputs(is_idle=False)
+        return super().has_input()
+
+    def get_input(self) -> SingleInput:
+        self._queue_due_inputs(is_idle=True)
+        if self._ui_queue.empty() and len(self._timeline) > 0 and self._timeline[0][0] is not None:
+            # waiting (up to the polling time of the real input parsers) for the next timed input
+            time.sleep(min(0.1, max(0.0, self._timeline[0][0] - self._get_time())))
+            self._queue_due_inputs(is_idle=True)
+        if self._ui_queue.empty():
+            raise Empty
+        return self._ui_queue.get_nowait()
+
+    @staticmethod
+    def _vk_code_mapper(vk_code) -> str:
+        return chr(vk_code)
+
+    @staticmethod
+    def _parse_timeline_entry(
+        entry: Union[ScriptedInput, Tuple[float, ScriptedInput]],
+    ) -> Tuple[Optional[float], SingleInput]:
+        input_time = None
+        if isinstance(entry, tuple):
+            input_time, entry = entry
+        if isinstance(entry, str):
+            entry = SingleInput(InputType.KeyPress, entry)
+        return input_time, entry
+
+    def _get_time(self) -> float:
+        if self._start_time is None:
+            # the player may ask for inputs without starting the input parser (e.g. in tests)
+            self.start()
+        return time.perf_counter() - self._start_time
+
+    def _queue_due_inputs(self, is_idle: bool) -> None:
+        if self._queue_is_blocked:
+            return
+        while len(self._timeline) > 0:
+            input_time, single_input = self._timeline[0]
+            is_due = is_idle if input_time is None else input_time <= self._get_time()
+            if not is_due or (input_time is None and not self._ui_queue.empty()):
+                break
+            self._ui_queue.put(self._timeline.popleft()[1])
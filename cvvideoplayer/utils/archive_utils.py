@@ -0,0 +1,106 @@
+"""
+This module indexes the image members of zip and (uncompressed) tar archives in frame order, with the offset and size
+of the data of every member in the archive file. This allows reading frames straight from the archive by seeking to
+their data, without extracting it. The index is built once and saved in the cache directory.
+"""
+
+import hashlib
+import json
+import posixpath
+import struct
+import tarfile
+import zipfile
+import zlib
+from dataclasses import dataclass, astuple
+from pathlib import Path
+from typing import BinaryIO, List
+
+from .cache_utils import get_cache_dir
+from .frame_listing_utils import frame_order_key, get_extension, is_image_extension
+
+ARCHIVE_SUFFIXES = (".zip", ".tar")
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+@dataclass
+class ArchiveMember:
+    name: str
+    offset: int  # the offset of the member data in the archive file
+    size: int  # the size of the member data in the archive file
+    compress_type: int  # zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED
+
+
+def load_or_build_archive_index(archive_path: Path) -> List[ArchiveMember]:
+    index_path = _get_index_path(archive_path)
+    if index_path.is_file():
+        try:
+            return [ArchiveMember(*member) for member in json.loads(index_path.read_text())]
+        except (OSError, ValueError, TypeError):
+            pass
+
+    members = build_archive_index(archive_path)
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        index_path.write_text(json.dumps([astuple(member) for member in members]))
+    except OSError as e:
+        print(f"Could not save the index of {archive_path} to {index_path}: {e}")
+    return members
+
+
+def build_archive_index(archive_path: Path) -> List[ArchiveMember]:
+    """
+    Returns the image members of the archive sorted by the number in their file name
+    """
+    print(f"Building an index of the frames in {archive_path}")
+    if zipfile.is_zipfile(archive_path):
+        members = _index_zip(archive_path)
+    else:
+        try:
+            members = _index_tar(archive_path)
+        except tarfile.ReadError:
+            raise ValueError(f"{archive_path} is not a zip or an uncompressed tar archive") from None
+
+    members = [member for member in members if is_image_extension(get_extension(member.name).lower())]
+    members.sort(key=lambda member: frame_order_key(posixpath.basename(member.name)))
+    return members
+
+
+def read_archive_member(archive_file: BinaryIO, member: ArchiveMember) -> bytes:
+    archive_file.seek(member.offset)
+    data = archive_file.read(member.size)
+    if member.compress_type == zipfile.ZIP_DEFLATED:
+        data = zlib.decompress(data, -zlib.MAX_WBITS)
+    return data
+
+
+def _index_zip(archive_path: Path) -> List[ArchiveMember]:
+    members = []
+    with zipfile.ZipFile(archive_path) as archive, open(archive_path, "rb") as archive_file:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                raise NotImplementedError(f"{info.filename} in {archive_path} is compressed with an unsupported method")
+            # the data follows the local header, whose extra field may differ from the one in the central directory
+            archive_file.seek(info.header_offset)
+            local_header = archive_file.read(_ZIP_LOCAL_HEADER_SIZE)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            data_offset = info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length
+            members.append(ArchiveMember(info.filename, data_offset, info.compress_size, info.compress_type))
+    return members
+
+
+def _index_tar(archive_path: Path) -> List[ArchiveMember]:
+    # compressed tar archives cannot be read from an offset, so they are opened as uncompressed only
+    with tarfile.open(archive_path, mode="r:") as archive:
+        return [
+            ArchiveMember(member.name, member.offset_data, member.size, zipfile.ZIP_STORED)
+            for member in archive
+            if member.isfile()
+        ]
+
+
+def _get_index_path(archive_path: Path) -> Path:
+    archive_stat = archive_path.stat()
+    archive_key = f"{archive_path.absolute()}|{archive_stat.st_size}|{archive_stat.st_mtime_ns}"
+    return get_cache_dir() / "archive_indexes" / f"{hashlib.sha1(archive_key.encode()).hexdigest()}.json"
@@ -2,7 +2,7 @@
 This module contains an drawing routines based on OpenCV.
 """
 
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List, NamedTuple
 
 import cv2
 import numpy as np
@@ -105,3 +105,66 @@ def write_text_on_img(img, text, col=10, row=10, font_scale=1.5, color=(255, 255
 
     cv2.putText(img, text, (col, row + height + baseline), fontface, font_scale, color, thickness)
     return row + spacing
+
+
+class Text(NamedTuple):
+    """
+    The arguments of write_text_on_img
+    """
+
+    text: str
+    col: int
+    row: int
+    font_scale: float = 1.5
+    color: Tuple[int, int, int] = (255, 255, 255)
+    thickness: int = 2
+
+
+class CachedTextLayer:
+    """
+    Static text that is rendered once into a layer with an alpha channel and then blended over every frame, instead of
+    measuring and drawing each text on every frame. Only the bounding box of the text is kept and blended into the
+    frame, with vectorised operations. The layer is rendered again only when the texts (including their positions and
+    fonts) or the shape of the frames change.
+    """
+
+    def __init__(self):
+        self._layer_key = None
+        self._roi: Optional[Tuple[slice, slice]] = None  # the bounding box of the text in the frame
+        self._inverse_alpha: Optional[np.ndarray] = None  # 255 - alpha, repeated for every channel of the frame
+        self._premultiplied_color: Optional[np.ndarray] = None  # the color of the text multiplied by its alpha
+
+    def draw(self, frame: np.ndarray, texts: List[Text]) -> None:
+        layer_key = (tuple(texts), frame.shape)
+        if layer_key != self._layer_key:
+            self._render(frame, texts)
+            self._layer_key = layer_key
+        if self._roi is None:
+            return
+
+        roi = frame[self._roi]
+        if frame.dtype == np.uint8:
+            roi[...] = cv2.add(cv2.multiply(roi, self._inverse_alpha, scale=1 / 255), self._premultiplied_color)
+        else:
+            blended_roi = roi * (self._inverse_alpha / np.float32(255)) + self._premultiplied_color
+            roi[...] = blended_roi + 0.5 if frame.dtype.kind in "ui" else blended_roi
+
+    def _render(self, frame: np.ndarray, texts: List[Text]) -> None:
+        # the texts are drawn by write_text_on_img on black uint8 layers, so they can be blended over frames of any dtype
+        color_layer = np.zeros(frame.shape, dtype=np.uint8)
+        alpha_layer = np.zeros(frame.shape[:2], dtype=np.uint8)
+        for text in texts:
+            text_args = dict(text=text.text, col=text.col, row=text.row, font_scale=text.font_scale)
+            write_text_on_img(color_layer, color=text.color, thickness=text.thickness, **text_args)
+            write_text_on_img(alpha_layer, color=255, thickness=text.thickness, **text_args)
+
+        rows, cols = np.nonzero(alpha_layer)
+        if len(rows) == 0:
+            self._roi = None
+            return
+        self._roi = (slice(rows.min(), rows.max() + 1), slice(cols.min(), cols.max() + 1))
+        inverse_alpha = 255 - alpha_layer[self._roi]
+        if frame.ndim == 3:
+            inverse_alpha = np.repeat(inverse_alpha[:, :, None], frame.shape[2], axis=2)
+        self._inverse_alpha = inverse_alpha
+        self._premultiplied_color = color_layer[self._roi]
@@ -0,0 +1,90 @@
+"""
+This module transcodes a video (or any FrameReader) once into a raw frame cache: a .npy file holding all the decoded
+frames as one array, whose header stores the shape and dtype of the frames. The cache is memory mapped by
+MemmapFrameReader, so reading any frame costs a page fault instead of a codec seek, and several players reviewing the
+same clip share the OS page cache. A cache saved next to its source is used automatically by the video player.
+
+Usage:
+    python -m cvvideoplayer.utils.frame_cache_utils path/to/video.mp4
+"""
+
+import argparse
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from ..frame_reader import FrameReader, LocalVideoFileReader, LocalDirReader
+
+FRAME_CACHE_SUFFIX = ".cvvp_cache.npy"
+
+
+def get_frame_cache_path(source_path: Union[str, Path]) -> Path:
+    source_path = Path(source_path)
+    return source_path.with_name(source_path.name + FRAME_CACHE_SUFFIX)
+
+
+def find_frame_cache(source_path: Union[str, Path]) -> Optional[Path]:
+    """
+    Returns the path of the frame cache saved next to source_path, or None if there is none or if the source was
+    modified after the cache was built
+    """
+    cache_path = get_frame_cache_path(source_path)
+    if not cache_path.is_file() or cache_path.stat().st_mtime < Path(source_path).stat().st_mtime:
+        return None
+    return cache_path
+
+
+def build_frame_cache(frame_reader: FrameReader, cache_path: Union[str, Path]) -> Path:
+    """
+    Decodes all the frames of frame_reader in order and writes them to cache_path. All the frames need to have the
+    same shape and dtype. The cache is written to a temporary file first so that an interrupted build is never used.
+    """
+    cache_path = Path(cache_path)
+    first_frame = frame_reader.get_frame(0)
+    assert first_frame is not None, "the frame reader has no frames"
+    partial_path = cache_path.with_name(cache_path.name + ".partial")
+
+    frames = np.lib.format.open_memmap(
+        str(partial_path), mode="w+", dtype=first_frame.dtype, shape=(len(frame_reader), *first_frame.shape)
+    )
+    try:
+        frames[0] = first_frame
+        for frame_num in range(1, len(frame_reader)):
+            frame = frame_reader.get_frame(frame_num)
+            assert frame is not None, f"frame number = {frame_num} could not be read"
+            assert frame.shape == first_frame.shape, f"frame number = {frame_num} has a different shape"
+            frames[frame_num] = frame
+            if frame_num % 500 == 0:
+                print(f"Cached {frame_num}/{len(frame_reader)} frames")
+        frames.flush()
+    except BaseException:
+        del frames
+        partial_path.unlink()
+        raise
+
+    del frames
+    os.replace(partial_path, cache_path)
+    return cache_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a memory mapped raw frame cache next to a video source")
+    parser.add_argument("source_path", help="path to a video file or to a directory of frames")
+    parser.add_argument("--output", default=None, help="path of the cache file (default is next to the source)")
+    args = parser.parse_args()
+
+    source_path = Path(args.source_path)
+    frame_reader = (
+        LocalDirReader(source_path) if source_path.is_dir() else LocalVideoFileReader(source_path, use_seek_index=True)
+    )
+    try:
+        cache_path = build_frame_cache(frame_reader, args.output or get_frame_cache_path(source_path))
+    finally:
+        frame_reader.teardown()
+    print(f"Saved the frame cache of {source_path} to {cache_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+This module lists the image files of a frame directory in frame order. Listings are saved as manifests in the cache
+directory and reused as long as the modification time of the frame directory has not changed.
+"""
+
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .cache_utils import get_cache_dir
+
+_NON_DIGITS_PATTERN = re.compile(r"\D+")
+# matches the file extension or any non digits, so that removing the matches leaves the digits of the file stem
+_NON_STEM_DIGITS_PATTERN = re.compile(r"\.[^.]*$|\D+")
+
+
+def extract_digits_from_str(string):
+    return _NON_DIGITS_PATTERN.sub("", string)
+
+
+def frame_order_key(file_name: str) -> int:
+    return int(_NON_STEM_DIGITS_PATTERN.sub("", file_name))
+
+
+def get_extension(file_name: str) -> str:
+    dot_idx = file_name.rfind(".")
+    return file_name[dot_idx:] if dot_idx > 0 else ""
+
+
+@lru_cache(maxsize=None)
+def is_image_extension(extension: str) -> bool:
+    mime_type = mimetypes.guess_type(f"frame{extension}")[0]
+    return mime_type is not None and mime_type.startswith("image")
+
+
+def list_frame_dir(frame_dir: Path) -> List[str]:
+    """
+    Returns the names of the image files in frame_dir sorted by the number in their name
+    """
+    with os.scandir(frame_dir) as entries:
+        frame_names = [entry.name for entry in entries if is_image_extension(get_extension(entry.name)) and entry.is_file()]
+    frame_names.sort(key=frame_order_key)
+    return frame_names
+
+
+def get_dir_mtime(frame_dir: Path) -> int:
+    return os.stat(frame_dir).st_mtime_ns
+
+
+def load_frame_dir_manifest(frame_dir: Path) -> Tuple[Optional[List[str]], bool]:
+    """
+    Returns the frame names saved in the manifest of frame_dir (None if there is no manifest) and whether the
+    manifest is up-to-date with the directory
+    """
+    manifest_path = _get_manifest_path(frame_dir)
+    if not manifest_path.is_file():
+        return None, False
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        return None, False
+    return manifest["frame_names"], manifest["dir_mtime"] == get_dir_mtime(frame_dir)
+
+
+def save_frame_dir_manifest(frame_dir: Path, frame_names: List[str], dir_mtime: int) -> None:
+    manifest_path = _get_manifest_path(frame_dir)
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps({"dir": str(frame_dir), "dir_mtime": dir_mtime, "frame_names": frame_names}))
+    except OSError as e:
+        print(f"Could not save the frame listing of {frame_dir} to {manifest_path}: {e}")
+
+
+def _get_manifest_path(frame_dir: Path) -> Path:
+    dir_hash = hashlib.sha1(str(Path(frame_dir).absolute()).encode()).hexdigest()
+    return get_cache_dir() / "frame_dir_manifests" / f"{dir_hash}.json"
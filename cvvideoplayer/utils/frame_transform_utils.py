@@ -0,0 +1,48 @@
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+from .bbox_utils import Bbox
+
+
+@dataclass(frozen=True)
+class FrameTransform:
+    """
+    Maps pixel coordinates in the frames of the video source to pixel coordinates in the frame a callback edits, which
+    may be downscaled (a proxy frame or a frame fitted to the screen) and cropped (the zoomed viewport):
+        x_in_frame = (x_in_source - offset_x) * scale_x
+    """
+
+    scale_x: float = 1.0
+    scale_y: float = 1.0
+    offset_x: float = 0.0
+    offset_y: float = 0.0
+
+    @classmethod
+    def from_viewport(
+        cls,
+        source_size: Tuple[int, int],
+        frame_size: Tuple[int, int],
+        viewport_xywh: Optional[Tuple[float, float, float, float]] = None,
+    ) -> "FrameTransform":
+        """
+        Returns the transform of a frame of frame_size (width, height) showing the viewport (given in source pixel
+        coordinates) of a source frame of source_size, the whole source frame if viewport_xywh is None
+        """
+        if viewport_xywh is None:
+            viewport_xywh = (0.0, 0.0, source_size[0], source_size[1])
+        x, y, w, h = viewport_xywh
+        return cls(scale_x=frame_size[0] / w, scale_y=frame_size[1] / h, offset_x=x, offset_y=y)
+
+    def map_point(self, x: float, y: float) -> Tuple[float, float]:
+        return (x - self.offset_x) * self.scale_x, (y - self.offset_y) * self.scale_y
+
+    def unmap_point(self, x: float, y: float) -> Tuple[float, float]:
+        """
+        Maps a point in the edited frame back to the source frame
+        """
+        return x / self.scale_x + self.offset_x, y / self.scale_y + self.offset_y
+
+    def map_bbox(self, bbox: Bbox) -> Bbox:
+        x1, y1 = self.map_point(bbox.x1, bbox.y1)
+        x2, y2 = self.map_point(bbox.x2, bbox.y2)
+        return replace(bbox, x1=int(x1), y1=int(y1), width=int(x2) - int(x1), height=int(y2) - int(y1))
@@ -0,0 +1,135 @@
+"""
+This module measures how long every stage of playing a frame takes (decoding it, running each frame edit callback on
+it, recording it and showing it). The latest durations of every stage are kept to report rolling percentiles, and the
+latest spans are kept to be exported as a trace in the Chrome trace event format, which can be opened in Perfetto
+(https://ui.perfetto.dev) or in chrome://tracing to see how the stages of consecutive frames overlap.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Deque, Dict, Optional, NamedTuple, Union
+
+import numpy as np
+
+
+class StageLatency(NamedTuple):
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    num_samples: int
+
+
+class _Span(NamedTuple):
+    stage: str
+    category: str
+    start_us: float
+    duration_us: float
+    thread_id: int
+    frame_num: Optional[int]
+
+
+class LatencyTracker:
+    def __init__(self, window_size: int = 300, max_trace_spans: int = 100_000):
+        """
+        Args:
+            window_size: the number of latest durations of each stage that the percentiles are computed over.
+            max_trace_spans: the number of latest spans (of all the stages) that are kept for the trace export.
+        """
+        self._window_size = window_size
+        self._durations_ms: Dict[str, Deque[float]] = {}
+        self._spans: Deque[_Span] = deque(maxlen=max_trace_spans)
+        self._thread_names: Dict[int, str] = {}
+        # the stages of the pipelined playback are timed on different threads
+        self._lock = threading.Lock()
+        self._start_time = time.perf_counter()
+
+    @contextmanager
+    def span(self, stage: str, frame_num: Optional[int] = None, category: str = "playback"):
+        """
+        Times the code in the with block as a span of the stage
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(stage, start_time, time.perf_counter(), frame_num=frame_num, category=category)
+
+    def add_span(
+        self,
+        stage: str,
+        start_time: float,
+        end_time: float,
+        frame_num: Optional[int] = None,
+        category: str = "playback",
+    ) -> None:
+        """
+        Adds a span whose start_time and end_time were taken with time.perf_counter()
+        """
+        span = _Span(
+            stage=stage,
+            category=category,
+            start_us=(start_time - self._start_time) * 1e6,
+            duration_us=(end_time - start_time) * 1e6,
+            thread_id=threading.get_ident(),
+            frame_num=frame_num,
+        )
+        with self._lock:
+            if stage not in self._durations_ms:
+                self._durations_ms[stage] = deque(maxlen=self._window_size)
+            self._durations_ms[stage].append(span.duration_us / 1000)
+            self._spans.append(span)
+            if span.thread_id not in self._thread_names:
+                self._thread_names[span.thread_id] = threading.current_thread().name
+
+    def get_stage_latencies(self) -> Dict[str, StageLatency]:
+        """
+        Returns the percentiles of the latest durations of every stage, in the order the stages were first timed
+        """
+        with self._lock:
+            durations_ms = {stage: np.array(durations) for stage, durations in self._durations_ms.items()}
+        stage_latencies = {}
+        for stage, durations in durations_ms.items():
+            p50, p95, p99 = np.percentile(durations, [50, 95, 99])
+            stage_latencies[stage] = StageLatency(float(p50), float(p95), float(p99), len(durations))
+        return stage_latencies
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations_ms.clear()
+            self._spans.clear()
+            self._thread_names.clear()
+
+    def export_chrome_trace(self, path: Union[str, Path]) -> None:
+        """
+        Writes the kept spans as complete ("X") events of the Chrome trace event format
+        """
+        with self._lock:
+            spans = list(self._spans)
+            thread_names = dict(self._thread_names)
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread_id, "args": {"name": thread_name}}
+            for thread_id, thread_name in thread_names.items()
+        ]
+        for span in spans:
+            event = {
+                "name": span.stage,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start_us, 3),
+                "dur": round(span.duration_us, 3),
+                "pid": os.getpid(),
+                "tid": span.thread_id,
+            }
+            if span.frame_num is not None:
+                event["args"] = {"frame_num": span.frame_num}
+            events.append(event)
+
+        path = Path(path)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,101 @@
+"""
+This module implements the clock that plays videos in real time. Every played frame is due when the time that passed
+since the playback started reaches the time between its timestamp and the timestamp of the first played frame (divided
+by the playback speed, for fast forward and slow motion). A frame
+that is ready before it is due is shown once it is due, and frames whose successors are already due are skipped
+(dropped), so the playback keeps up with the video even when decoding and editing a frame takes longer than the frame
+interval.
+"""
+
+import time
+from typing import Callable, Optional
+
+
+class PlaybackClock:
+    def __init__(
+        self,
+        get_timestamp_ms: Callable[[int], float],
+        time_func: Callable[[], float] = time.perf_counter,
+        sleep_func: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            get_timestamp_ms: returns the presentation timestamp of a frame, in milliseconds.
+            time_func: returns the current time in seconds, replaced (together with sleep_func) by a fake clock in
+             tests.
+            sleep_func: sleeps for the given number of seconds.
+        """
+        self._get_timestamp_ms = get_timestamp_ms
+        self._time_func = time_func
+        self._sleep_func = sleep_func
+        self._start_time: Optional[float] = None
+        self._start_timestamp_ms = 0.0
+        self._speed = 1.0
+        self.num_dropped_frames = 0
+        self.lateness_ms = 0.0  # how late the last frame was shown
+        self.max_lateness_ms = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._start_time is not None
+
+    @property
+    def speed(self) -> float:
+        """
+        The video time that passes in a second
+        """
+        return self._speed
+
+    def set_speed(self, speed: float, frame_num: int) -> None:
+        """
+        Changes the playback speed. While playing, the clock is rebased at frame_num (the frame that is shown now), so
+        that only the frames after it are due at the new speed.
+        """
+        self._speed = speed
+        if self.is_running:
+            self._rebase(frame_num)
+
+    def start(self, frame_num: int) -> None:
+        """
+        Starts playing from frame_num, which is due now. The counters are reset.
+        """
+        self._rebase(frame_num)
+        self.num_dropped_frames = 0
+        self.lateness_ms = 0.0
+        self.max_lateness_ms = 0.0
+
+    def stop(self) -> None:
+        self._start_time = None
+
+    def _rebase(self, frame_num: int) -> None:
+        self._start_time = self._time_func()
+        self._start_timestamp_ms = self._get_timestamp_ms(frame_num)
+
+    def get_time_until_due(self, frame_num: int) -> float:
+        """
+        Returns the seconds left until the frame is due, negative if it is late
+        """
+        # playing backwards, earlier timestamps are due later
+        video_time = abs(self._get_timestamp_ms(frame_num) - self._start_timestamp_ms) / 1000
+        return self._start_time + video_time / self._speed - self._time_func()
+
+    def skip_late_frames(self, frame_num: int, direction: int, end_frame_num: int) -> int:
+        """
+        Returns the frame to play instead of frame_num: the last frame (up to end_frame_num, going in direction) that
+        is already due, or frame_num if it is not due yet. The skipped frames are counted as dropped.
+        """
+        if not self.is_running:
+            return frame_num
+        while frame_num != end_frame_num and self.get_time_until_due(frame_num + direction) <= 0:
+            frame_num += direction
+            self.num_dropped_frames += 1
+        return frame_num
+
+    def wait_until_due(self, frame_num: int) -> None:
+        if self.is_running:
+            self._sleep_func(max(0.0, self.get_time_until_due(frame_num)))
+
+    def frame_shown(self, frame_num: int) -> None:
+        if self.is_running:
+            self.lateness_ms = max(0.0, -self.get_time_until_due(frame_num) * 1000)
+            self.max_lateness_ms = max(self.max_lateness_ms, self.lateness_ms)
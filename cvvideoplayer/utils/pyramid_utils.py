@@ -0,0 +1,91 @@
+"""
+This module implements a tiled multi-resolution image pyramid, used by the video player to zoom and pan in very large
+frames. Level 0 is the frame itself and every following level is downscaled by a factor of 2. Each level is split into
+square tiles which are only built when a viewport that intersects them is rendered, and are then kept for the
+following renders. A render only touches the tiles of the level whose resolution is closest to (and not lower than)
+the output resolution, so its cost depends on the size of the output and not on the size of the frame.
+"""
+
+import math
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
+
+
+class TiledImagePyramid:
+    def __init__(self, frame: np.ndarray, tile_size: int = 512):
+        self._frame = frame
+        self._tile_size = tile_size
+        self._tiles: Dict[Tuple[int, int, int], np.ndarray] = {}
+
+        self._level_sizes = [(frame.shape[1], frame.shape[0])]
+        while max(self._level_sizes[-1]) > tile_size:
+            width, height = self._level_sizes[-1]
+            self._level_sizes.append(((width + 1) // 2, (height + 1) // 2))
+
+    @property
+    def num_levels(self) -> int:
+        return len(self._level_sizes)
+
+    def render(self, viewport_xywh: Tuple[float, float, float, float], output_size: Tuple[int, int]) -> np.ndarray:
+        """
+        Returns the viewport (given in frame pixel coordinates) resized to output_size (width, height)
+        """
+        x, y, w, h = viewport_xywh
+        output_w, output_h = output_size
+        level = self._choose_level(w / output_w)
+        level_w, level_h = self._level_sizes[level]
+
+        scale = 2**level
+        x_start, y_start = max(0, int(x / scale)), max(0, int(y / scale))
+        x_end = min(level_w, max(x_start + 1, math.ceil((x + w) / scale)))
+        y_end = min(level_h, max(y_start + 1, math.ceil((y + h) / scale)))
+
+        region = self._read_region(level, x_start, y_start, x_end, y_end)
+        is_shrinking = region.shape[1] > output_w
+        return cv2.resize(region, output_size, interpolation=cv2.INTER_AREA if is_shrinking else cv2.INTER_LINEAR)
+
+    def _choose_level(self, frame_pixels_per_output_pixel: float) -> int:
+        if frame_pixels_per_output_pixel < 2:
+            return 0
+        return min(int(math.log2(frame_pixels_per_output_pixel)), self.num_levels - 1)
+
+    def _read_region(self, level: int, x_start: int, y_start: int, x_end: int, y_end: int) -> np.ndarray:
+        tile_size = self._tile_size
+        region = np.empty((y_end - y_start, x_end - x_start, *self._frame.shape[2:]), dtype=self._frame.dtype)
+        for tile_y in range(y_start // tile_size, (y_end - 1) // tile_size + 1):
+            for tile_x in range(x_start // tile_size, (x_end - 1) // tile_size + 1):
+                tile = self._get_tile(level, tile_x, tile_y)
+                tile_x_start, tile_y_start = tile_x * tile_size, tile_y * tile_size
+                # the intersection of the tile and the region in level coordinates
+                left, top = max(x_start, tile_x_start), max(y_start, tile_y_start)
+                right = min(x_end, tile_x_start + tile.shape[1])
+                bottom = min(y_end, tile_y_start + tile.shape[0])
+                region[top - y_start : bottom - y_start, left - x_start : right - x_start] = tile[
+                    top - tile_y_start : bottom - tile_y_start, left - tile_x_start : right - tile_x_start
+                ]
+        return region
+
+    def _get_tile(self, level: int, tile_x: int, tile_y: int) -> np.ndarray:
+        tile_size = self._tile_size
+        if level == 0:
+            return self._frame[
+                tile_y * tile_size : (tile_y + 1) * tile_size, tile_x * tile_size : (tile_x + 1) * tile_size
+            ]
+
+        tile = self._tiles.get((level, tile_x, tile_y))
+        if tile is None:
+            # a tile is the downscaled 2x2 tiles below it
+            lower_level_w, lower_level_h = self._level_sizes[level - 1]
+            lower_region = self._read_region(
+                level - 1,
+                x_start=2 * tile_x * tile_size,
+                y_start=2 * tile_y * tile_size,
+                x_end=min(lower_level_w, 2 * (tile_x + 1) * tile_size),
+                y_end=min(lower_level_h, 2 * (tile_y + 1) * tile_size),
+            )
+            tile_w, tile_h = (lower_region.shape[1] + 1) // 2, (lower_region.shape[0] + 1) // 2
+            tile = cv2.resize(lower_region, (tile_w, tile_h), interpolation=cv2.INTER_AREA)
+            self._tiles[(level, tile_x, tile_y)] = tile
+        return tile
@@ -3,14 +3,18 @@ from dataclasses import dataclass
 from enum import Enum, auto
 from typing import Tuple, Union
 
-from pynput import mouse
 
+def get_mouse_button_name(button) -> str:
+    # pynput needs a desktop to be imported, so it is imported only once the real mouse is listened to
+    from pynput import mouse
+
+    mouse_button_names = {
+        mouse.Button.left: "mouse_left",
+        mouse.Button.right: "mouse_right",
+        mouse.Button.middle: "mouse_middle",
+    }
+    return mouse_button_names[button]
 
-mouse_button_parser = {
-    mouse.Button.left: "mouse_left",
-    mouse.Button.right: "mouse_right",
-    mouse.Button.middle: "mouse_middle",
-}
 
 MODIFIERS = {
     "ctrl",
@@ -28,6 +32,15 @@ class Singleton(abc.ABCMeta):
         return cls._instances[cls]
 
 
+class NotSingleton(Singleton):
+    """
+    For subclasses of singleton classes whose instances are independent of each other
+    """
+
+    def __call__(cls, *args, **kwargs):
+        return abc.ABCMeta.__call__(cls, *args, **kwargs)
+
+
 class InputType(Enum):
     KeyPress = auto()
     KeyRelease = auto()
@@ -0,0 +1,106 @@
+"""
+This module builds a seek index for video files: the exact number of frames, the presentation timestamp of every
+frame and the frame numbers of the keyframes. The index is built once by reading the packets of the video without
+decoding them, and is saved next to the video so that it can be reused the next time the video is opened.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+INDEX_FILE_SUFFIX = ".cvvp_index.npz"
+
+
+@dataclass
+class VideoIndex:
+    timestamps_ms: np.ndarray  # presentation timestamp of every frame, sorted by frame number
+    keyframes: Optional[np.ndarray]  # sorted frame numbers of the keyframes, None if they could not be found
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.timestamps_ms)
+
+    def get_keyframe_before(self, frame_num: int) -> int:
+        """
+        Returns the last keyframe at or before frame_num (decoding from it is enough to get frame_num)
+        """
+        keyframe_idx = np.searchsorted(self.keyframes, frame_num, side="right") - 1
+        return int(self.keyframes[max(keyframe_idx, 0)])
+
+    def get_frame_num(self, timestamp_ms: float) -> int:
+        """
+        Returns the number of the frame whose presentation timestamp is the closest to timestamp_ms
+        """
+        timestamps = self.timestamps_ms
+        frame_num = min(int(np.searchsorted(timestamps, timestamp_ms)), self.frame_count - 1)
+        if frame_num > 0 and abs(timestamps[frame_num - 1] - timestamp_ms) < abs(timestamps[frame_num] - timestamp_ms):
+            frame_num -= 1
+        return frame_num
+
+
+def get_index_path(video_path: Path) -> Path:
+    return video_path.with_name(video_path.name + INDEX_FILE_SUFFIX)
+
+
+def load_or_build_video_index(video_path: Path) -> VideoIndex:
+    index_path = get_index_path(video_path)
+    video_stat = video_path.stat()
+    if index_path.is_file():
+        with np.load(str(index_path)) as index_file:
+            if index_file["video_size"] == video_stat.st_size and index_file["video_mtime"] == video_stat.st_mtime:
+                keyframes = index_file["keyframes"] if index_file["has_keyframes"] else None
+                return VideoIndex(timestamps_ms=index_file["timestamps_ms"], keyframes=keyframes)
+
+    video_index = build_video_index(video_path)
+    try:
+        np.savez(
+            str(index_path),
+            timestamps_ms=video_index.timestamps_ms,
+            keyframes=video_index.keyframes if video_index.keyframes is not None else np.zeros(0, dtype=np.int64),
+            has_keyframes=video_index.keyframes is not None,
+            video_size=video_stat.st_size,
+            video_mtime=video_stat.st_mtime,
+        )
+    except OSError as e:
+        print(f"Could not save the seek index of {video_path} to {index_path}: {e}")
+    return video_index
+
+
+def build_video_index(video_path: Path) -> VideoIndex:
+    print(f"Building a seek index for {video_path}")
+    if hasattr(cv2, "CAP_PROP_LRF_HAS_KEY_FRAME"):
+        video_reader = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+        if video_reader.isOpened():
+            return _build_index_from_packets(video_reader)
+
+    # Without raw packet access every frame has to be decoded and the keyframes are unknown
+    return _build_index_from_frames(cv2.VideoCapture(str(video_path)))
+
+
+def _build_index_from_packets(video_reader: cv2.VideoCapture) -> VideoIndex:
+    packet_timestamps = []
+    keyframe_timestamps = []
+    while video_reader.grab():
+        timestamp = video_reader.get(cv2.CAP_PROP_POS_MSEC)
+        packet_timestamps.append(timestamp)
+        if video_reader.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+            keyframe_timestamps.append(timestamp)
+    video_reader.release()
+
+    # packets are read in decoding order, which differs from the presentation order when there are B-frames
+    timestamps_ms = np.sort(np.array(packet_timestamps, dtype=np.float64))
+    keyframes = np.unique(np.searchsorted(timestamps_ms, keyframe_timestamps))
+    if len(keyframes) == 0 or keyframes[0] != 0:
+        keyframes = np.insert(keyframes, 0, 0)
+    return VideoIndex(timestamps_ms=timestamps_ms, keyframes=keyframes)
+
+
+def _build_index_from_frames(video_reader: cv2.VideoCapture) -> VideoIndex:
+    timestamps = []
+    while video_reader.grab():
+        timestamps.append(video_reader.get(cv2.CAP_PROP_POS_MSEC))
+    video_reader.release()
+    return VideoIndex(timestamps_ms=np.array(timestamps, dtype=np.float64), keyframes=None)
@@ -2,12 +2,22 @@ import dataclasses
 from enum import Enum
 from pathlib import Path
 import platform
-from typing import Callable
+from typing import Callable, Optional
 
 import cv2
 import numpy as np
-from ..frame_reader import LocalVideoFileReader, LocalDirReader, FrameReader
+from ..frame_reader import (
+    ArchiveFrameReader,
+    ArrayFrameReader,
+    CachedFrameReader,
+    FrameReader,
+    LocalDirReader,
+    LocalVideoFileReader,
+    MemmapFrameReader,
+)
 from ..recorder import AbstractRecorder, SimpleRecorder
+from .archive_utils import ARCHIVE_SUFFIXES
+from .frame_cache_utils import find_frame_cache
 
 
 class SupportedOS(Enum):
@@ -31,10 +41,18 @@ class WindowStatus(Enum):
     out_of_focus: str = "Out of focus"
 
 
-def get_frame_reader(video_source):
+def get_frame_reader(video_source, frame_cache_max_bytes: Optional[int] = None):
     if isinstance(video_source, (str, Path)):
         path = Path(video_source)
-        if path.is_file():
+        frame_cache_path = find_frame_cache(path) if path.exists() else None
+        if frame_cache_path is not None:
+            print(f"Reading the frames of {video_source} from the frame cache {frame_cache_path}")
+            frame_reader = MemmapFrameReader(frame_cache_path)
+        elif path.suffix == ".npy":
+            frame_reader = ArrayFrameReader(path)
+        elif path.suffix.lower() in ARCHIVE_SUFFIXES:
+            frame_reader = ArchiveFrameReader(path)
+        elif path.is_file():
             frame_reader = LocalVideoFileReader(video_source)
         elif path.is_dir():
             frame_reader = LocalDirReader(video_source)
@@ -42,11 +60,17 @@ def get_frame_reader(video_source):
             raise IOError(f"{video_source} not found")
     elif isinstance(video_source, FrameReader):
         frame_reader = video_source
+    elif isinstance(video_source, np.ndarray):
+        frame_reader = ArrayFrameReader(video_source)
     else:
         raise ValueError(
-            "video_source can needs to be one of {path to a video file, path to frame folder,"
-            " an object of a class that implements FrameReader}"
+            "video_source can needs to be one of {path to a video file, path to frame folder, path to a .npy file,"
+            " path to a zip/tar archive of frames,"
+            " a numpy array of frames, an object of a class that implements FrameReader}"
         )
+
+    if frame_cache_max_bytes and not isinstance(frame_reader, CachedFrameReader):
+        frame_reader = CachedFrameReader(frame_reader, max_bytes=frame_cache_max_bytes)
     return frame_reader
 
 
@@ -63,7 +87,8 @@ def get_recorder(record):
 
 
 def hist_eq(img, max_value):
-    hist, bins = np.histogram(img.flatten(), max_value, (0, max_value))  # Collect 16 bits histogram (65536 = 2^16).
+    # one bin for every value from 0 to max_value, so that pixels of max_value are in the look-up table as well
+    hist, bins = np.histogram(img.flatten(), max_value + 1, (0, max_value + 1))
     cdf = hist.cumsum()
 
     cdf_m = np.ma.masked_equal(cdf, 0)  # Find the minimum histogram value (excluding 0)
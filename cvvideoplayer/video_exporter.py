@@ -0,0 +1,237 @@
+"""
+This module renders videos offline: the frame edit callbacks are run on every frame of a range at the native resolution
+of the video and the edited frames are written to a video file, without showing them. The range is split into
+segments that are rendered in parallel by a pool of processes, each with its own frame reader and its own copies of the
+callbacks, and the rendered segments are then joined in order.
+
+Callbacks that depend on the previous frames declare it (see BaseFrameEditCallback): the frames before a segment are
+run through these callbacks without writing them (warmup_frames), or the video is rendered as a single segment
+(must_run_sequentially).
+
+Example:
+    if __name__ == "__main__":  # the worker processes import the main module
+        export_video("video.mp4", "annotated_video.mp4", frame_edit_callbacks=[DetectionsCsvPlotter(csv_path)])
+"""
+
+import copy
+import math
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .display_managers.null_display_manager import NullDisplayManager
+from .frame_editors import BaseFrameEditCallback, FitFrameToScreen
+from .frame_reader import FrameReader
+from .input_management.scripted_input_parser import ScriptedInputParser
+from .utils.video_player_utils import get_frame_reader
+
+VideoSource = Union[str, Path, Callable[[], FrameReader]]
+DEFAULT_EXPORT_FPS = 30
+
+
+class _Segment(NamedTuple):
+    video_source: VideoSource
+    frame_edit_callbacks: List[BaseFrameEditCallback]
+    warmup_start_frame: int
+    start_frame: int
+    end_frame: int
+    output_path: Path
+    fps: float
+    output_size: Tuple[int, int]
+
+
+def export_video(
+    video_source: VideoSource,
+    output_path: Union[str, Path],
+    frame_edit_callbacks: Optional[List[BaseFrameEditCallback]] = None,
+    start_frame: int = 0,
+    end_frame: Optional[int] = None,
+    num_workers: Optional[int] = None,
+    segment_size: Optional[int] = None,
+    fps: Optional[float] = None,
+    output_size: Optional[Tuple[int, int]] = None,
+) -> Path:
+    """
+    Params:
+    - video_source : Union[str, Path, Callable[[], FrameReader]] The path of the video (or of any source that
+     create_video_player accepts), or a function that creates a FrameReader. Every worker process creates its own
+     reader, so FrameReader instances cannot be passed directly, and the function is pickled, so it should be a module
+     level function or a functools.partial (e.g. partial(LocalVideoFileReader, "video.mp4", use_seek_index=True)).
+    - output_path : Union[str, Path] The path of the output video (mp4v encoded).
+    - frame_edit_callbacks : list, optional The callbacks to run on every frame, every segment is rendered by its own
+     copies of them (default is None - the frames are written as they are).
+    - start_frame : int, optional The first frame to export (default is 0).
+    - end_frame : int, optional The frame after the last frame to export (default is None - the end of the video).
+    - num_workers : int, optional The number of processes rendering segments in parallel (default is None - the
+     number of cores). With a single worker the video is rendered in the calling process.
+    - segment_size : int, optional The number of frames in every segment (default is None - the range is split evenly
+     between the workers).
+    - fps : float, optional The frame rate of the output video (default is None - the frame rate of the source, or 30
+     if it is unknown).
+    - output_size : Tuple[int, int], optional The (width, height) of the output video (default is None - the size of
+     the frames of the source).
+
+    Returns the path of the output video.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(exist_ok=True, parents=True)
+    frame_edit_callbacks = frame_edit_callbacks or []
+    num_workers = num_workers or os.cpu_count() or 1
+
+    frame_reader = _create_frame_reader(video_source)
+    end_frame = len(frame_reader) if end_frame is None else min(end_frame, len(frame_reader))
+    fps = fps or frame_reader.fps or DEFAULT_EXPORT_FPS
+    if output_size is None:
+        first_frame = frame_reader.get_frame(start_frame)
+        output_size = (first_frame.shape[1], first_frame.shape[0])
+    frame_reader.teardown()
+    assert start_frame < end_frame, f"there are no frames to export between {start_frame=} and {end_frame=}"
+
+    enabled_callbacks = [callback for callback in frame_edit_callbacks if callback.enabled]
+    if any(callback.must_run_sequentially for callback in enabled_callbacks):
+        print("Some of the callbacks must run sequentially, the video is rendered as a single segment")
+        segment_size = end_frame - start_frame
+    elif segment_size is None:
+        segment_size = math.ceil((end_frame - start_frame) / num_workers)
+    warmup_frames = max([callback.warmup_frames for callback in enabled_callbacks], default=0)
+
+    with tempfile.TemporaryDirectory(dir=output_path.parent) as segments_dir:
+        segments = []
+        for segment_start_frame in range(start_frame, end_frame, segment_size):
+            segments.append(
+                _Segment(
+                    video_source=video_source,
+                    frame_edit_callbacks=frame_edit_callbacks,
+                    warmup_start_frame=max(start_frame, segment_start_frame - warmup_frames),
+                    start_frame=segment_start_frame,
+                    end_frame=min(end_frame, segment_start_frame + segment_size),
+                    output_path=Path(segments_dir) / f"segment_{len(segments):05d}{output_path.suffix}",
+                    fps=fps,
+                    output_size=output_size,
+                )
+            )
+
+        if len(segments) == 1:
+            _export_segment(segments[0]._replace(output_path=output_path))
+        elif num_workers == 1:
+            for segment in segments:
+                _export_segment(segment)
+        else:
+            _export_segments_in_parallel(segments, num_workers)
+
+        if len(segments) > 1:
+            _concat_videos([segment.output_path for segment in segments], output_path, fps, output_size)
+    print(f"Exported frames {start_frame} to {end_frame - 1} to {output_path}")
+    return output_path
+
+
+def _create_frame_reader(video_source: VideoSource) -> FrameReader:
+    if callable(video_source):
+        return video_source()
+    return get_frame_reader(video_source)
+
+
+def _export_segments_in_parallel(segments: List[_Segment], num_workers: int) -> None:
+    # OpenCV is not safe to use in forked processes once it started its threads, so the workers are spawned
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=min(num_workers, len(segments)), mp_context=mp_context, initializer=_init_worker
+    ) as executor:
+        futures = [executor.submit(_export_segment, segment) for segment in segments]
+        for num_done, future in enumerate(as_completed(futures), start=1):
+            future.result()
+            print(f"Exported {num_done}/{len(segments)} segments")
+
+
+def _init_worker() -> None:
+    # the processes already use all the cores, more threads per process would only compete with each other
+    cv2.setNumThreads(1)
+
+
+def _export_segment(segment: _Segment) -> None:
+    from .video_players.base_video_player import VideoPlayer
+
+    # every segment starts from fresh callbacks, also when the segments are rendered in this process
+    frame_edit_callbacks = copy.deepcopy(segment.frame_edit_callbacks)
+    video_player = VideoPlayer(
+        video_source=_create_frame_reader(segment.video_source),
+        # the "screen" is the size of the frames, so the frames are edited at their native resolution
+        display_manager=NullDisplayManager(screen_size=segment.output_size),
+        input_parser=ScriptedInputParser([], exit_at_end=False),
+        start_from_frame=segment.warmup_start_frame,
+        frame_edit_callbacks=frame_edit_callbacks,
+    )
+    # only the callbacks that depend on the previous frames see the warm-up frames, the display resize is kept since it
+    # sets the frames that the callbacks after it edit
+    callbacks_to_skip_in_warmup = [
+        callback
+        for callback in frame_edit_callbacks
+        if callback.enabled and callback.warmup_frames == 0 and not isinstance(callback, FitFrameToScreen)
+    ]
+    video_writer = _create_video_writer(segment.output_path, segment.fps, segment.output_size)
+    try:
+        if segment.warmup_start_frame < segment.start_frame:
+            _enable_disable_callbacks(callbacks_to_skip_in_warmup)
+            for frame_num in range(segment.warmup_start_frame, segment.start_frame):
+                video_player.render_frame(frame_num)
+            _enable_disable_callbacks(callbacks_to_skip_in_warmup)
+        for frame_num in range(segment.start_frame, segment.end_frame):
+            _write_frame(video_writer, video_player.render_frame(frame_num), segment.output_size)
+    finally:
+        video_writer.release()
+        video_player.__exit__()
+
+
+def _enable_disable_callbacks(callbacks: List[BaseFrameEditCallback]) -> None:
+    for callback in callbacks:
+        callback.enable_disable()
+
+
+def _create_video_writer(output_path: Path, fps: float, output_size: Tuple[int, int]) -> cv2.VideoWriter:
+    return cv2.VideoWriter(str(output_path), cv2.VideoWriter_fourcc("m", "p", "4", "v"), fps, output_size)
+
+
+def _write_frame(video_writer: cv2.VideoWriter, frame: np.ndarray, output_size: Tuple[int, int]) -> None:
+    if frame.ndim == 2:
+        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+    if (frame.shape[1], frame.shape[0]) != output_size:
+        frame = cv2.resize(frame, output_size)
+    video_writer.write(frame)
+
+
+def _concat_videos(video_paths: List[Path], output_path: Path, fps: float, output_size: Tuple[int, int]) -> None:
+    """
+    Joins the videos with ffmpeg without encoding them again, or decodes and encodes them again if ffmpeg is not
+    installed
+    """
+    ffmpeg_path = shutil.which("ffmpeg")
+    if ffmpeg_path is not None:
+        concat_list_path = video_paths[0].parent / "concat_list.txt"
+        concat_list_path.write_text("".join(f"file '{video_path.resolve()}'\n" for video_path in video_paths))
+        subprocess.run(
+            [ffmpeg_path, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(concat_list_path)]
+            + ["-c", "copy", str(output_path)],
+            check=True,
+        )
+        return
+
+    print("ffmpeg was not found, the segments are joined by encoding them again (install ffmpeg to avoid it)")
+    video_writer = _create_video_writer(output_path, fps, output_size)
+    try:
+        for video_path in video_paths:
+            video_reader = cv2.VideoCapture(str(video_path))
+            ret, frame = video_reader.read()
+            while ret:
+                video_writer.write(frame)
+                ret, frame = video_reader.read()
+            video_reader.release()
+    finally:
+        video_writer.release()
@@ -1,6 +1,8 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from queue import Empty
-from typing import Optional, List, Union
+from typing import Any, Dict, Optional, List, Union, Hashable, Tuple
 from functools import partial
 
 import cv2
@@ -11,12 +13,20 @@ from ..frame_editors import (
     BaseFrameEditCallback,
     FitFrameToScreen,
     FrameInfoOverlay,
+    FrameResolution,
     KeyMapOverlay,
+    LatencyStatsOverlay,
 )
-from ..frame_reader import FrameReader
+from ..frame_reader import FrameReader, LocalDirReader, ProxyFrameReader, SynchronizedFrameReader
 from ..input_management.base_input_parser import BaseInputParser
 from ..input_management.input_handler import InputHandler
 from ..recorder import AbstractRecorder
+from ..utils.cache_utils import LRUByteCache
+from ..utils.frame_transform_utils import FrameTransform
+from ..utils.latency_utils import LatencyTracker
+from ..utils.playback_clock_utils import PlaybackClock
+from ..utils.pyramid_utils import TiledImagePyramid
+from ..utils.ui_utils import SingleInput, InputType
 from ..utils.video_player_utils import (
     calc_screen_adjusted_frame_size,
     KeyFunction,
@@ -24,6 +34,18 @@ from ..utils.video_player_utils import (
     get_frame_reader,
     get_recorder, WindowStatus,
 )
+from .playback_pipeline import PlaybackPipeline
+
+# enough for the frame fitting callbacks of both sides of the double frame player
+MAX_CACHED_PYRAMIDS = 2
+# the memory used to memoize the outputs of the callbacks while paused
+RENDER_CACHE_MAX_BYTES = 256 * 1024**2
+# the playback speeds that can be chosen with the up and down keys, below 1 the video is played in slow motion
+PLAYBACK_SPEEDS = (0.125, 0.25, 0.5, 1, 2, 4, 8, 16)
+# from this speed the played frames snap to the nearby keyframes of videos (if the frame reader knows them)
+KEYFRAME_ONLY_SPEED = 8
+# the keys that only zoom or pan, and so do not change the content of the frame
+VIEWPORT_KEYS = {"ctrl+up", "ctrl+down", "alt+left", "alt+right", "alt+up", "alt+down"}
 
 
 class VideoPlayer:
@@ -35,6 +57,11 @@ class VideoPlayer:
         start_from_frame: int = 0,
         frame_edit_callbacks: Optional[List[BaseFrameEditCallback]] = None,
         record: Union[bool, AbstractRecorder] = False,
+        frame_cache_max_bytes: Optional[int] = None,
+        use_proxy: bool = False,
+        pipelined_playback: bool = False,
+        real_time_playback: bool = False,
+        target_fps: Optional[float] = None,
     ):
         """
         Params:
@@ -45,19 +72,46 @@ class VideoPlayer:
          Each callback must be an instance of BaseFrameEditCallback.
         - record : Union[bool, AbstractRecorder], optional Whether to record the video or not (default is False).
         It can also be an instance of AbstractRecorder for custom recording functionality.
+        - frame_cache_max_bytes : int, optional If given, the most recently used frames are kept in memory up to this
+        total size, so that revisiting frames does not decode them again (default is None - no caching).
+        - use_proxy : bool, optional If True and video_source is a path, a copy of the video downscaled to the screen
+        size is generated in the background and shown while playing and scrubbing, the full resolution frame is shown
+        once the video is paused. The proxy is only used when all the enabled callbacks declare that they work on
+        downscaled frames (see FrameResolution) and the video is not recorded. Directories of JPEG frames are decoded
+        at a reduced resolution instead of generating a copy (default is False).
+        - pipelined_playback : bool, optional If True, while playing, frames are decoded, edited by the callbacks and
+        recorded on separate threads, so the playback rate is bounded by the slowest of these stages instead of by
+        their sum. Each callback still sees the frames in order, on a single thread, but the few frames that were
+        edited ahead when the video is paused are edited again once it is resumed (default is False).
+        - real_time_playback : bool, optional If True, the video is played at the speed it was recorded at, according
+        to its frame rate or the timestamps of its frames. Frames are skipped when editing them cannot keep up and
+        playing waits when it is ahead. The dropped frames and the lateness are shown by FrameInfoOverlay (default
+        is False - frames are played as fast as they are edited).
+        - target_fps : float, optional The frame rate to play the video at in real time, for sources without a frame
+        rate (e.g. directories of frames) or to override it. Implies real_time_playback (default is None).
         """
         self._window_name = "CVvideoPlayer"
         self._display_manager = display_manager
         self._input_parser = input_parser
-        self.frame_reader = get_frame_reader(video_source)
+        self.frame_reader = get_frame_reader(video_source, frame_cache_max_bytes=frame_cache_max_bytes)
         self.input_handler = InputHandler(self._window_name)
         self._recorder = get_recorder(record)
+        self._playback_pipeline = None
+        if pipelined_playback:
+            # callbacks may read frames while the pipeline decodes the next ones
+            self.frame_reader = SynchronizedFrameReader(self.frame_reader)
+            self._playback_pipeline = PlaybackPipeline(
+                decode_func=self._read_played_frame,
+                edit_func=self._edit_played_frame,
+                record_func=self._record_frame if self._recorder is not None else None,
+            )
 
-        self._last_frame = len(self.frame_reader) - 1
         self._current_frame_num = start_from_frame
 
         self._screen_size = self._display_manager.get_screen_size()
         self._original_frame_size = None
+        # maps coordinates in the frames of the video source to coordinates in the frame edited by the current callback
+        self.frame_transform = FrameTransform()
 
         self._frame_edit_callbacks = frame_edit_callbacks
         if self._frame_edit_callbacks is None:
@@ -65,29 +119,58 @@ class VideoPlayer:
                 FitFrameToScreen(),
                 FrameInfoOverlay(),
                 KeyMapOverlay(),
+                LatencyStatsOverlay(),
             ]
+        self._synchronize_frame_reader_for_analysis(self._frame_edit_callbacks)
 
         self._play = False
+        self._play_direction = 1
+        self._playback_speed = 1
         self._exit = False
+        self._proxy_reader = None
+        self.is_showing_proxy = False
+        # whether the frame that the callbacks edit is a proxy frame, while pipelined playback edits frames ahead it may
+        # differ from is_showing_proxy
+        self.is_editing_proxy = False
+        self._zoom_factor = 1.0
+        self._zoom_viewport_xy = (0.0, 0.0)  # the top left corner of the zoomed viewport in normalized coordinates
+        self._pyramid_cache: "OrderedDict[Hashable, TiledImagePyramid]" = OrderedDict()
+        self._render_cache = LRUByteCache(RENDER_CACHE_MAX_BYTES)
+        # runs the analyze_frame of the callbacks with concurrent_analysis, created once several of them run together
+        self._analysis_executor: Optional[ThreadPoolExecutor] = None
+        # times the decoding, editing, recording and showing of every frame (see LatencyStatsOverlay)
+        self.latency_tracker = LatencyTracker()
+        self.playback_clock = self._create_playback_clock(real_time_playback, target_fps)
         self._add_video_control_key_functions()
         self._setup_callbacks()
 
         current_frame = self._get_current_frame()
+        self._original_frame_size = (current_frame.shape[1], current_frame.shape[0])
         self._screen_adjusted_frame_size = calc_screen_adjusted_frame_size(
             screen_size=self._screen_size,
             frame_width=current_frame.shape[1],
             frame_height=current_frame.shape[0],
         )
 
+        if use_proxy and isinstance(video_source, (str, Path)):
+            self._proxy_reader = self._create_proxy_reader(video_source, current_frame)
+
     def __enter__(self):
         return self
 
     def __exit__(self, *args):
-        cv2.destroyAllWindows()
+        self._display_manager.close_windows()
+        if self._playback_pipeline is not None:
+            self._playback_pipeline.flush()
+        if self._analysis_executor is not None:
+            self._analysis_executor.shutdown()
         if self._recorder is not None:
             self._recorder.teardown()
         for callback in self._frame_edit_callbacks:
             callback.teardown()
+        self.frame_reader.teardown()
+        if self._proxy_reader is not None:
+            self._proxy_reader.teardown()
         self._input_parser.stop()
 
     def run(self) -> None:
@@ -102,11 +185,84 @@ class VideoPlayer:
         self._show_current_frame()
         self._window_id = self._display_manager.get_player_window_id(window_name=self._window_name)
         self._display_manager.set_icon(window_name=self._window_name, window_id=self._window_id)
-        cv2.pollKey()
+        self._display_manager.process_events()
 
-    def crop_and_resize_frame(self, frame) -> np.ndarray:
-        frame = cv2.resize(frame, self._screen_adjusted_frame_size)
-        return frame
+    def crop_and_resize_frame(self, frame, cache_key: Optional[Hashable] = None) -> np.ndarray:
+        """
+        Crops the zoomed viewport out of the frame and resizes it to the screen. When zoomed in, the viewport is
+        rendered from a tiled pyramid of the frame (see utils/pyramid_utils.py) so that only the visible part of the
+        frame is processed. Passing a cache_key that identifies the frame (e.g. its frame number) lets the pyramid be
+        reused by the next zoom and pan steps on the same frame.
+        """
+        if self._zoom_factor == 1:
+            return cv2.resize(frame, self._screen_adjusted_frame_size)
+
+        pyramid = None
+        if cache_key is not None:
+            cache_key = (cache_key, frame.shape)  # proxy frames and full resolution frames have different pyramids
+            pyramid = self._pyramid_cache.get(cache_key)
+        if pyramid is None:
+            pyramid = TiledImagePyramid(frame)
+            if cache_key is not None:
+                self._pyramid_cache[cache_key] = pyramid
+                if len(self._pyramid_cache) > MAX_CACHED_PYRAMIDS:
+                    self._pyramid_cache.popitem(last=False)
+        else:
+            self._pyramid_cache.move_to_end(cache_key)
+
+        viewport_xywh = self._get_zoom_viewport_xywh(frame_width=frame.shape[1], frame_height=frame.shape[0])
+        return pyramid.render(viewport_xywh, output_size=self._screen_adjusted_frame_size)
+
+    def _get_zoom_viewport_xywh(self, frame_width: int, frame_height: int) -> Tuple[float, float, float, float]:
+        viewport_size = 1 / self._zoom_factor
+        return (
+            self._zoom_viewport_xy[0] * frame_width,
+            self._zoom_viewport_xy[1] * frame_height,
+            viewport_size * frame_width,
+            viewport_size * frame_height,
+        )
+
+    def _set_zoom(self, curser_x: int, curser_y: int, scroll_direction: int) -> None:
+        adjusted_width, adjusted_height = self._screen_adjusted_frame_size
+        norm_curser_x = max(0.0, min(1.0, curser_x / adjusted_width))
+        norm_curser_y = max(0.0, min(1.0, curser_y / adjusted_height))
+        self._zoom(scroll_direction, anchor_xy=(norm_curser_x, norm_curser_y))
+
+    def _zoom(self, direction: int, anchor_xy=(0.5, 0.5)) -> None:
+        """
+        Zooms in (direction=1) or out (direction=-1) while keeping the point under anchor_xy (normalized window
+        coordinates) in place
+        """
+        new_zoom_factor = max(1.0, min(20.0, self._zoom_factor * 1.25**direction))
+        viewport_size = 1 / self._zoom_factor
+        new_viewport_size = 1 / new_zoom_factor
+        self._zoom_factor = new_zoom_factor
+        self._move_zoom_viewport(
+            x=self._zoom_viewport_xy[0] + anchor_xy[0] * (viewport_size - new_viewport_size),
+            y=self._zoom_viewport_xy[1] + anchor_xy[1] * (viewport_size - new_viewport_size),
+        )
+
+    def _pan(self, dx: float, dy: float) -> None:
+        """
+        Moves the zoomed viewport by a fraction of its size
+        """
+        viewport_size = 1 / self._zoom_factor
+        self._move_zoom_viewport(
+            x=self._zoom_viewport_xy[0] + dx * viewport_size,
+            y=self._zoom_viewport_xy[1] + dy * viewport_size,
+        )
+
+    def _move_zoom_viewport(self, x: float, y: float) -> None:
+        max_corner = 1 - 1 / self._zoom_factor
+        self._zoom_viewport_xy = (max(0.0, min(max_corner, x)), max(0.0, min(max_corner, y)))
+
+    def _invalidate_pyramid_cache(self, single_input: SingleInput) -> None:
+        # any input other than zooming and panning may change the frame content (e.g. enabling a callback)
+        is_viewport_input = single_input.input_type == InputType.MouseScroll or (
+            single_input.input_type == InputType.KeyPress and single_input.input_data in VIEWPORT_KEYS
+        )
+        if not is_viewport_input:
+            self._pyramid_cache.clear()
 
     def _run_player_loop(self):
         while not self._exit:
@@ -115,7 +271,7 @@ class VideoPlayer:
                 break
             elif window_status == WindowStatus.out_of_focus:
                 self._input_parser.pause()
-                cv2.pollKey()
+                self._display_manager.process_events()
                 continue
             else:
                 self._input_parser.resume()
@@ -123,6 +279,7 @@ class VideoPlayer:
                 if single_input is None:
                     continue
 
+            self._invalidate_pyramid_cache(single_input)
             self.input_handler.handle_input(single_input)
 
             if self._play:
@@ -143,7 +300,7 @@ class VideoPlayer:
         try:
             return self._input_parser.get_input()
         except Empty:
-            cv2.pollKey()
+            self._display_manager.process_events()
             return None
 
     def _setup_callbacks(self):
@@ -151,69 +308,442 @@ class VideoPlayer:
             assert isinstance(callback, BaseFrameEditCallback), (
                 "frame_editor must be a derived class of" " BaseFrameEditor"
             )
-            for key_function in callback.key_function_to_register:
-                assert isinstance(key_function, KeyFunction), (
-                    f"{callback.__class__.__name__} is trying to register a key function"
-                    f" (key = {key_function.key}) which is not an instance of KeyFunction"
-                )
-                self.input_handler.register_key_function(
-                    key_function,
-                    callback.__class__.__name__,
-                )
-
+            self._register_callback_key_functions(callback, self.input_handler)
             callback.setup(video_player=self, frame=self._get_current_frame())
 
-    def _show_current_frame(self, record_frame=True):
-        frame = self._get_current_frame()
-        frame_for_display = self._create_frame_to_display(frame, record_frame=record_frame)
-        self._show_frame(frame_for_display)
+    @staticmethod
+    def _register_callback_key_functions(callback: BaseFrameEditCallback, input_handler: InputHandler) -> None:
+        for key_function in callback.key_function_to_register:
+            assert isinstance(key_function, KeyFunction), (
+                f"{callback.__class__.__name__} is trying to register a key function"
+                f" (key = {key_function.key}) which is not an instance of KeyFunction"
+            )
 
-    def _create_frame_to_display(self, original_frame, record_frame) -> np.ndarray:
-        frame_to_display = original_frame.copy()
+            # any key function of the callback may change its settings, so its memoized outputs are invalidated
+            def func_and_bump_state_version(*args, func=key_function.func, **kwargs):
+                func(*args, **kwargs)
+                callback.bump_state_version()
 
-        for callback in self._frame_edit_callbacks:
-            if not callback.enabled:
-                continue
-            frame_to_display = callback.edit_frame(
-                video_player=self,
-                frame=frame_to_display,
-                frame_num=self._current_frame_num,
-                original_frame=original_frame,
+            input_handler.register_key_function(
+                KeyFunction(key_function.key, func_and_bump_state_version, key_function.description),
+                callback.__class__.__name__,
             )
 
+    def _show_current_frame(self, record_frame=True):
+        frame = self._get_current_frame()
+        # a paused frame is often rendered again (e.g. after toggling an overlay), unlike a played one
+        frame_to_display, frame_to_record = self._create_frames(frame, self._current_frame_num, memoize=not self._play)
+        if self.playback_clock is not None:
+            self.playback_clock.wait_until_due(self._current_frame_num)
         if record_frame and self._recorder is not None:
-            self._recorder.write_frame_to_video(self, frame_to_display, self._current_frame_num)
+            self._record_frame(frame_to_record, self._current_frame_num)
+        with self.latency_tracker.span("display", self._current_frame_num):
+            self._show_frame(frame_to_display)
+        if self.playback_clock is not None:
+            self.playback_clock.frame_shown(self._current_frame_num)
+
+    def render_frame(self, frame_num: int) -> np.ndarray:
+        """
+        Runs the enabled callbacks on the frame like while playing (their outputs are not memoized) and returns the
+        frame to record, without showing it. Used to render videos offline (see export_video).
+        """
+        self._current_frame_num = frame_num
+        _, frame_to_record = self._create_frames(self._get_current_frame(), frame_num, memoize=False)
+        return frame_to_record
+
+    def _create_frames(
+        self, original_frame: np.ndarray, frame_num: int, memoize: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the frame to display and the frame to record, memoize is passed on to _run_callback_chain
+        """
+        frame_to_display = self._run_callback_chain(self._frame_edit_callbacks, original_frame, frame_num, memoize)
+        return frame_to_display, frame_to_display
+
+    def _record_frame(self, frame: np.ndarray, frame_num: int) -> None:
+        with self.latency_tracker.span("record", frame_num):
+            self._recorder.write_frame_to_video(self, frame, frame_num)
 
+    def _run_callback_chain(
+        self, callbacks: List[BaseFrameEditCallback], original_frame: np.ndarray, frame_num: int, memoize: bool = False
+    ) -> np.ndarray:
+        """
+        Runs the enabled callbacks in order (see _move_display_resize_forward) on a copy of the original frame, and
+        sets frame_transform for each of them. The analysis of the callbacks with concurrent_analysis runs
+        concurrently before that (see _analyze_frame). If memoize is True (while the video is paused), the output of
+        every callback is memoized by the frame, the zoom and the state versions of the callbacks up to it, so that
+        rendering the same frame again (e.g. after toggling an overlay) resumes from the last unchanged callback.
+        The returned frame may be a read-only memoized frame.
+        """
+        enabled_callbacks = self._move_display_resize_forward([callback for callback in callbacks if callback.enabled])
+        cache_keys = self._get_render_cache_keys(enabled_callbacks, original_frame, frame_num) if memoize else []
+
+        first_callback_to_run = 0
+        frame_to_display = None
+        for callback_idx in reversed(range(len(cache_keys))):
+            memoized_frame = self._render_cache.get(cache_keys[callback_idx])
+            if memoized_frame is not None:
+                if callback_idx == len(enabled_callbacks) - 1:
+                    return memoized_frame
+                first_callback_to_run = callback_idx + 1
+                frame_to_display = memoized_frame.copy()
+                break
+        if frame_to_display is None:
+            # the display resize returns a new frame, so there is no need to copy the original frame before it
+            is_resized_first = len(enabled_callbacks) > 0 and isinstance(enabled_callbacks[0], FitFrameToScreen)
+            frame_to_display = original_frame if is_resized_first else original_frame.copy()
+
+        analysis_results = self._analyze_frame(enabled_callbacks[first_callback_to_run:], original_frame, frame_num)
+        skipped_callbacks = enabled_callbacks[:first_callback_to_run]
+        is_resized = any(isinstance(callback, FitFrameToScreen) for callback in skipped_callbacks)
+        source_size = self._get_source_frame_size(original_frame)
+        for callback_idx in range(first_callback_to_run, len(enabled_callbacks)):
+            self.frame_transform = self._get_frame_transform(frame_to_display, source_size, is_resized)
+            callback = enabled_callbacks[callback_idx]
+            is_resized = is_resized or isinstance(callback, FitFrameToScreen)
+            # only the callbacks that analyze frames expect the analysis_result argument
+            analysis_kwargs = {}
+            if callback.concurrent_analysis:
+                analysis_kwargs["analysis_result"] = analysis_results[id(callback)]
+            with self.latency_tracker.span(callback.__class__.__name__, frame_num, category="edit"):
+                frame_to_display = callback.edit_frame(
+                    video_player=self,
+                    frame=frame_to_display,
+                    frame_num=frame_num,
+                    original_frame=original_frame,
+                    **analysis_kwargs,
+                )
+            if callback_idx < len(cache_keys):
+                # the next callbacks edit the frame in place, so a copy is memoized
+                memoized_frame = frame_to_display.copy()
+                memoized_frame.flags.writeable = False
+                self._render_cache.put(cache_keys[callback_idx], memoized_frame)
         return frame_to_display
 
+    def _analyze_frame(
+        self, callbacks: List[BaseFrameEditCallback], original_frame: np.ndarray, frame_num: int
+    ) -> Dict[int, Any]:
+        """
+        Runs the analyze_frame of the callbacks with concurrent_analysis, on a thread pool if there are several of
+        them, so that the analysis takes as long as the slowest of them instead of their sum.
+        Returns the analysis results by the ids of the callbacks.
+        """
+        analyzing_callbacks = [callback for callback in callbacks if callback.concurrent_analysis]
+        if len(analyzing_callbacks) <= 1:
+            return {
+                id(callback): self._run_analysis(callback, original_frame, frame_num)
+                for callback in analyzing_callbacks
+            }
+        analysis_executor = self._get_analysis_executor()
+        futures = {
+            id(callback): analysis_executor.submit(self._run_analysis, callback, original_frame, frame_num)
+            for callback in analyzing_callbacks
+        }
+        return {callback_id: future.result() for callback_id, future in futures.items()}
+
+    def _run_analysis(self, callback: BaseFrameEditCallback, original_frame: np.ndarray, frame_num: int) -> Any:
+        with self.latency_tracker.span(f"{callback.__class__.__name__} analysis", frame_num, category="analysis"):
+            return callback.analyze_frame(video_player=self, original_frame=original_frame, frame_num=frame_num)
+
+    def _synchronize_frame_reader_for_analysis(self, callbacks: List[BaseFrameEditCallback]) -> None:
+        if any(callback.concurrent_analysis for callback in callbacks) and not isinstance(
+            self.frame_reader, SynchronizedFrameReader
+        ):
+            # the analyzing callbacks may read other frames (e.g. the previous frame) at the same time
+            self.frame_reader = SynchronizedFrameReader(self.frame_reader)
+
+    def _get_analysis_executor(self) -> ThreadPoolExecutor:
+        if self._analysis_executor is None:
+            num_analyzing_callbacks = sum(callback.concurrent_analysis for callback in self._all_frame_edit_callbacks)
+            self._analysis_executor = ThreadPoolExecutor(
+                max_workers=num_analyzing_callbacks, thread_name_prefix="analysis"
+            )
+        return self._analysis_executor
+
+    @staticmethod
+    def _move_display_resize_forward(callbacks: List[BaseFrameEditCallback]) -> List[BaseFrameEditCallback]:
+        """
+        Moves the display resize (FitFrameToScreen) right after the last callback before it that requires native
+        resolution frames, so that the callbacks that also work on display resolution frames edit the small frame.
+        The order of all the other callbacks is kept.
+        """
+        resize_idxs = [idx for idx, callback in enumerate(callbacks) if isinstance(callback, FitFrameToScreen)]
+        if len(resize_idxs) == 0:
+            return callbacks
+        resize_idx = resize_idxs[0]
+        new_resize_idx = resize_idx
+        while new_resize_idx > 0 and callbacks[new_resize_idx - 1].required_resolution == FrameResolution.display:
+            new_resize_idx -= 1
+        return (
+            callbacks[:new_resize_idx]
+            + [callbacks[resize_idx]]
+            + callbacks[new_resize_idx:resize_idx]
+            + callbacks[resize_idx + 1 :]
+        )
+
+    def _get_source_frame_size(self, original_frame: np.ndarray) -> Tuple[int, int]:
+        """
+        Returns the (width, height) of the frame in the video source, which may differ between frames (e.g. in a
+        directory of frames). Proxy frames are downscaled, so the size of the first frame of the source is used for them
+        """
+        if self.is_editing_proxy:
+            return self._original_frame_size
+        return original_frame.shape[1], original_frame.shape[0]
+
+    def _get_frame_transform(
+        self, frame: np.ndarray, source_size: Tuple[int, int], is_resized: bool
+    ) -> FrameTransform:
+        source_width, source_height = source_size
+        viewport_xywh = self._get_zoom_viewport_xywh(source_width, source_height) if is_resized else None
+        return FrameTransform.from_viewport(
+            source_size=source_size,
+            frame_size=(frame.shape[1], frame.shape[0]),
+            viewport_xywh=viewport_xywh,
+        )
+
+    def _get_render_cache_keys(
+        self, enabled_callbacks: List[BaseFrameEditCallback], original_frame: np.ndarray, frame_num: int
+    ):
+        """
+        Returns the memoization key of the output of each callback, until the first callback that is not memoized
+        """
+        # a live video grows while paused, which changes the frame count printed on the frame, and the playback speed
+        # is printed as well
+        render_key = (
+            frame_num,
+            original_frame.shape,
+            self._zoom_factor,
+            self._zoom_viewport_xy,
+            self._playback_speed,
+            len(self.frame_reader),
+        )
+        cache_keys = []
+        callback_chain_key = ()
+        for callback in enabled_callbacks:
+            if not callback.memoize_output:
+                break
+            callback_chain_key += ((id(callback), callback.state_version),)
+            cache_keys.append((render_key, callback_chain_key))
+        return cache_keys
+
     def _show_frame(self, frame):
-        cv2.imshow(winname=self._window_name, mat=frame)
-        cv2.pollKey()
+        self._display_manager.show_frame(self._window_name, frame)
 
     def _play_continuously(self) -> None:
+        # playing backwards decodes the video in chunks, which are kept in memory only while it lasts
+        self.frame_reader.set_reverse_playback(self._play_direction < 0)
+        if self.playback_clock is not None:
+            self.playback_clock.start(self._current_frame_num)
+        if self._playback_pipeline is not None:
+            self._play_pipelined()
+        else:
+            self._play_serially()
+        if self.playback_clock is not None:
+            self.playback_clock.stop()
+        self.frame_reader.set_reverse_playback(False)
+
+        if not self._play and self.is_showing_proxy:
+            # playing stopped at the end of the video, the last frame is shown again at full resolution
+            self._show_current_frame(record_frame=False)
+
+    def _play_serially(self) -> None:
         while (not self._input_parser.has_input()) and self._play and not self._exit:
-            self._change_current_frame_num(change_by=1)
+            previous_frame_num = self._current_frame_num
+            next_frame_num = self._get_next_played_frame_num(self._current_frame_num)
+            if next_frame_num is None:
+                # reached the end of the video
+                self._change_current_frame_num(change_by=self._play_direction)
+            else:
+                self._change_current_frame_num(change_by=next_frame_num - self._current_frame_num)
+            if self._current_frame_num == previous_frame_num and self._play:
+                self._display_manager.process_events(wait_ms=5)  # waiting for the next frame of a live stream
+                continue
             self._show_current_frame()
 
+    def _play_pipelined(self) -> None:
+        self._playback_pipeline.start(self._current_frame_num, next_frame_num_func=self._get_next_played_frame_num)
+        # the frames decoded ahead of the shown frame are dropped before handling the input (e.g. a seek)
+        try:
+            while (not self._input_parser.has_input()) and self._play and not self._exit:
+                played_frame = self._playback_pipeline.get_next_frame(timeout=0.005)
+                if played_frame is None:
+                    if self._playback_pipeline.reached_end:
+                        self._play = False
+                    else:
+                        self._display_manager.process_events()
+                    continue
+                self._current_frame_num = played_frame.frame_num
+                if self.playback_clock is not None:
+                    self.playback_clock.wait_until_due(played_frame.frame_num)
+                with self.latency_tracker.span("display", played_frame.frame_num):
+                    self._show_frame(played_frame.frame_to_display)
+                self.is_showing_proxy = played_frame.is_proxy
+                if self.playback_clock is not None:
+                    self.playback_clock.frame_shown(played_frame.frame_num)
+                self._playback_pipeline.record(played_frame)
+        except BaseException:
+            # the error of this thread is raised rather than the errors of the stages it stopped
+            self._playback_pipeline.flush(raise_errors=False)
+            raise
+        self._playback_pipeline.flush()
+
+    def _get_next_played_frame_num(self, frame_num: int) -> Optional[int]:
+        end_frame_num = self._last_frame if self._play_direction > 0 else self._first_frame
+        if (end_frame_num - frame_num) * self._play_direction <= 0:
+            if self._play_direction > 0 and self.frame_reader.is_live:
+                return frame_num  # waiting for the next frame of a live stream
+            return None
+
+        # in fast forward only every few frames are played, the frames in between are neither decoded nor edited
+        step = max(1, int(self._playback_speed))
+        next_frame_num = frame_num + self._play_direction * step
+        if self._play_direction > 0:
+            next_frame_num = min(next_frame_num, end_frame_num)
+        else:
+            next_frame_num = max(next_frame_num, end_frame_num)
+        if self.playback_clock is not None:
+            next_frame_num = self.playback_clock.skip_late_frames(
+                next_frame_num, direction=self._play_direction, end_frame_num=end_frame_num
+            )
+        if self._playback_speed >= KEYFRAME_ONLY_SPEED:
+            next_frame_num = self._snap_to_keyframe(next_frame_num, frame_num, step)
+        return next_frame_num
+
+    def _snap_to_keyframe(self, frame_num: int, played_frame_num: int, step: int) -> int:
+        """
+        Returns the keyframe closest to frame_num, which is faster to decode than any other frame, if it lies within
+        half a step of it (and after played_frame_num in the play direction). Otherwise frame_num is returned, so the
+        frames that are played are still about a step apart when the keyframes are sparse.
+        """
+        keyframe_nums = self.frame_reader.get_keyframe_nums()
+        if keyframe_nums is None or len(keyframe_nums) == 0:
+            return frame_num
+        keyframe_idx = int(np.searchsorted(keyframe_nums, frame_num))
+        nearby_keyframe_nums = keyframe_nums[max(0, keyframe_idx - 1) : keyframe_idx + 1]
+        keyframe_num = int(nearby_keyframe_nums[np.argmin(np.abs(nearby_keyframe_nums - frame_num))])
+        if abs(keyframe_num - frame_num) > step // 2 or (keyframe_num - played_frame_num) * self._play_direction <= 0:
+            return frame_num
+        return keyframe_num
+
+    @property
+    def playback_speed(self) -> float:
+        return self._playback_speed
+
+    def _change_playback_speed(self, change_by: int) -> None:
+        speed_idx = PLAYBACK_SPEEDS.index(self._playback_speed) + change_by
+        speed = PLAYBACK_SPEEDS[max(0, min(len(PLAYBACK_SPEEDS) - 1, speed_idx))]
+        if speed < 1 and self.playback_clock is None:
+            print("Slow motion requires playing in real time, set real_time_playback or target_fps")
+            return
+        self._playback_speed = speed
+        if self.playback_clock is not None:
+            self.playback_clock.set_speed(speed, self._current_frame_num)
+
+    def _edit_played_frame(
+        self, frame_num: int, read_frame: Tuple[np.ndarray, bool]
+    ) -> Tuple[np.ndarray, np.ndarray, bool]:
+        # is_showing_proxy is only set once the frame is shown, by the thread of the player
+        original_frame, self.is_editing_proxy = read_frame
+        frame_to_display, frame_to_record = self._create_frames(original_frame, frame_num, memoize=False)
+        return frame_to_display, frame_to_record, self.is_editing_proxy
+
+    @property
+    def _first_frame(self) -> int:
+        # the oldest frames of a live stream are dropped from its buffer
+        return self.frame_reader.oldest_buffered_frame
+
+    @property
+    def _last_frame(self) -> int:
+        # the frame reader may grow while playing (e.g. a live stream or a frame listing refreshed in the background)
+        return len(self.frame_reader) - 1
+
     def _change_current_frame_num(self, change_by: int) -> None:
         if change_by > 0 and self._current_frame_num == self._last_frame:
-            self._play = False
+            # a live stream keeps playing at its last frame until new frames arrive
+            self._play = self._play and self.frame_reader.is_live
             return
 
-        if change_by < 0 and self._current_frame_num == 0:
+        if change_by < 0 and self._current_frame_num <= self._first_frame:
+            self._play = False
+            self._current_frame_num = self._first_frame
             return
 
-        self._current_frame_num = max(0, min(self._current_frame_num + change_by, self._last_frame))
+        self._current_frame_num = max(self._first_frame, min(self._current_frame_num + change_by, self._last_frame))
 
     def _get_current_frame(self) -> np.ndarray:
-        return self.frame_reader.get_frame(self._current_frame_num)
+        frame, self.is_editing_proxy = self._read_frame(self._current_frame_num)
+        while frame is None and self._current_frame_num < self._first_frame:
+            # the frame was dropped from the buffer of a live stream while it was being read
+            self._current_frame_num = self._first_frame
+            frame, self.is_editing_proxy = self._read_frame(self._current_frame_num)
+        self.is_showing_proxy = self.is_editing_proxy
+        return frame
+
+    def _read_frame(self, frame_num: int) -> Tuple[np.ndarray, bool]:
+        """
+        Returns the frame and whether it is a proxy frame
+        """
+        with self.latency_tracker.span("decode", frame_num):
+            if self._should_show_proxy():
+                frame = self._proxy_reader.get_frame(frame_num)
+                if frame is not None:
+                    return frame, True
+            return self.frame_reader.get_frame(frame_num), False
+
+    def _read_played_frame(self, frame_num: int) -> Optional[Tuple[np.ndarray, bool]]:
+        frame, is_proxy = self._read_frame(frame_num)
+        # a frame of a live stream may be dropped from its buffer after it was chosen to be played
+        return (frame, is_proxy) if frame is not None else None
+
+    def _create_playback_clock(self, real_time_playback: bool, target_fps: Optional[float]) -> Optional[PlaybackClock]:
+        if target_fps is not None:
+            return PlaybackClock(get_timestamp_ms=lambda frame_num: frame_num * 1000 / target_fps)
+        if not real_time_playback:
+            return None
+        if self.frame_reader.get_timestamp_ms(0) is None:
+            print("The frame rate of the video is unknown, set target_fps to play it in real time")
+            return None
+        return PlaybackClock(get_timestamp_ms=self.frame_reader.get_timestamp_ms)
+
+    def _create_proxy_reader(self, video_source: Union[str, Path], frame: np.ndarray) -> Optional[FrameReader]:
+        if self._screen_adjusted_frame_size[0] >= frame.shape[1]:
+            return None  # the frames are not downscaled for display so a proxy would not be faster
+
+        if Path(video_source).is_dir():
+            # JPEG frames can be decoded directly at a reduced resolution, which is as fast as reading a proxy
+            reduced_reader = LocalDirReader(video_source, target_size=self._screen_adjusted_frame_size)
+            if reduced_reader.decode_scale > 1:
+                return reduced_reader
+            reduced_reader.teardown()
+        return ProxyFrameReader(video_source, frame_size=self._screen_adjusted_frame_size)
+
+    @property
+    def _all_frame_edit_callbacks(self) -> List[BaseFrameEditCallback]:
+        return self._frame_edit_callbacks
+
+    def _should_show_proxy(self) -> bool:
+        """
+        Proxy frames are shown only while the video is playing or while more input is waiting to be handled
+        (e.g. when holding an arrow key), the full resolution frame is shown once the player is idle
+        """
+        if self._proxy_reader is None or self._recorder is not None:
+            return False
+        if not (self._play or self._input_parser.has_input()):
+            return False
+        return all(
+            callback.required_resolution == FrameResolution.display
+            for callback in self._all_frame_edit_callbacks
+            if callback.enabled
+        )
 
     def _pause_and_change_current_frame(self, change_by: int) -> None:
         self._play = False
         self._change_current_frame_num(change_by)
 
-    def _play_pause(self):
-        self._play = not self._play
+    def _play_pause(self, direction: int = 1):
+        # switching direction while playing keeps the video playing
+        self._play = not self._play or direction != self._play_direction
+        self._play_direction = direction
 
     def _set_exit_to_true(self):
         self._exit = True
@@ -226,12 +756,22 @@ class VideoPlayer:
     def video_control_key_functions(self) -> List[KeyFunction]:
         default_key_functions = [
             KeyFunction("space", self._play_pause, "Play/Pause video"),
+            KeyFunction("shift+space", partial(self._play_pause, -1), "Play/Pause video backwards"),
             KeyFunction("right", partial(self._pause_and_change_current_frame, 1), "Next frame"),
             KeyFunction("left", partial(self._pause_and_change_current_frame, -1), "Previous frame"),
             KeyFunction("ctrl+right", partial(self._pause_and_change_current_frame, 10), "10 frames forward"),
             KeyFunction("ctrl+left", partial(self._pause_and_change_current_frame, -10), "10 frames back"),
             KeyFunction("ctrl+shift+right", partial(self._pause_and_change_current_frame, 50), "50 frames forward"),
             KeyFunction("ctrl+shift+left", partial(self._pause_and_change_current_frame, -50), "50 frames back"),
+            KeyFunction("up", partial(self._change_playback_speed, 1), "Faster playback (up to 16x)"),
+            KeyFunction("down", partial(self._change_playback_speed, -1), "Slower playback (down to 1/8x)"),
+            KeyFunction("mouse_scroll", self._set_zoom, "Zoom in/out around the mouse cursor"),
+            KeyFunction("ctrl+up", partial(self._zoom, 1), "Zoom in"),
+            KeyFunction("ctrl+down", partial(self._zoom, -1), "Zoom out"),
+            KeyFunction("alt+left", partial(self._pan, -0.1, 0), "Pan left"),
+            KeyFunction("alt+right", partial(self._pan, 0.1, 0), "Pan right"),
+            KeyFunction("alt+up", partial(self._pan, 0, -0.1), "Pan up"),
+            KeyFunction("alt+down", partial(self._pan, 0, 0.1), "Pan down"),
             KeyFunction("esc", self._set_exit_to_true, "Exit gracefully"),
         ]
         return default_key_functions
@@ -4,18 +4,11 @@ from typing import Union, Optional, List
 from .base_video_player import VideoPlayer
 from .double_frame_video_player import DoubleFrameVideoPlayer
 from .. import FrameReader, AbstractRecorder
+from ..display_managers.abstract_display_manager import DisplayManager
 from ..frame_editors import BaseFrameEditCallback
+from ..input_management.base_input_parser import BaseInputParser
 from ..utils.video_player_utils import SupportedOS, CURRENT_OS
 
-if CURRENT_OS == SupportedOS.LINUX:
-    from ..display_managers.linux_display_manager import LinuxDisplayManager
-    from ..input_management.linux_input_parser import LinuxInputParser
-
-elif CURRENT_OS == SupportedOS.WINDOWS:
-    from .windows_video_player import WindowsVideoPlayer, WindowsDoubleFrameVideoPlayer
-    from ..display_managers.windows_display_manager import WindowsDisplayManager
-    from ..input_management.windows_input_parser import WindowsInputParser
-
 
 def create_video_player(
     video_source: Union[str, Path, FrameReader],
@@ -24,6 +17,13 @@ def create_video_player(
     record: Union[bool, AbstractRecorder] = False,
     double_frame_mode: bool = False,
     right_frame_callbacks: Optional[List[BaseFrameEditCallback]] = None,
+    frame_cache_max_bytes: Optional[int] = None,
+    use_proxy: bool = False,
+    pipelined_playback: bool = False,
+    real_time_playback: bool = False,
+    target_fps: Optional[float] = None,
+    display_manager: Optional[DisplayManager] = None,
+    input_parser: Optional[BaseInputParser] = None,
 ) -> VideoPlayer:
     """
     Params:
@@ -33,11 +33,12 @@ def create_video_player(
 
     - frame_edit_callbacks : list, optional A list of frame editing callbacks.
      Each callback must be an instance of BaseFrameEditCallback.
-     if None (default) - the video will initialize with three default callbacks namely:
+     if None (default) - the video will initialize with four default callbacks namely:
         frame_edit_callbacks = [
             FitFrameToScreen(),
             FrameInfoOverlay(),
             KeyMapOverlay(),
+            LatencyStatsOverlay(),  # disabled by default, toggled with ctrl+l
         ]
 
     - record : Union[bool, AbstractRecorder], optional Whether to record the video or not (default is False).
@@ -45,52 +46,79 @@ def create_video_player(
     - double_frame_mode: bool, optional Whether to double the video for comparison (default is False).
     - right_frame_callbacks : list, optional A list of frame editing callbacks for the second screen in double frame
                                if None the list will be a copy of the left side frame.
+    - frame_cache_max_bytes : int, optional If given, the most recently used frames are kept in memory up to this
+     total size, so that revisiting frames does not decode them again (default is None - no caching).
+    - use_proxy : bool, optional If True, a copy of the video downscaled to the screen size is generated in the
+     background and shown while playing and scrubbing, which makes high resolution videos much more responsive.
+     The full resolution frame is shown once the video is paused (default is False).
+    - pipelined_playback : bool, optional If True, while playing, frames are decoded, edited by the callbacks and
+     recorded on separate threads, which speeds up playing videos with heavy callbacks (default is False).
+    - real_time_playback : bool, optional If True, the video is played at the speed it was recorded at. Frames are
+     skipped when the callbacks cannot keep up, and the dropped frames are shown by FrameInfoOverlay (default is False).
+    - target_fps : float, optional The frame rate to play the video at in real time, for sources without a frame rate
+     (e.g. directories of frames) or to override it (default is None).
+    - display_manager : DisplayManager, optional The display to show the player on. Pass a NullDisplayManager
+     (display_managers/null_display_manager.py) to run the player without a desktop, e.g. on servers (default is None
+     - the screen of the current OS).
+    - input_parser : BaseInputParser, optional The source of the keyboard and mouse inputs. Pass a ScriptedInputParser
+     (input_management/scripted_input_parser.py) to feed the player with a script of keys instead of listening to the
+     keyboard and the mouse (default is None - the keyboard and the mouse of the current OS).
     """
     video_player_kwargs = {
         "video_source": video_source,
         "start_from_frame": start_from_frame,
         "record": record,
+        "frame_cache_max_bytes": frame_cache_max_bytes,
+        "use_proxy": use_proxy,
+        "pipelined_playback": pipelined_playback,
+        "real_time_playback": real_time_playback,
+        "target_fps": target_fps,
     }
 
-    if CURRENT_OS == SupportedOS.WINDOWS:
-        display_manager = WindowsDisplayManager()
-        input_parser = WindowsInputParser()
-        if double_frame_mode:
-            video_player = WindowsDoubleFrameVideoPlayer(
-                **video_player_kwargs,
-                display_manager=display_manager,
-                input_parser=input_parser,
-                left_frame_callbacks=frame_edit_callbacks,
-                right_frame_callbacks=right_frame_callbacks,
-            )
-        else:
-            video_player = WindowsVideoPlayer(
-                **video_player_kwargs,
-                display_manager=display_manager,
-                input_parser=input_parser,
-                frame_edit_callbacks=frame_edit_callbacks,
-            )
+    # the modules of the OS are imported only when they are used, they need a desktop
+    if CURRENT_OS == SupportedOS.LINUX:
+        if display_manager is None:
+            from ..display_managers.linux_display_manager import LinuxDisplayManager
+
+            display_manager = LinuxDisplayManager()
+        if input_parser is None:
+            from ..input_management.linux_input_parser import LinuxInputParser
+
+            input_parser = LinuxInputParser()
+        video_player_class = DoubleFrameVideoPlayer if double_frame_mode else VideoPlayer
 
-    elif CURRENT_OS == SupportedOS.LINUX:
-        display_manager = LinuxDisplayManager()
-        input_parser = LinuxInputParser()
-        if double_frame_mode:
-            video_player = DoubleFrameVideoPlayer(
-                **video_player_kwargs,
-                display_manager=display_manager,
-                input_parser=input_parser,
-                right_frame_callbacks=right_frame_callbacks,
-                left_frame_callbacks=frame_edit_callbacks,
-            )
+    elif CURRENT_OS == SupportedOS.WINDOWS:
+        if input_parser is None:
+            from ..input_management.windows_input_parser import WindowsInputParser
+
+            input_parser = WindowsInputParser()
+        if display_manager is None:
+            from .windows_video_player import WindowsVideoPlayer, WindowsDoubleFrameVideoPlayer
+            from ..display_managers.windows_display_manager import WindowsDisplayManager
+
+            display_manager = WindowsDisplayManager()
+            video_player_class = WindowsDoubleFrameVideoPlayer if double_frame_mode else WindowsVideoPlayer
         else:
-            video_player = VideoPlayer(
-                **video_player_kwargs,
-                display_manager=display_manager,
-                input_parser=input_parser,
-                frame_edit_callbacks=frame_edit_callbacks
-            )
+            # the rendering fix of the Windows players is only needed for the windows of the screen
+            video_player_class = DoubleFrameVideoPlayer if double_frame_mode else VideoPlayer
 
     else:
         raise ValueError(f"Unsupported OS: {CURRENT_OS}")
 
+    if double_frame_mode:
+        video_player = video_player_class(
+            **video_player_kwargs,
+            display_manager=display_manager,
+            input_parser=input_parser,
+            left_frame_callbacks=frame_edit_callbacks,
+            right_frame_callbacks=right_frame_callbacks,
+        )
+    else:
+        video_player = video_player_class(
+            **video_player_kwargs,
+            display_manager=display_manager,
+            input_parser=input_parser,
+            frame_edit_callbacks=frame_edit_callbacks,
+        )
+
     return video_player
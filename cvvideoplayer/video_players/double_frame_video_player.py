@@ -2,7 +2,7 @@ import time
 from copy import deepcopy
 from functools import partial
 from pathlib import Path
-from typing import Union, Optional, List
+from typing import Union, Optional, List, Tuple
 
 import cv2
 import numpy as np
@@ -29,12 +29,22 @@ class DoubleFrameVideoPlayer(VideoPlayer):
         left_frame_callbacks: Optional[List[BaseFrameEditCallback]] = None,
         right_frame_callbacks: Optional[List[BaseFrameEditCallback]] = None,
         record: Union[bool, AbstractRecorder] = False,
+        frame_cache_max_bytes: Optional[int] = None,
+        use_proxy: bool = False,
+        pipelined_playback: bool = False,
+        real_time_playback: bool = False,
+        target_fps: Optional[float] = None,
     ):
         super().__init__(
             video_source=video_source,
             start_from_frame=start_from_frame,
             frame_edit_callbacks=left_frame_callbacks,
             record=record,
+            frame_cache_max_bytes=frame_cache_max_bytes,
+            use_proxy=use_proxy,
+            pipelined_playback=pipelined_playback,
+            real_time_playback=real_time_playback,
+            target_fps=target_fps,
             display_manager=display_manager,
             input_parser=input_parser,
         )
@@ -48,18 +58,14 @@ class DoubleFrameVideoPlayer(VideoPlayer):
             self._right_frame_callbacks = deepcopy(left_frame_callbacks)
         else:
             self._right_frame_callbacks = right_frame_callbacks
+        self._synchronize_frame_reader_for_analysis(self._right_frame_callbacks)
 
         self._add_more_video_control_key_functions()
         self._setup_right_screen_callbacks()
 
     def _setup_right_screen_callbacks(self):
         for callback in self._right_frame_callbacks:
-            for key_function in callback.key_function_to_register:
-                self.second_input_handler.register_key_function(
-                    key_function,
-                    callback.__class__.__name__,
-                )
-
+            self._register_callback_key_functions(callback, self.second_input_handler)
             callback.setup(video_player=self, frame=self._get_current_frame())
 
     def _add_more_video_control_key_functions(self) -> None:
@@ -78,6 +84,10 @@ class DoubleFrameVideoPlayer(VideoPlayer):
     def _set_current_side(self, side):
         self._current_side = side
 
+    @property
+    def _all_frame_edit_callbacks(self) -> List[BaseFrameEditCallback]:
+        return self._frame_edit_callbacks + self._right_frame_callbacks
+
     def _run_player_loop(self):
         while not self._exit:
             window_status = self._get_window_status()
@@ -85,7 +95,7 @@ class DoubleFrameVideoPlayer(VideoPlayer):
                 break
             elif window_status == WindowStatus.out_of_focus:
                 self._input_parser.pause()
-                cv2.pollKey()
+                self._display_manager.process_events()
                 continue
             else:
                 self._input_parser.resume()
@@ -93,6 +103,7 @@ class DoubleFrameVideoPlayer(VideoPlayer):
                 if single_input is None:
                     continue
 
+            self._invalidate_pyramid_cache(single_input)
             if self._current_side == "left":
                 self.input_handler.handle_input(single_input)
             elif self._current_side == "right":
@@ -103,19 +114,11 @@ class DoubleFrameVideoPlayer(VideoPlayer):
             else:
                 self._show_current_frame()
 
-    def _create_frame_to_display(self, original_frame, record_frame) -> np.ndarray:
-        frame_1_to_display = super()._create_frame_to_display(original_frame=original_frame, record_frame=False)
-        frame_2_to_display = original_frame.copy()
-
-        for callback in self._right_frame_callbacks:
-            if not callback.enabled:
-                continue
-            frame_2_to_display = callback.edit_frame(
-                video_player=self,
-                frame=frame_2_to_display,
-                frame_num=self._current_frame_num,
-                original_frame=original_frame,
-            )
+    def _create_frames(
+        self, original_frame: np.ndarray, frame_num: int, memoize: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        frame_1_to_display, _ = super()._create_frames(original_frame, frame_num, memoize)
+        frame_2_to_display = self._run_callback_chain(self._right_frame_callbacks, original_frame, frame_num, memoize)
 
         double_frame = np.hstack(
             (
@@ -125,8 +128,8 @@ class DoubleFrameVideoPlayer(VideoPlayer):
             )
         )
 
-        if record_frame and self._recorder is not None:
-            self._recorder.write_frame_to_video(self, double_frame, self._current_frame_num)
+        # the focus rectangle is not recorded
+        frame_to_record = double_frame.copy() if self._recorder is not None else double_frame
 
         draw_rectangle(
             double_frame,
@@ -147,4 +150,4 @@ class DoubleFrameVideoPlayer(VideoPlayer):
 
         double_frame = cv2.resize(double_frame, screen_adjusted_frame_size)
 
-        return double_frame
+        return double_frame, frame_to_record
@@ -0,0 +1,190 @@
+"""
+This module implements the pipelined playback of the video player. Playing a frame is split into four stages:
+decoding the frame, running the frame edit callbacks on it, showing it and recording it. Decoding, editing and
+recording run on their own threads and pass frames to each other through bounded queues, while showing the frames
+stays on the thread of the player (OpenCV windows can only be updated from it). The playback rate is therefore bounded
+by the slowest stage instead of by the sum of all the stages.
+
+Each stage runs on a single thread and handles the frames in the order they are played. The frames that were edited
+ahead but not shown yet when the playback stops (because the video was paused or seeked) are dropped, and are edited
+again if the playback resumes from them. So unlike in the serial player, callbacks that keep a state between frames
+may see up to a few frames twice around a pause. Frames are recorded only once they are shown, so recorders see
+exactly the shown frames.
+"""
+
+import threading
+from queue import Queue, Empty, Full
+from typing import Any, Callable, Optional, Tuple, NamedTuple
+
+import numpy as np
+
+_END_OF_PLAYBACK = object()
+_STAGE_POLLING_TIMEOUT = 0.05
+
+
+class PlayedFrame(NamedTuple):
+    frame_num: int
+    frame_to_display: np.ndarray
+    frame_to_record: np.ndarray
+    is_proxy: bool  # whether the frame was edited from a proxy frame (see VideoPlayer's use_proxy)
+
+
+class PlaybackPipeline:
+    def __init__(
+        self,
+        decode_func: Callable[[int], Any],
+        edit_func: Callable[[int, Any], Tuple[np.ndarray, np.ndarray, bool]],
+        record_func: Optional[Callable[[np.ndarray, int], None]] = None,
+        queue_size: int = 4,
+    ):
+        """
+        Args:
+            decode_func: gets a frame number and returns the decoded frame (or anything edit_func expects), or None
+             if the frame is no longer available, in which case it is skipped.
+            edit_func: gets a frame number and the output of decode_func, and returns the frame to display, the
+             frame to record and whether they were edited from a proxy frame.
+            record_func: gets a frame to record and its frame number, None if the video is not recorded.
+            queue_size: the maximal number of frames waiting between two stages.
+        """
+        self._decode_func = decode_func
+        self._edit_func = edit_func
+        self._record_func = record_func
+        self._queue_size = queue_size
+
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._decoded_frames: Optional[Queue] = None
+        self._edited_frames: Optional[Queue] = None
+        self._frames_to_record: Optional[Queue] = None
+        self._error: Optional[BaseException] = None
+        self.reached_end = False
+
+    @property
+    def is_running(self) -> bool:
+        return len(self._threads) > 0
+
+    def start(self, current_frame_num: int, next_frame_num_func: Callable[[int], Optional[int]]) -> None:
+        """
+        Starts playing the frames after current_frame_num. next_frame_num_func gets the last played frame number and
+        returns the next one to play, the same frame number to wait for more frames (e.g. of a live stream) or None
+        at the end of the playback.
+        """
+        assert not self.is_running, "the pipeline is already running, flush it first"
+        self._stop_event.clear()
+        self._decoded_frames = Queue(maxsize=self._queue_size)
+        self._edited_frames = Queue(maxsize=self._queue_size)
+        self._frames_to_record = Queue()
+        self._error = None
+        self.reached_end = False
+
+        self._threads = [
+            threading.Thread(
+                target=self._decode_loop, args=(current_frame_num, next_frame_num_func), name="decode", daemon=True
+            ),
+            threading.Thread(target=self._edit_loop, name="edit", daemon=True),
+        ]
+        if self._record_func is not None:
+            self._threads.append(threading.Thread(target=self._record_loop, name="record", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def get_next_frame(self, timeout: float) -> Optional[PlayedFrame]:
+        """
+        Returns the next played frame, or None if it is not ready within the timeout or the playback reached its end
+        (see reached_end). Errors raised by the decoding and editing stages are raised here.
+        """
+        try:
+            played_frame = self._edited_frames.get(timeout=timeout)
+        except Empty:
+            played_frame = None
+        if self._error is not None:
+            raise self._error
+        if played_frame is _END_OF_PLAYBACK:
+            self.reached_end = True
+            return None
+        return played_frame
+
+    def record(self, played_frame: PlayedFrame) -> None:
+        """
+        Should be called once the frame is shown
+        """
+        if self._record_func is not None:
+            self._frames_to_record.put(played_frame)
+
+    def flush(self, raise_errors: bool = True) -> None:
+        """
+        Stops decoding and editing new frames and drops the frames that were not shown yet, e.g. before the video is
+        paused or seeked. The frames that were already shown are all recorded before it returns. Errors raised by the
+        stages are raised here, unless raise_errors is False (e.g. while another error is handled).
+        """
+        if not self.is_running:
+            return
+        self._stop_event.set()
+        if self._record_func is not None:
+            self._frames_to_record.put(_END_OF_PLAYBACK)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if raise_errors and self._error is not None:
+            raise self._error
+
+    def _put(self, stage_queue: Queue, item) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                stage_queue.put(item, timeout=_STAGE_POLLING_TIMEOUT)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _get(self, stage_queue: Queue):
+        while not self._stop_event.is_set():
+            try:
+                return stage_queue.get(timeout=_STAGE_POLLING_TIMEOUT)
+            except Empty:
+                continue
+        return _END_OF_PLAYBACK
+
+    def _decode_loop(self, frame_num: int, next_frame_num_func: Callable[[int], Optional[int]]) -> None:
+        try:
+            while not self._stop_event.is_set():
+                next_frame_num = next_frame_num_func(frame_num)
+                if next_frame_num is None:
+                    break
+                if next_frame_num == frame_num:
+                    self._stop_event.wait(0.005)
+                    continue
+                frame_num = next_frame_num
+                decoded_frame = self._decode_func(frame_num)
+                if decoded_frame is None:
+                    continue  # the frame is no longer available
+                if not self._put(self._decoded_frames, (frame_num, decoded_frame)):
+                    return
+        except BaseException as e:
+            self._error = e
+        self._put(self._decoded_frames, _END_OF_PLAYBACK)
+
+    def _edit_loop(self) -> None:
+        try:
+            while True:
+                decoded_frame = self._get(self._decoded_frames)
+                if decoded_frame is _END_OF_PLAYBACK:
+                    break
+                frame_num, decoded_output = decoded_frame
+                played_frame = PlayedFrame(frame_num, *self._edit_func(frame_num, decoded_output))
+                if not self._put(self._edited_frames, played_frame):
+                    return
+        except BaseException as e:
+            self._error = e
+        self._put(self._edited_frames, _END_OF_PLAYBACK)
+
+    def _record_loop(self) -> None:
+        # the frames that were shown are recorded even after the pipeline is stopped
+        while True:
+            played_frame = self._frames_to_record.get()
+            if played_frame is _END_OF_PLAYBACK:
+                return
+            try:
+                self._record_func(played_frame.frame_to_record, played_frame.frame_num)
+            except BaseException as e:
+                self._error = e
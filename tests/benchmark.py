@@ -0,0 +1,438 @@
+"""
+Benchmarks the frame readers, the frame edit callbacks and the player loop on synthetic sources, and saves the results
+as JSON so that the performance of two versions can be compared automatically:
+    python benchmark.py --output old_results.json
+    python benchmark.py --output new_results.json --compare old_results.json
+
+The sources are generated from a fixed seed in a temporary directory, and the synthetic frames have texture and
+moving objects so that the callbacks (e.g. optical flow and background subtraction) do real work. Every benchmark
+reports the median, p95 and mean time per frame in milliseconds. Comparing exits with status 1 if the median time of
+any benchmark grew by more than the tolerance.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+from cvvideoplayer import (
+    ArchiveFrameReader,
+    ArrayFrameReader,
+    CachedFrameReader,
+    FrameReader,
+    LocalDirReader,
+    LocalVideoFileReader,
+    PrefetchingFrameReader,
+    create_video_player,
+)
+from cvvideoplayer.display_managers.null_display_manager import NullDisplayManager
+from cvvideoplayer.frame_editors import (
+    BackgroundSub,
+    BaseFrameEditCallback,
+    DetectionsCsvPlotter,
+    FitFrameToScreen,
+    FrameInfoOverlay,
+    FrameNormalizer,
+    HistogramEqualizer,
+    KeyMapOverlay,
+    LatencyStatsOverlay,
+    OpticalFlowPlotter,
+)
+from cvvideoplayer.input_management.scripted_input_parser import ScriptedInputParser
+from cvvideoplayer.video_players.base_video_player import VideoPlayer
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080), "4k": (3840, 2160)}
+SCREEN_SIZE = (1920, 1080)
+NUM_RANDOM_ACCESS_FRAMES = 30
+NUM_DETECTIONS_PER_FRAME = 20
+
+
+class SyntheticFrames:
+    """
+    Deterministic frames of a textured background that pans slowly, with rectangles moving over it
+    """
+
+    def __init__(self, width: int, height: int, seed: int):
+        rng = np.random.default_rng(seed)
+        noise = rng.integers(0, 255, size=(height // 8 + 1, width // 8 + 1, 3), dtype=np.uint8)
+        self._background = cv2.GaussianBlur(cv2.resize(noise, (width + 64, height + 64)), (9, 9), 0)
+        self._width = width
+        self._height = height
+        self._objects = rng.uniform(0, 1, size=(8, 4))  # normalized x, y, x speed, y speed
+
+    def get_frame(self, frame_num: int) -> np.ndarray:
+        shift = frame_num % 64
+        frame = self._background[shift : shift + self._height, shift : shift + self._width].copy()
+        for x, y, speed_x, speed_y in self._objects:
+            object_x = int((x + 0.01 * speed_x * frame_num) % 1 * self._width)
+            object_y = int((y + 0.01 * speed_y * frame_num) % 1 * self._height)
+            cv2.rectangle(
+                frame,
+                (object_x, object_y),
+                (object_x + self._width // 10, object_y + self._height // 10),
+                color=(255, int(255 * speed_x), int(255 * speed_y)),
+                thickness=-1,
+            )
+        return frame
+
+    def get_frames(self, num_frames: int) -> np.ndarray:
+        return np.stack([self.get_frame(frame_num) for frame_num in range(num_frames)])
+
+
+def create_video(path: Path, frames: SyntheticFrames, num_frames: int, size: Tuple[int, int]) -> Path:
+    video_writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 30, size)
+    for frame_num in range(num_frames):
+        video_writer.write(frames.get_frame(frame_num))
+    video_writer.release()
+    return path
+
+
+def create_frame_dir(path: Path, frames: SyntheticFrames, num_frames: int) -> Path:
+    path.mkdir()
+    for frame_num in range(num_frames):
+        cv2.imwrite(str(path / f"frame_{frame_num:05d}.jpg"), frames.get_frame(frame_num))
+    return path
+
+
+def create_archive(path: Path, frame_dir: Path) -> Path:
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for frame_path in sorted(frame_dir.iterdir()):
+            archive.write(frame_path, arcname=frame_path.name)
+    return path
+
+
+def create_npy(path: Path, frames: SyntheticFrames, num_frames: int, size: Tuple[int, int]) -> Path:
+    array = np.lib.format.open_memmap(str(path), mode="w+", dtype=np.uint8, shape=(num_frames, size[1], size[0], 3))
+    for frame_num in range(num_frames):
+        array[frame_num] = frames.get_frame(frame_num)
+    array.flush()
+    del array
+    return path
+
+
+def create_detections_csv(path: Path, num_frames: int, size: Tuple[int, int], seed: int) -> Path:
+    rng = np.random.default_rng(seed)
+    with path.open("w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["frame_id", "label", "x1", "y1", "width", "height", "score"])
+        for frame_num in range(num_frames):
+            for _ in range(NUM_DETECTIONS_PER_FRAME):
+                width, height = rng.uniform(0.02, 0.2) * size[0], rng.uniform(0.02, 0.2) * size[1]
+                x1, y1 = rng.uniform(0, size[0] - width), rng.uniform(0, size[1] - height)
+                writer.writerow([frame_num, "car", x1, y1, width, height, rng.uniform(0.5, 1)])
+    return path
+
+
+def get_timing_result(name: str, group: str, durations_s: List[float], **info) -> Dict:
+    durations_ms = np.array(durations_s) * 1000
+    return {
+        "name": name,
+        "group": group,
+        "median_ms": float(np.median(durations_ms)),
+        "p95_ms": float(np.percentile(durations_ms, 95)),
+        "mean_ms": float(np.mean(durations_ms)),
+        "fps": float(1000 / np.mean(durations_ms)),
+        "num_samples": len(durations_ms),
+        **info,
+    }
+
+
+class TimingDisplayManager(NullDisplayManager):
+    """
+    Keeps the time every frame was shown at
+    """
+
+    def __init__(self, screen_size: Tuple[int, int]):
+        super().__init__(screen_size=screen_size)
+        self.show_times: List[float] = []
+
+    def show_frame(self, window_name: str, frame: np.ndarray) -> None:
+        super().show_frame(window_name, frame)
+        self.show_times.append(time.perf_counter())
+
+
+def create_headless_player(video_source, frame_edit_callbacks: List[BaseFrameEditCallback], timeline=(), **kwargs):
+    return create_video_player(
+        video_source=video_source,
+        frame_edit_callbacks=frame_edit_callbacks,
+        display_manager=TimingDisplayManager(screen_size=SCREEN_SIZE),
+        input_parser=ScriptedInputParser(list(timeline)),
+        **kwargs,
+    )
+
+
+def benchmark_readers(sources: Dict[str, Path], num_frames: int, resolution: str, seed: int) -> List[Dict]:
+    reader_factories: Dict[str, Callable[[], FrameReader]] = {
+        "LocalVideoFileReader": lambda: LocalVideoFileReader(sources["video"]),
+        "LocalVideoFileReader(use_seek_index)": lambda: LocalVideoFileReader(sources["video"], use_seek_index=True),
+        "PrefetchingFrameReader(LocalVideoFileReader)": lambda: PrefetchingFrameReader(
+            LocalVideoFileReader(sources["video"])
+        ),
+        "CachedFrameReader(LocalVideoFileReader)": lambda: CachedFrameReader(LocalVideoFileReader(sources["video"])),
+        "LocalDirReader": lambda: LocalDirReader(sources["frame_dir"]),
+        "ArchiveFrameReader": lambda: ArchiveFrameReader(sources["archive"]),
+        "ArrayFrameReader(npy)": lambda: ArrayFrameReader(sources["npy"]),
+    }
+    random_frame_nums = np.random.default_rng(seed).permutation(num_frames)[:NUM_RANDOM_ACCESS_FRAMES].tolist()
+    access_patterns = {"sequential": list(range(num_frames)), "random": random_frame_nums}
+
+    results = []
+    for reader_name, reader_factory in reader_factories.items():
+        for access_pattern, frame_nums in access_patterns.items():
+            frame_reader = reader_factory()
+            frame_reader.get_frame(frame_nums[0])  # opening the source (and building its index) is not timed
+            durations = []
+            for frame_num in frame_nums[1:]:
+                start_time = time.perf_counter()
+                frame_reader.get_frame(frame_num)
+                durations.append(time.perf_counter() - start_time)
+            frame_reader.teardown()
+            results.append(
+                get_timing_result(
+                    f"reader/{reader_name}/{access_pattern}/{resolution}",
+                    group="reader",
+                    durations_s=durations,
+                    resolution=resolution,
+                )
+            )
+            print_result(results[-1])
+    return results
+
+
+def get_callback_factories(detections_csv_path: Path) -> Dict[str, Callable[[], BaseFrameEditCallback]]:
+    return {
+        "OpticalFlowPlotter": lambda: OpticalFlowPlotter(enable_by_default=True),
+        "BackgroundSub": lambda: BackgroundSub(enable_by_default=True),
+        "HistogramEqualizer": lambda: HistogramEqualizer(enable_by_default=True),
+        "FrameNormalizer": lambda: FrameNormalizer(),
+        "DetectionsCsvPlotter": lambda: DetectionsCsvPlotter(detections_csv_path),
+        "FitFrameToScreen": lambda: FitFrameToScreen(),
+        "FrameInfoOverlay": lambda: FrameInfoOverlay(),
+        "KeyMapOverlay": lambda: KeyMapOverlay(),
+        "LatencyStatsOverlay": lambda: LatencyStatsOverlay(enable_by_default=True),
+    }
+
+
+def run_callback(
+    callback: BaseFrameEditCallback, video_player: VideoPlayer, frames: np.ndarray, frame_num: int
+) -> np.ndarray:
+    """
+    Analyzes (see concurrent_analysis) and edits a copy of the frame, like the player does with a single callback
+    """
+    analysis_kwargs = {}
+    if callback.concurrent_analysis:
+        analysis_kwargs["analysis_result"] = callback.analyze_frame(
+            video_player=video_player, original_frame=frames[frame_num], frame_num=frame_num
+        )
+    return callback.edit_frame(
+        video_player=video_player,
+        frame=frames[frame_num].copy(),
+        frame_num=frame_num,
+        original_frame=frames[frame_num],
+        **analysis_kwargs,
+    )
+
+
+def benchmark_callbacks(resolutions: List[str], num_frames: int, tmp_dir: Path, seed: int) -> List[Dict]:
+    results = []
+    for resolution in resolutions:
+        size = RESOLUTIONS[resolution]
+        frames = SyntheticFrames(*size, seed=seed).get_frames(num_frames)
+        detections_csv_path = create_detections_csv(tmp_dir / f"detections_{resolution}.csv", num_frames, size, seed)
+        for callback_name, callback_factory in get_callback_factories(detections_csv_path).items():
+            callback = callback_factory()
+            video_player = create_headless_player(ArrayFrameReader(frames), frame_edit_callbacks=[callback])
+            # the first frame is edited without timing it, to warm up lazily initialized state (e.g. cached text
+            # layers). Some callbacks (e.g. optical flow) do nothing on it anyway, as they need a previous frame
+            run_callback(callback, video_player, frames, frame_num=0)
+            durations = []
+            for frame_num in range(1, num_frames):
+                start_time = time.perf_counter()
+                run_callback(callback, video_player, frames, frame_num)
+                durations.append(time.perf_counter() - start_time)
+            video_player.__exit__()
+            results.append(
+                get_timing_result(
+                    f"callback/{callback_name}/{resolution}",
+                    group="callback",
+                    durations_s=durations,
+                    resolution=resolution,
+                )
+            )
+            print_result(results[-1])
+    return results
+
+
+def benchmark_player_loop(video_path: Path, resolution: str, detections_csv_path: Path) -> List[Dict]:
+    callback_sets: Dict[str, Callable[[], List[BaseFrameEditCallback]]] = {
+        "overlays": lambda: [FitFrameToScreen(), FrameInfoOverlay()],
+        "heavy": lambda: [
+            BackgroundSub(enable_by_default=True),
+            FitFrameToScreen(),
+            DetectionsCsvPlotter(detections_csv_path),
+            HistogramEqualizer(enable_by_default=True),
+            FrameInfoOverlay(),
+        ],
+        # the analysis of these callbacks runs concurrently
+        "analyzers": lambda: [
+            BackgroundSub(enable_by_default=True),
+            OpticalFlowPlotter(enable_by_default=True),
+            FitFrameToScreen(),
+            FrameInfoOverlay(),
+        ],
+    }
+    results = []
+    for callback_set_name, callbacks_factory in callback_sets.items():
+        for pipelined_playback in (False, True):
+            video_player = create_headless_player(
+                str(video_path), callbacks_factory(), timeline=["space"], pipelined_playback=pipelined_playback
+            )
+            video_player._open_player()
+            video_player._input_parser.start()
+            show_times = video_player._display_manager.show_times
+            show_times[:] = [time.perf_counter()]  # the time the video starts playing
+            video_player._run_player_loop()
+            video_player.__exit__()
+
+            playback_name = "pipelined" if pipelined_playback else "serial"
+            results.append(
+                get_timing_result(
+                    f"player/{callback_set_name}/{playback_name}/{resolution}",
+                    group="player",
+                    durations_s=np.diff(show_times).tolist(),
+                    resolution=resolution,
+                )
+            )
+            print_result(results[-1])
+    return results
+
+
+def print_result(result: Dict) -> None:
+    print(
+        f"{result['name']:<75} median {result['median_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms"
+        f"  {result['fps']:8.1f} fps"
+    )
+
+
+def get_metadata(args: argparse.Namespace) -> Dict:
+    try:
+        git_commit = subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (subprocess.CalledProcessError, OSError):
+        git_commit = None
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": git_commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "opencv_threads": cv2.getNumThreads(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "args": vars(args),
+    }
+
+
+def compare_results(results: List[Dict], baseline_path: Path, tolerance: float) -> bool:
+    """
+    Prints the ratio of the median time of every benchmark to its baseline, returns False if any of them regressed
+    """
+    with open(baseline_path) as f:
+        baseline_results = {result["name"]: result for result in json.load(f)["results"]}
+
+    print(f"\nCompared to {baseline_path} (regression above {1 + tolerance:.2f}x the baseline):")
+    regressions = []
+    for result in results:
+        baseline_result = baseline_results.get(result["name"])
+        if baseline_result is None:
+            continue
+        ratio = result["median_ms"] / baseline_result["median_ms"]
+        is_regression = ratio > 1 + tolerance
+        if is_regression:
+            regressions.append(result["name"])
+        print(
+            f"{result['name']:<75} {baseline_result['median_ms']:8.2f}ms -> {result['median_ms']:8.2f}ms"
+            f"  {ratio:5.2f}x{'  REGRESSION' if is_regression else ''}"
+        )
+    print(f"{len(regressions)} regressions")
+    return len(regressions) == 0
+
+
+def run(args: argparse.Namespace) -> List[Dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        # the indexes built by the readers do not depend on previous runs
+        os.environ["CVVIDEOPLAYER_CACHE_DIR"] = str(tmp_dir / "cache")
+
+        size = RESOLUTIONS[args.source_resolution]
+        frames = SyntheticFrames(*size, seed=args.seed)
+        video_path = create_video(tmp_dir / "video.mp4", frames, args.num_frames, size)
+
+        if "readers" in args.groups:
+            frame_dir = create_frame_dir(tmp_dir / "frames", frames, args.num_frames)
+            sources = {
+                "video": video_path,
+                "frame_dir": frame_dir,
+                "archive": create_archive(tmp_dir / "frames.zip", frame_dir),
+                "npy": create_npy(tmp_dir / "frames.npy", frames, args.num_frames, size),
+            }
+            results += benchmark_readers(sources, args.num_frames, args.source_resolution, args.seed)
+
+        if "callbacks" in args.groups:
+            results += benchmark_callbacks(args.resolutions, args.num_callback_frames, tmp_dir, args.seed)
+
+        if "player" in args.groups:
+            detections_csv_path = create_detections_csv(
+                tmp_dir / "player_detections.csv", args.num_frames, size, args.seed
+            )
+            results += benchmark_player_loop(video_path, args.source_resolution, detections_csv_path)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"), help="Where to save the results")
+    parser.add_argument("--compare", type=Path, default=None, help="Results of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="The allowed relative slowdown when comparing")
+    parser.add_argument(
+        "--groups", nargs="+", choices=["readers", "callbacks", "player"], default=["readers", "callbacks", "player"]
+    )
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS), default=list(RESOLUTIONS))
+    parser.add_argument(
+        "--source-resolution", choices=list(RESOLUTIONS), default="1080p", help="Of the readers and the player loop"
+    )
+    parser.add_argument("--num-frames", type=int, default=60, help="The frames of the readers and the player loop")
+    parser.add_argument("--num-callback-frames", type=int, default=6, help="The frames every callback edits")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    args.output.parent.mkdir(exist_ok=True, parents=True)
+    with open(args.output, "w") as f:
+        json.dump({"metadata": get_metadata(args), "results": results}, f, indent=2, default=str)
+    print(f"Saved the results to {args.output}")
+
+    if args.compare is not None and not compare_results(results, args.compare, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
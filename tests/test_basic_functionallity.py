@@ -6,9 +6,21 @@ change_cwd_to_tests_dir()
 add_project_root_to_path()
 
 from cvvideoplayer import TestingFrameReader, create_video_player
+from cvvideoplayer.display_managers.null_display_manager import NullDisplayManager
+from cvvideoplayer.frame_editors import FitFrameToScreen, FrameInfoOverlay, HistogramEqualizer, KeyMapOverlay
+from cvvideoplayer.input_management.scripted_input_parser import ScriptedInputParser
 from cvvideoplayer.utils.ui_utils import SingleInput, InputType
 
 
+def create_headless_player(frame_reader, **kwargs):
+    return create_video_player(
+        video_source=frame_reader,
+        display_manager=NullDisplayManager(screen_size=(640, 480)),
+        input_parser=ScriptedInputParser([]),
+        **kwargs,
+    )
+
+
 def test_video_navigation():
     frame_reader = TestingFrameReader(video_len=70)
     video_player = create_video_player(video_source=frame_reader, start_from_frame=5)
@@ -31,3 +43,41 @@ def test_video_navigation():
     assert np.all(video_player._get_current_frame() == frame_reader.get_frame(0))
     video_player.input_handler.handle_input(SingleInput(InputType.KeyPress, "esc"))
     video_player.__exit__()
+
+
+def test_zoom_and_pan():
+    frame_reader = TestingFrameReader(video_len=10)
+    video_player = create_headless_player(frame_reader)
+    video_player.input_handler.handle_input(SingleInput(InputType.KeyPress, "ctrl+up"))
+    video_player.input_handler.handle_input(SingleInput(InputType.KeyPress, "alt+left"))
+    assert video_player._zoom_factor > 1
+    assert video_player._zoom_viewport_xy[0] < video_player._zoom_viewport_xy[1]
+    video_player.input_handler.handle_input(SingleInput(InputType.KeyPress, "ctrl+down"))
+    assert video_player._zoom_factor == 1 and video_player._zoom_viewport_xy == (0, 0)
+    video_player.__exit__()
+
+
+def test_render_memoization():
+    frame_reader = TestingFrameReader(video_len=10)
+    video_player = create_headless_player(frame_reader)
+    original_frame = video_player._get_current_frame()
+    first_render = video_player._create_frames(original_frame, frame_num=0, memoize=True)[0]
+    memoized_render = video_player._create_frames(original_frame, frame_num=0, memoize=True)[0]
+    assert not memoized_render.flags.writeable and np.all(memoized_render == first_render)
+    video_player.input_handler.handle_input(SingleInput(InputType.KeyPress, "ctrl+k"))
+    key_map_overlay = next(cb for cb in video_player._frame_edit_callbacks if isinstance(cb, KeyMapOverlay))
+    assert key_map_overlay.state_version == 1
+    assert np.any(video_player._create_frames(original_frame, frame_num=0, memoize=True)[0] != first_render)
+    video_player.__exit__()
+
+
+def test_display_resize_runs_first():
+    frame_reader = TestingFrameReader(video_len=10)
+    frame_edit_callbacks = [HistogramEqualizer(), FitFrameToScreen(), FrameInfoOverlay()]
+    video_player = create_headless_player(frame_reader, frame_edit_callbacks=frame_edit_callbacks)
+    ordered_callbacks = video_player._move_display_resize_forward(frame_edit_callbacks)
+    assert [type(callback) for callback in ordered_callbacks] == [FitFrameToScreen, HistogramEqualizer, FrameInfoOverlay]
+    frame_to_display, _ = video_player._create_frames(video_player._get_current_frame(), frame_num=0)
+    assert video_player.frame_transform.map_point(0, 0) == (0, 0)
+    assert video_player.frame_transform.scale_x == frame_to_display.shape[1] / frame_reader.get_frame(0).shape[1]
+    video_player.__exit__()
@@ -0,0 +1,91 @@
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+import threading
+import time
+
+import numpy as np
+
+from cvvideoplayer import SynchronizedFrameReader, TestingFrameReader, create_video_player
+from cvvideoplayer.display_managers.null_display_manager import NullDisplayManager
+from cvvideoplayer.frame_editors import BaseFrameEditCallback, BackgroundSub, OpticalFlowPlotter
+from cvvideoplayer.input_management.scripted_input_parser import ScriptedInputParser
+
+ANALYSIS_TIME = 0.2
+
+
+class SlowAnalyzer(BaseFrameEditCallback):
+    concurrent_analysis = True
+
+    def __init__(self, value: int):
+        super().__init__(enable_by_default=True)
+        self._value = value
+        self.analysis_threads = []
+
+    def analyze_frame(self, video_player, original_frame, frame_num):
+        self.analysis_threads.append(threading.current_thread().name)
+        time.sleep(ANALYSIS_TIME)  # releases the GIL like OpenCV does
+        return frame_num * 10 + self._value
+
+    def edit_frame(self, video_player, frame, frame_num, original_frame, analysis_result=None):
+        frame[0, self._value] = analysis_result
+        return frame
+
+
+class Drawer(BaseFrameEditCallback):
+    def __init__(self):
+        super().__init__(enable_by_default=True)
+
+    def edit_frame(self, video_player, frame, frame_num, original_frame):
+        frame[0, 0] = 255
+        return frame
+
+
+def create_headless_player(frame_edit_callbacks):
+    return create_video_player(
+        video_source=TestingFrameReader(video_len=20),
+        frame_edit_callbacks=frame_edit_callbacks,
+        display_manager=NullDisplayManager(screen_size=(640, 480)),
+        input_parser=ScriptedInputParser([]),
+    )
+
+
+def test_concurrent_analysis():
+    analyzers = [SlowAnalyzer(value) for value in (1, 2, 3)]
+    video_player = create_headless_player([analyzers[0], Drawer(), analyzers[1], analyzers[2]])
+
+    start_time = time.perf_counter()
+    frame, _ = video_player._create_frames(video_player.frame_reader.get_frame(5), frame_num=5)
+    # the analyses overlap, so they take about as long as one of them
+    assert time.perf_counter() - start_time < 2 * ANALYSIS_TIME
+    assert frame[0, 0, 0] == 255
+    assert [frame[0, value, 0] for value in (1, 2, 3)] == [51, 52, 53]
+    assert all(analyzer.analysis_threads[-1].startswith("analysis") for analyzer in analyzers)
+    assert "SlowAnalyzer analysis" in video_player.latency_tracker.get_stage_latencies()
+    video_player.__exit__()
+
+
+def test_analyzing_callbacks_match_sequential_edit():
+    frame_reader = TestingFrameReader(video_len=5)
+    video_player = create_headless_player([BackgroundSub(enable_by_default=True), OpticalFlowPlotter(True)])
+    frames = [video_player._create_frames(frame_reader.get_frame(frame_num), frame_num)[0] for frame_num in range(5)]
+    video_player.__exit__()
+
+    # the frame reader is shared by the analyzing threads
+    assert isinstance(video_player.frame_reader, SynchronizedFrameReader)
+
+    for analyze_first in (True, False):
+        background_sub, optical_flow_plotter = BackgroundSub(enable_by_default=True), OpticalFlowPlotter(True)
+        background_sub.setup(video_player, frame_reader.get_frame(0))
+        for frame_num in range(5):
+            original_frame = frame_reader.get_frame(frame_num)
+            frame = original_frame.copy()
+            for callback in (background_sub, optical_flow_plotter):
+                # edit_frame analyzes the frame itself when it is called directly
+                analysis_result = None
+                if analyze_first:
+                    analysis_result = callback.analyze_frame(video_player, original_frame, frame_num)
+                frame = callback.edit_frame(video_player, frame, original_frame, frame_num, analysis_result)
+            assert np.array_equal(frame, frames[frame_num])
@@ -0,0 +1,31 @@
+import numpy as np
+
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+from cvvideoplayer.utils.drawing_utils import CachedTextLayer, Text, write_text_on_img
+
+
+def test_cached_text_layer():
+    texts = [Text("Available keyboard shortcuts:", col=10, row=90, font_scale=1.2, color=(255, 255, 125))] + [
+        Text(f"key {i}: description {i}", col=10 + 150 * (i % 2), row=120 + 20 * i, font_scale=1, thickness=1)
+        for i in range(20)
+    ]
+    frame = np.random.randint(0, 100, size=(480, 640, 3), dtype=np.uint8)
+    expected_frame = frame.copy()
+    for text in texts:
+        write_text_on_img(expected_frame, **text._asdict())
+
+    text_layer = CachedTextLayer()
+    for _ in range(2):
+        frame_with_text = frame.copy()
+        text_layer.draw(frame_with_text, texts)
+        # the blending of the cached layer may round differently than drawing the text
+        assert np.abs(frame_with_text.astype(int) - expected_frame).max() <= 1
+
+    # texts can also be drawn over frames that cv2.putText does not support
+    gray_frame = np.zeros((480, 640), dtype=np.uint16)
+    text_layer.draw(gray_frame, texts)
+    assert gray_frame.max() == 255
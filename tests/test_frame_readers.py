@@ -0,0 +1,355 @@
+import shutil
+import tarfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+from cvvideoplayer import (
+    TestingFrameReader,
+    PrefetchingFrameReader,
+    CachedFrameReader,
+    LocalVideoFileReader,
+    LocalDirReader,
+    MemmapFrameReader,
+    ArrayFrameReader,
+    ProxyFrameReader,
+    LiveStreamReader,
+    DropPolicy,
+    ArchiveFrameReader,
+)
+from cvvideoplayer.utils.frame_cache_utils import build_frame_cache, find_frame_cache, get_frame_cache_path
+from cvvideoplayer.utils.video_player_utils import get_frame_reader
+
+EXAMPLE_VIDEO_PATH = Path("../assets/example_video.mp4")
+
+
+def test_prefetching_frame_reader():
+    frame_reader = TestingFrameReader(video_len=40)
+    prefetching_reader = PrefetchingFrameReader(frame_reader, buffer_size=8)
+    try:
+        assert np.all(prefetching_reader.get_frame(0) == frame_reader.get_frame(0))
+        time.sleep(0.1)
+        for frame_num in range(1, 8):
+            assert np.all(prefetching_reader.get_frame(frame_num) == frame_reader.get_frame(frame_num))
+        assert prefetching_reader.stats.misses == 1
+        assert prefetching_reader.stats.hits == 7
+
+        assert np.all(prefetching_reader.get_frame(30) == frame_reader.get_frame(30))
+        assert np.all(prefetching_reader.get_frame(29) == frame_reader.get_frame(29))
+        assert prefetching_reader.stats.misses == 3
+        assert prefetching_reader.get_frame(40) is None
+    finally:
+        prefetching_reader.teardown()
+
+
+def test_cached_frame_reader():
+    frame_reader = TestingFrameReader(video_len=20)
+    frame_bytes = frame_reader.get_frame(0).nbytes
+    cached_reader = CachedFrameReader(frame_reader, max_bytes=5 * frame_bytes)
+
+    for frame_num in [0, 1, 2, 1, 0, 2]:
+        assert np.all(cached_reader.get_frame(frame_num) == frame_reader.get_frame(frame_num))
+    assert cached_reader.stats.misses == 3
+    assert cached_reader.stats.hits == 3
+
+    for frame_num in range(3, 8):
+        cached_reader.get_frame(frame_num)
+    cached_reader.get_frame(0)
+    assert cached_reader.stats.misses == 9
+
+    frame = cached_reader.get_frame(0)
+    assert not frame.flags.writeable
+    cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+def test_video_seek_index(tmp_path):
+    video_path = tmp_path / EXAMPLE_VIDEO_PATH.name
+    shutil.copy(EXAMPLE_VIDEO_PATH, video_path)
+    frame_reader = LocalVideoFileReader(video_path)
+    expected_frames = [frame_reader.get_frame(frame_num) for frame_num in range(len(frame_reader))]
+
+    indexed_reader = LocalVideoFileReader(video_path, use_seek_index=True)
+    assert (tmp_path / f"{video_path.name}.cvvp_index.npz").is_file()
+    assert len(indexed_reader) == len(expected_frames)
+    for frame_num in [100, 50, 49, 48, 200, 3, 0, len(expected_frames) - 1]:
+        assert np.all(indexed_reader.get_frame(frame_num) == expected_frames[frame_num])
+
+
+def test_video_reverse_reading():
+    frame_reader = LocalVideoFileReader(EXAMPLE_VIDEO_PATH)
+    expected_frames = [frame_reader.get_frame(frame_num) for frame_num in range(len(frame_reader))]
+
+    # backward frames are decoded in chunks only while the video player plays backwards
+    assert frame_reader._reverse_decoder is None
+    frame_reader.set_reverse_playback(True)
+    for frame_num in reversed(range(len(expected_frames))):
+        assert np.all(frame_reader.get_frame(frame_num) == expected_frames[frame_num])
+    frame_reader.set_reverse_playback(False)
+    assert frame_reader._reverse_decoder is None
+    for frame_num in [20, 21, 22, 21, 20, 19, 18]:
+        assert np.all(frame_reader.get_frame(frame_num) == expected_frames[frame_num])
+    frame_reader.teardown()
+
+
+def test_local_dir_reader(tmp_path, monkeypatch):
+    monkeypatch.setenv("CVVIDEOPLAYER_CACHE_DIR", str(tmp_path / "cache"))
+    frames = TestingFrameReader(video_len=30)
+    for frame_num in range(len(frames)):
+        cv2.imwrite(str(tmp_path / f"frame_{frame_num}.png"), frames.get_frame(frame_num))
+
+    frame_reader = LocalDirReader(tmp_path, num_decode_threads=4, decode_ahead=8)
+    assert len(frame_reader) == len(frames)
+    for frame_num in list(range(len(frames))) + [15, 14, 13, 3, 29]:
+        assert np.all(frame_reader.get_frame(frame_num) == frames.get_frame(frame_num))
+    frame_reader.teardown()
+
+
+def test_local_dir_reader_manifest(tmp_path, monkeypatch):
+    monkeypatch.setenv("CVVIDEOPLAYER_CACHE_DIR", str(tmp_path / "cache"))
+    frame_dir = tmp_path / "frames"
+    frame_dir.mkdir()
+    frames = TestingFrameReader(video_len=20)
+    for frame_num in range(10):
+        cv2.imwrite(str(frame_dir / f"{frame_num}_frame.png"), frames.get_frame(frame_num))
+
+    assert len(LocalDirReader(frame_dir, decode_ahead=0)) == 10
+    assert len(list((tmp_path / "cache").rglob("*.json"))) == 1
+
+    for frame_num in range(10, 20):
+        cv2.imwrite(str(frame_dir / f"{frame_num}_frame.png"), frames.get_frame(frame_num))
+    frame_reader = LocalDirReader(frame_dir, decode_ahead=0)
+    for _ in range(100):
+        if len(frame_reader) == 20:
+            break
+        time.sleep(0.02)
+    assert len(frame_reader) == 20
+    assert np.all(frame_reader.get_frame(19) == frames.get_frame(19))
+
+
+def test_local_dir_reader_outdated_manifest(tmp_path, monkeypatch):
+    monkeypatch.setenv("CVVIDEOPLAYER_CACHE_DIR", str(tmp_path / "cache"))
+    frames = TestingFrameReader(video_len=7)
+    for frame_num in (0, 2, 4, 6):
+        cv2.imwrite(str(tmp_path / f"f_{frame_num}.png"), frames.get_frame(frame_num))
+    LocalDirReader(tmp_path).teardown()
+
+    # the listing saved by the first open is outdated, frames are decoded ahead from it until it is refreshed
+    cv2.imwrite(str(tmp_path / "f_1.png"), frames.get_frame(1))
+    (tmp_path / "f_4.png").unlink()
+    frame_reader = LocalDirReader(tmp_path, decode_ahead=3)
+    assert np.all(frame_reader.get_frame(0) == frames.get_frame(0))
+    frame_reader._frame_list_refresh.join()
+    assert len(frame_reader) == 4
+    for frame_num, file_frame_num in enumerate((0, 1, 2, 6)):
+        assert np.all(frame_reader.get_frame(frame_num) == frames.get_frame(file_frame_num))
+    frame_reader.teardown()
+
+    # a file that was deleted since the listing was saved is skipped, also before the refresh ends
+    LocalDirReader(tmp_path).teardown()
+    (tmp_path / "f_2.png").unlink()
+    frame_reader = LocalDirReader(tmp_path, decode_ahead=0)
+    assert np.all(frame_reader.get_frame(2) == frames.get_frame(6))
+    frame_reader.teardown()
+
+
+def test_memmap_frame_cache(tmp_path):
+    video_path = tmp_path / EXAMPLE_VIDEO_PATH.name
+    shutil.copy(EXAMPLE_VIDEO_PATH, video_path)
+    frame_reader = LocalVideoFileReader(video_path, use_seek_index=True)
+    assert get_frame_reader(video_path) is not None and find_frame_cache(video_path) is None
+
+    cache_path = build_frame_cache(frame_reader, get_frame_cache_path(video_path))
+    assert find_frame_cache(video_path) == cache_path
+    memmap_reader = get_frame_reader(str(video_path))
+    assert isinstance(memmap_reader, MemmapFrameReader)
+    assert len(memmap_reader) == len(frame_reader)
+    for frame_num in [0, 100, 99, len(frame_reader) - 1]:
+        assert np.all(memmap_reader.get_frame(frame_num) == frame_reader.get_frame(frame_num))
+    assert memmap_reader.get_frame(len(frame_reader)) is None
+
+
+def test_proxy_frame_reader(tmp_path, monkeypatch):
+    monkeypatch.setenv("CVVIDEOPLAYER_CACHE_DIR", str(tmp_path / "cache"))
+    frame_reader = LocalVideoFileReader(EXAMPLE_VIDEO_PATH)
+    proxy_size = (frame_reader.get_frame(0).shape[1] // 4, frame_reader.get_frame(0).shape[0] // 4)
+
+    proxy_reader = ProxyFrameReader(EXAMPLE_VIDEO_PATH, frame_size=proxy_size)
+    while not proxy_reader.is_complete:
+        time.sleep(0.05)
+    assert len(proxy_reader) == len(frame_reader)
+    for frame_num in [0, 50, len(frame_reader) - 1]:
+        expected_frame = cv2.resize(frame_reader.get_frame(frame_num), proxy_size, interpolation=cv2.INTER_AREA)
+        assert np.abs(proxy_reader.get_frame(frame_num).astype(int) - expected_frame).mean() < 3
+    proxy_reader.teardown()
+
+    reopened_proxy_reader = ProxyFrameReader(EXAMPLE_VIDEO_PATH, frame_size=proxy_size)
+    assert reopened_proxy_reader.is_complete and len(reopened_proxy_reader) == len(frame_reader)
+    reopened_proxy_reader.teardown()
+
+
+class _ChunkedArray:
+    """
+    Mimics the interface of chunked arrays like h5py datasets and counts the reads
+    """
+
+    def __init__(self, array, chunks):
+        self._array = array
+        self.shape = array.shape
+        self.chunks = chunks
+        self.num_reads = 0
+
+    def __getitem__(self, index):
+        self.num_reads += 1
+        return self._array[index]
+
+
+def test_array_frame_reader(tmp_path):
+    frames = np.random.rand(12, 8, 6, 3).astype(np.float32)
+    np.save(str(tmp_path / "frames.npy"), frames.transpose(1, 2, 3, 0))
+    frame_reader = ArrayFrameReader(tmp_path / "frames.npy", axis_order="HWCN")
+    assert len(frame_reader) == len(frames)
+    assert frame_reader.get_frame(5).dtype == np.float32
+    assert np.all(frame_reader.get_frame(5) == frames[5])
+    assert frame_reader.get_frame(12) is None
+
+    channel_first_frames = np.random.randint(0, 2**16, size=(4, 8, 10, 12), dtype=np.uint16)  # stored as CNHW
+    chunked_array = _ChunkedArray(channel_first_frames, chunks=(3, 4, 5, 6))
+    frame_reader = ArrayFrameReader(chunked_array, axis_order="CNHW")
+    assert len(frame_reader) == 8
+    for frame_num in [0, 1, 2, 3, 7, 6, 1]:
+        assert np.all(frame_reader.get_frame(frame_num) == channel_first_frames[:, frame_num].transpose(1, 2, 0))
+    assert chunked_array.num_reads == 2
+
+
+def test_live_stream_reader():
+    frame_reader = LocalVideoFileReader(EXAMPLE_VIDEO_PATH)
+    frame_bytes = frame_reader.get_frame(0).nbytes
+
+    live_reader = LiveStreamReader(str(EXAMPLE_VIDEO_PATH), buffer_max_bytes=10 * frame_bytes)
+    assert live_reader.is_live and len(live_reader) >= 1
+    live_reader._capture_thread.join()  # the stream ends at the end of the video
+    assert len(live_reader) == len(frame_reader) and live_reader.num_dropped_frames == 0
+    assert live_reader.oldest_buffered_frame == len(frame_reader) - 10
+    assert np.all(live_reader.get_frame(len(frame_reader) - 1) == frame_reader.get_frame(len(frame_reader) - 1))
+    assert np.all(live_reader.get_frame(len(frame_reader) - 10) == frame_reader.get_frame(len(frame_reader) - 10))
+    assert live_reader.get_frame(0) is None
+    assert live_reader.get_frame(len(frame_reader)) is None
+    live_reader.teardown()
+
+    live_reader = LiveStreamReader(
+        str(EXAMPLE_VIDEO_PATH), buffer_max_bytes=10 * frame_bytes, drop_policy=DropPolicy.newest
+    )
+    live_reader._capture_thread.join()
+    assert len(live_reader) == 10 and live_reader.num_dropped_frames == len(frame_reader) - 10
+    assert np.all(live_reader.get_frame(0) == frame_reader.get_frame(0))
+    live_reader.teardown()
+
+
+class BlockingCapture:
+    """
+    A stream whose reads block until it is unblocked, after its first frame
+    """
+
+    def __init__(self):
+        self.unblock = threading.Event()
+        self.num_reads = 0
+        self.is_released = False
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        self.num_reads += 1
+        if self.num_reads > 1:
+            self.unblock.wait()
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def release(self):
+        self.is_released = True
+
+
+def test_live_stream_reader_teardown_while_reading(monkeypatch):
+    monkeypatch.setattr(cv2, "VideoCapture", BlockingCapture)  # accepted as an opened capture
+    capture = BlockingCapture()
+    live_reader = LiveStreamReader(capture)
+    live_reader.teardown()
+    assert live_reader._capture_thread.is_alive() and not capture.is_released
+
+    # the capture thread releases the capture once its read returns
+    capture.unblock.set()
+    live_reader._capture_thread.join()
+    assert capture.is_released
+
+
+def test_get_frames(tmp_path, monkeypatch):
+    monkeypatch.setenv("CVVIDEOPLAYER_CACHE_DIR", str(tmp_path / "cache"))
+    video_reader = LocalVideoFileReader(EXAMPLE_VIDEO_PATH)
+    expected_frames = np.stack([video_reader.get_frame(frame_num) for frame_num in range(60)])
+    frames = TestingFrameReader(video_len=20)
+    for frame_num in range(len(frames)):
+        cv2.imwrite(str(tmp_path / f"{frame_num}.png"), frames.get_frame(frame_num))
+
+    frame_readers_and_expected_frames = [
+        (LocalVideoFileReader(EXAMPLE_VIDEO_PATH), expected_frames),
+        (CachedFrameReader(LocalVideoFileReader(EXAMPLE_VIDEO_PATH)), expected_frames),
+        (ArrayFrameReader(expected_frames), expected_frames),
+        (LocalDirReader(tmp_path), frames.get_frames(range(len(frames)))),
+        (frames, frames.get_frames(range(len(frames)))),
+    ]
+    for frame_reader, expected in frame_readers_and_expected_frames:
+        for frame_nums in [[3], [10, 11, 12, 13], range(0, 20, 5), [15, 2, 7, 2]]:
+            batch = frame_reader.get_frames(frame_nums)
+            assert batch.shape == (len(frame_nums), *expected.shape[1:])
+            assert np.all(batch == expected[list(frame_nums)])
+        assert np.all(np.stack(list(frame_reader.iter_frames(1, 18, step=2, batch_size=3))) == expected[1:18:2])
+        frame_reader.teardown()
+
+
+def test_local_dir_reader_reduced_decoding(tmp_path, monkeypatch):
+    monkeypatch.setenv("CVVIDEOPLAYER_CACHE_DIR", str(tmp_path / "cache"))
+    frame = cv2.resize(TestingFrameReader(video_len=1).get_frame(0), (400, 300), interpolation=cv2.INTER_NEAREST)
+    (tmp_path / "jpg").mkdir()
+    (tmp_path / "png").mkdir()
+    for frame_num in range(3):
+        cv2.imwrite(str(tmp_path / "jpg" / f"{frame_num}.jpg"), frame)
+        cv2.imwrite(str(tmp_path / "png" / f"{frame_num}.png"), frame)
+
+    frame_reader = LocalDirReader(tmp_path / "jpg", target_size=(100, 60))
+    assert frame_reader.decode_scale == 4
+    assert frame_reader.get_frame(1).shape == (75, 100, 3)
+    assert LocalDirReader(tmp_path / "jpg", target_size=(300, 200)).decode_scale == 1
+    assert LocalDirReader(tmp_path / "png", target_size=(100, 60)).get_frame(1).shape == frame.shape
+
+
+def test_archive_frame_reader(tmp_path, monkeypatch):
+    monkeypatch.setenv("CVVIDEOPLAYER_CACHE_DIR", str(tmp_path / "cache"))
+    frames = TestingFrameReader(video_len=12)
+    zip_archive = zipfile.ZipFile(tmp_path / "frames.zip", "w")
+    tar_archive = tarfile.open(tmp_path / "frames.tar", "w")
+    with zip_archive, tar_archive:
+        for frame_num in reversed(range(len(frames))):
+            frame_path = tmp_path / f"frame_{frame_num}.png"
+            cv2.imwrite(str(frame_path), frames.get_frame(frame_num))
+            compress_type = zipfile.ZIP_DEFLATED if frame_num % 2 else zipfile.ZIP_STORED
+            zip_archive.write(frame_path, f"frames/{frame_path.name}", compress_type=compress_type)
+            tar_archive.add(frame_path, f"frames/{frame_path.name}")
+        zip_archive.writestr("frames/labels.txt", "not a frame")
+
+    for archive_name in ["frames.zip", "frames.tar"]:
+        for _ in range(2):  # the second time the index is loaded from the cache
+            frame_reader = ArchiveFrameReader(tmp_path / archive_name, decode_ahead=4)
+            assert len(frame_reader) == len(frames)
+            for frame_num in [0, 1, 2, 3, 11, 10, 5]:
+                assert np.all(frame_reader.get_frame(frame_num) == frames.get_frame(frame_num))
+            assert np.all(frame_reader.get_frames([9, 3, 4]) == frames.get_frames([9, 3, 4]))
+            frame_reader.teardown()
+    assert len(list((tmp_path / "cache").rglob("*.json"))) == 2
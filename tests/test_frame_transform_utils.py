@@ -0,0 +1,24 @@
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+from cvvideoplayer import Bbox
+from cvvideoplayer.utils.frame_transform_utils import FrameTransform
+
+
+def test_frame_transform():
+    # the whole 4K source fitted to a 1920x1080 frame
+    frame_transform = FrameTransform.from_viewport(source_size=(3840, 2160), frame_size=(1920, 1080))
+    assert frame_transform.map_point(1000, 500) == (500, 250)
+    assert frame_transform.map_bbox(Bbox(1000, 500, 800, 400, above_label="car")) == Bbox(
+        500, 250, 400, 200, above_label="car"
+    )
+
+    # the zoomed viewport of the top left quarter of the source
+    frame_transform = FrameTransform.from_viewport(
+        source_size=(3840, 2160), frame_size=(1920, 1080), viewport_xywh=(960, 540, 1920, 1080)
+    )
+    assert frame_transform.map_point(960, 540) == (0, 0)
+    assert frame_transform.map_point(1000, 600) == (40, 60)
+    assert frame_transform.unmap_point(40, 60) == (1000, 600)
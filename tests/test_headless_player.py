@@ -0,0 +1,207 @@
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from cvvideoplayer import TestingFrameReader, create_video_player
+from cvvideoplayer.display_managers.null_display_manager import NullDisplayManager
+from cvvideoplayer.frame_editors import BaseFrameEditCallback, FitFrameToScreen, FrameInfoOverlay
+from cvvideoplayer.input_management.scripted_input_parser import ScriptedInputParser
+
+
+def test_headless_playback():
+    display_manager = NullDisplayManager(screen_size=(320, 240), max_collected_frames=None)
+    video_player = create_video_player(
+        video_source=TestingFrameReader(video_len=30),
+        frame_edit_callbacks=[FitFrameToScreen(), FrameInfoOverlay()],
+        display_manager=display_manager,
+        input_parser=ScriptedInputParser(["ctrl+right", "space", "left"]),
+    )
+    video_player.run()
+
+    # the first frame, the frame 10 frames forward, frames 11 to 29 while playing and the frame before the last one
+    shown_frame_nums = [0, 10] + list(range(11, 30)) + [28]
+    assert display_manager.num_shown_frames >= len(shown_frame_nums)
+    assert video_player._current_frame_num == 28
+    assert display_manager.collected_frames[0].shape == (240, 240, 3)
+
+
+def test_timed_scripted_input():
+    video_player = create_video_player(
+        video_source=TestingFrameReader(video_len=100),
+        frame_edit_callbacks=[FitFrameToScreen()],
+        target_fps=100,
+        display_manager=NullDisplayManager(screen_size=(320, 240)),
+        input_parser=ScriptedInputParser([(0.0, "space"), (0.2, "space")]),
+    )
+    video_player.run()
+    # the video is paused after playing for 0.2 seconds at 100 frames per second
+    assert 10 < video_player._current_frame_num < 30
+    assert ScriptedInputParser([]) is not ScriptedInputParser([])
+
+
+class KeyframedFrameReader(TestingFrameReader):
+    def __init__(self, video_len, keyframe_nums):
+        super().__init__(video_len=video_len)
+        self._keyframe_nums = np.array(keyframe_nums)
+
+    def get_keyframe_nums(self):
+        return self._keyframe_nums
+
+
+def test_keyframe_only_fast_forward():
+    # a single keyframe (as in a short video) does not make fast forward jump to the end
+    video_player = create_video_player(
+        video_source=KeyframedFrameReader(video_len=100, keyframe_nums=[0]),
+        frame_edit_callbacks=[],
+        display_manager=NullDisplayManager(screen_size=(320, 240)),
+        input_parser=ScriptedInputParser([]),
+    )
+    video_player._playback_speed = 16
+    video_player._play = True
+    assert video_player._get_next_played_frame_num(0) == 16
+
+    # the played frames snap to the keyframes near them
+    video_player.frame_reader = KeyframedFrameReader(video_len=100, keyframe_nums=range(0, 100, 10))
+    assert video_player._get_next_played_frame_num(0) == 20
+    assert video_player._get_next_played_frame_num(20) == 40
+    video_player._play_direction = -1
+    assert video_player._get_next_played_frame_num(99) == 80
+    video_player.__exit__()
+
+
+class BufferedFrameReader(TestingFrameReader):
+    """
+    Keeps only the frames from oldest_buffered_frame onwards, like the ring buffer of a live stream
+    """
+
+    def __init__(self, video_len, oldest_buffered_frame):
+        super().__init__(video_len=video_len)
+        self._oldest_buffered_frame = oldest_buffered_frame
+
+    @property
+    def oldest_buffered_frame(self):
+        return self._oldest_buffered_frame
+
+    def get_frame(self, frame_num):
+        if frame_num < self._oldest_buffered_frame:
+            return None
+        return super().get_frame(frame_num)
+
+
+@pytest.mark.parametrize("pipelined_playback", [False, True])
+def test_dropped_frames_are_not_played(pipelined_playback):
+    frame_reader = BufferedFrameReader(video_len=30, oldest_buffered_frame=10)
+    video_player = create_video_player(
+        video_source=frame_reader,
+        start_from_frame=15,
+        frame_edit_callbacks=[FrameInfoOverlay()],
+        pipelined_playback=pipelined_playback,
+        display_manager=NullDisplayManager(screen_size=(320, 240)),
+        input_parser=ScriptedInputParser(["ctrl+left", "right", "right", "shift+space"]),
+    )
+    video_player.run()
+    # stepping back stops at the oldest buffered frame, and so does playing backwards
+    assert video_player._current_frame_num == 10
+
+    frame_reader._oldest_buffered_frame = 20
+    video_player._play_direction = -1
+    assert video_player._get_next_played_frame_num(15) is None
+    video_player._change_current_frame_num(change_by=1)
+    assert video_player._current_frame_num == 20
+
+
+class FailingDisplayManager(NullDisplayManager):
+    def show_frame(self, window_name, frame):
+        super().show_frame(window_name, frame)
+        time.sleep(0.02)  # the frames after the shown frame are edited ahead in the meantime
+        if self.num_shown_frames == 4:
+            raise RuntimeError("display failed")
+
+
+class FailingCallback(BaseFrameEditCallback):
+    def __init__(self):
+        super().__init__(enable_by_default=True)
+
+    def edit_frame(self, video_player, frame, frame_num, original_frame):
+        if frame_num == 6:
+            time.sleep(0.2)  # fails while the playback is stopped by the error of the display
+            raise ValueError("edit failed")
+        return frame
+
+
+def test_pipelined_playback_errors():
+    # the error of the player thread is not hidden by the error of the edit stage that it stopped
+    video_player = create_video_player(
+        video_source=TestingFrameReader(video_len=30),
+        frame_edit_callbacks=[FailingCallback()],
+        pipelined_playback=True,
+        display_manager=FailingDisplayManager(screen_size=(320, 240)),
+        input_parser=ScriptedInputParser(["space"]),
+    )
+    with pytest.raises(RuntimeError):
+        video_player.run()
+
+
+class MixedResolutionFrameReader(TestingFrameReader):
+    def get_frame(self, frame_num):
+        frame = super().get_frame(frame_num)
+        return frame if frame_num % 2 == 0 else cv2.resize(frame, (frame.shape[1] * 2, frame.shape[0] * 2))
+
+
+class TransformRecorder(BaseFrameEditCallback):
+    def __init__(self):
+        super().__init__(enable_by_default=True)
+        self.mapped_corners = {}
+
+    def edit_frame(self, video_player, frame, frame_num, original_frame):
+        source_corner = (original_frame.shape[1], original_frame.shape[0])
+        self.mapped_corners[frame_num] = (video_player.frame_transform.map_point(*source_corner), frame.shape[1::-1])
+        return frame
+
+
+def test_frame_transform_of_mixed_resolutions():
+    transform_recorder = TransformRecorder()
+    video_player = create_video_player(
+        video_source=MixedResolutionFrameReader(video_len=4),
+        frame_edit_callbacks=[transform_recorder],
+        display_manager=NullDisplayManager(screen_size=(320, 240)),
+        input_parser=ScriptedInputParser(["right", "right"]),
+    )
+    video_player.run()
+    # the corner of every frame in the source is mapped to the corner of the edited frame
+    assert len(transform_recorder.mapped_corners) == 3
+    for mapped_corner, frame_size in transform_recorder.mapped_corners.values():
+        assert mapped_corner == frame_size
+
+
+class EditCounter(BaseFrameEditCallback):
+    def __init__(self):
+        super().__init__(enable_by_default=True)
+        self.num_edits = 0
+
+    def edit_frame(self, video_player, frame, frame_num, original_frame):
+        self.num_edits += 1
+        return frame
+
+
+def test_memoization_is_opt_in():
+    edit_counter = EditCounter()
+    video_player = create_video_player(
+        video_source=TestingFrameReader(video_len=10),
+        frame_edit_callbacks=[FitFrameToScreen(), edit_counter],
+        display_manager=NullDisplayManager(screen_size=(320, 240)),
+        input_parser=ScriptedInputParser([]),
+    )
+    original_frame = video_player._get_current_frame()
+    for _ in range(3):
+        video_player._create_frames(original_frame, frame_num=0, memoize=True)
+    # the callback did not declare memoize_output, so it edits the paused frame on every render
+    assert edit_counter.num_edits == 3
+    video_player.__exit__()
@@ -0,0 +1,36 @@
+import json
+import threading
+import time
+
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+from cvvideoplayer.utils.latency_utils import LatencyTracker
+
+
+def test_latency_tracker(tmp_path):
+    latency_tracker = LatencyTracker(window_size=10, max_trace_spans=15)
+    for frame_num in range(20):
+        with latency_tracker.span("decode", frame_num):
+            pass
+    thread = threading.Thread(target=lambda: latency_tracker.add_span("edit", 0, 0.002), name="edit")
+    thread.start()
+    thread.join()
+    with latency_tracker.span("display"):
+        time.sleep(0.01)
+
+    stage_latencies = latency_tracker.get_stage_latencies()
+    assert list(stage_latencies) == ["decode", "edit", "display"]
+    assert stage_latencies["decode"].num_samples == 10
+    assert stage_latencies["edit"].p50_ms == stage_latencies["edit"].p99_ms == 2
+    assert 10 <= stage_latencies["display"].p50_ms < 50
+
+    trace_path = tmp_path / "trace.json"
+    latency_tracker.export_chrome_trace(trace_path)
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    assert len(spans) == 15 and spans[0]["args"] == {"frame_num": 7} and "args" not in spans[-1]
+    thread_names = {event["args"]["name"] for event in events if event["ph"] == "M"}
+    assert thread_names == {threading.current_thread().name, "edit"}
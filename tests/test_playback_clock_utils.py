@@ -0,0 +1,85 @@
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+import pytest
+
+from cvvideoplayer.utils.playback_clock_utils import PlaybackClock
+
+
+class FakeClock:
+    """
+    A clock that only advances when it is slept on, so the tests do not depend on the load of the machine
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def create_playback_clock(fake_clock: FakeClock) -> PlaybackClock:
+    return PlaybackClock(
+        get_timestamp_ms=lambda frame_num: frame_num * 10,  # 100 fps
+        time_func=fake_clock.time,
+        sleep_func=fake_clock.sleep,
+    )
+
+
+def test_playback_clock():
+    fake_clock = FakeClock()
+    playback_clock = create_playback_clock(fake_clock)
+    playback_clock.start(frame_num=50)
+    fake_clock.sleep(0.055)
+
+    # frames 51 to 55 are due, frame 55 is played and the frames before it are dropped
+    assert playback_clock.skip_late_frames(51, direction=1, end_frame_num=99) == 55
+    assert playback_clock.num_dropped_frames == 4
+    assert playback_clock.skip_late_frames(51, direction=1, end_frame_num=53) == 53
+
+    playback_clock.wait_until_due(60)
+    assert fake_clock.now == pytest.approx(0.1) and playback_clock.get_time_until_due(60) == pytest.approx(0)
+    playback_clock.frame_shown(60)
+    assert playback_clock.lateness_ms == pytest.approx(0)
+    fake_clock.sleep(0.02)
+    playback_clock.frame_shown(61)
+    assert round(playback_clock.lateness_ms) == 10 and round(playback_clock.max_lateness_ms) == 10
+
+    # playing backwards
+    playback_clock.start(frame_num=50)
+    assert playback_clock.get_time_until_due(40) == pytest.approx(0.1)
+    playback_clock.stop()
+    assert playback_clock.skip_late_frames(40, direction=-1, end_frame_num=0) == 40
+
+
+def test_playback_clock_speed():
+    fake_clock = FakeClock()
+    playback_clock = create_playback_clock(fake_clock)
+    playback_clock.set_speed(4, frame_num=0)
+    playback_clock.start(frame_num=0)
+    assert playback_clock.get_time_until_due(20) == pytest.approx(0.05)
+
+    playback_clock.set_speed(0.5, frame_num=0)
+    playback_clock.start(frame_num=0)
+    assert playback_clock.get_time_until_due(20) == pytest.approx(0.4)
+
+
+def test_playback_clock_speed_change_while_playing():
+    fake_clock = FakeClock()
+    playback_clock = create_playback_clock(fake_clock)
+    playback_clock.set_speed(16, frame_num=0)
+    playback_clock.start(frame_num=0)
+    fake_clock.sleep(0.5)
+    assert playback_clock.skip_late_frames(1, direction=1, end_frame_num=10000) == 800
+
+    # the frames after the shown frame are due at the new speed, from now
+    playback_clock.set_speed(1, frame_num=800)
+    assert playback_clock.get_time_until_due(801) == pytest.approx(0.01)
+    playback_clock.set_speed(16, frame_num=800)
+    assert playback_clock.skip_late_frames(801, direction=1, end_frame_num=10000) == 801
+    assert playback_clock.get_time_until_due(816) == pytest.approx(0.01)
@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+from cvvideoplayer import TestingFrameReader
+from cvvideoplayer.video_players.playback_pipeline import PlaybackPipeline
+
+
+def test_playback_pipeline():
+    frame_reader = TestingFrameReader(video_len=50)
+    edited_frame_nums, recorded_frame_nums = [], []
+
+    def edit_frame(frame_num, frame):
+        edited_frame_nums.append(frame_num)
+        return frame, frame, frame_num % 2 == 0
+
+    def record_frame(frame, frame_num):
+        time.sleep(0.001)
+        recorded_frame_nums.append(frame_num)
+
+    pipeline = PlaybackPipeline(
+        decode_func=frame_reader.get_frame, edit_func=edit_frame, record_func=record_frame, queue_size=2
+    )
+    next_frame_num_func = lambda frame_num: frame_num + 1 if frame_num < len(frame_reader) - 1 else None
+
+    # pausing after 10 frames drops the frames that were decoded and edited ahead
+    pipeline.start(current_frame_num=0, next_frame_num_func=next_frame_num_func)
+    for expected_frame_num in range(1, 11):
+        played_frame = pipeline.get_next_frame(timeout=5)
+        assert played_frame.frame_num == expected_frame_num
+        assert np.all(played_frame.frame_to_display == frame_reader.get_frame(expected_frame_num))
+        assert played_frame.is_proxy == (expected_frame_num % 2 == 0)
+        pipeline.record(played_frame)
+    pipeline.flush()
+    assert recorded_frame_nums == list(range(1, 11))
+    assert 10 < len(edited_frame_nums) < 50
+
+    # seeking and playing to the end
+    pipeline.start(current_frame_num=39, next_frame_num_func=next_frame_num_func)
+    played_frame_nums = []
+    while not pipeline.reached_end:
+        played_frame = pipeline.get_next_frame(timeout=5)
+        if played_frame is not None:
+            played_frame_nums.append(played_frame.frame_num)
+            pipeline.record(played_frame)
+    pipeline.flush()
+    assert played_frame_nums == list(range(40, 50))
+    assert recorded_frame_nums == list(range(1, 11)) + list(range(40, 50))
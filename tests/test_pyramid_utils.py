@@ -0,0 +1,25 @@
+import cv2
+import numpy as np
+
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+from cvvideoplayer.utils.pyramid_utils import TiledImagePyramid
+
+
+def test_tiled_image_pyramid():
+    frame = cv2.GaussianBlur(np.random.randint(0, 255, size=(1500, 2100, 3), dtype=np.uint8), (0, 0), 3)
+    pyramid = TiledImagePyramid(frame, tile_size=256)
+    assert pyramid.num_levels == 5
+
+    # at full resolution the render is an exact crop spanning several tiles
+    assert np.all(pyramid.render((200, 100, 600, 400), output_size=(600, 400)) == frame[100:500, 200:800])
+
+    for viewport_xywh in [(0, 0, 2100, 1500), (500, 300, 1000, 700)]:
+        x, y, w, h = viewport_xywh
+        expected = cv2.resize(frame[y : y + h, x : x + w], (300, 200), interpolation=cv2.INTER_AREA)
+        rendered = pyramid.render(viewport_xywh, output_size=(300, 200))
+        assert rendered.shape == expected.shape
+        assert np.abs(rendered.astype(int) - expected).mean() < 3
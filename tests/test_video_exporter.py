@@ -0,0 +1,99 @@
+from functools import partial
+
+import cv2
+import numpy as np
+
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+from cvvideoplayer import export_video, LocalVideoFileReader
+from cvvideoplayer.frame_editors import BaseFrameEditCallback, FrameInfoOverlay
+
+EXAMPLE_VIDEO_PATH = "../assets/example_video.mp4"
+
+
+class FrameCounter(BaseFrameEditCallback):
+    """
+    Writes the number of frames it has seen, which is right only if it saw all the frames of the video
+    """
+
+    memoize_output = False
+    warmup_frames = 1000
+
+    def __init__(self):
+        super().__init__(enable_by_default=True)
+        self._num_seen_frames = 0
+
+    def edit_frame(self, frame: np.ndarray, **kwargs) -> np.ndarray:
+        self._num_seen_frames += 1
+        frame[:32, :32] = min(255, self._num_seen_frames)
+        return frame
+
+
+def read_video(video_path) -> np.ndarray:
+    frame_reader = LocalVideoFileReader(video_path)
+    frames = np.stack([frame_reader.get_frame(frame_num) for frame_num in range(len(frame_reader))])
+    frame_reader.teardown()
+    return frames
+
+
+def test_export_video(tmp_path):
+    sequential_path = export_video(
+        EXAMPLE_VIDEO_PATH, tmp_path / "sequential.mp4", [FrameInfoOverlay()], start_frame=10, num_workers=1
+    )
+    parallel_path = export_video(
+        EXAMPLE_VIDEO_PATH, tmp_path / "parallel.mp4", [FrameInfoOverlay()], start_frame=10, num_workers=3
+    )
+    sequential_frames = read_video(sequential_path)
+    parallel_frames = read_video(parallel_path)
+    assert sequential_frames.shape == parallel_frames.shape == (226, 200, 320, 3)
+    # the segments are encoded separately (and encoded again when joined without ffmpeg), so the frames are only
+    # nearly identical
+    assert np.abs(sequential_frames.astype(int) - parallel_frames).mean() < 4
+    assert not list(tmp_path.glob("tmp*")), "the segments were not removed"
+
+
+def test_export_warmup(tmp_path):
+    counts = {}
+    for num_workers in (1, 2):
+        output_path = export_video(
+            partial(LocalVideoFileReader, EXAMPLE_VIDEO_PATH),
+            tmp_path / f"counted_{num_workers}.mp4",
+            [FrameCounter()],
+            end_frame=100,
+            num_workers=num_workers,
+            segment_size=40,
+            fps=10,
+        )
+        assert cv2.VideoCapture(str(output_path)).get(cv2.CAP_PROP_FPS) == 10
+        counts[num_workers] = read_video(output_path)[:, 16, 16, 0].astype(int)
+    # every segment warmed up from the first frame, so every frame shows its own count (up to the compression loss)
+    # instead of counting again from the start of its segment
+    assert len(counts[2]) == 100 and np.all(np.abs(counts[2] - counts[1]) <= 3)
+
+
+class EditedFrameNumsRecorder(BaseFrameEditCallback):
+    # a class attribute, so it is shared by the copies of the callback that render the segments in this process
+    edited_frame_nums = []
+
+    def __init__(self):
+        super().__init__(enable_by_default=True)
+
+    def edit_frame(self, frame: np.ndarray, frame_num: int, **kwargs) -> np.ndarray:
+        self.edited_frame_nums.append(frame_num)
+        return frame
+
+
+def test_export_warmup_skips_stateless_callbacks(tmp_path):
+    export_video(
+        EXAMPLE_VIDEO_PATH,
+        tmp_path / "recorded.mp4",
+        [FrameCounter(), EditedFrameNumsRecorder()],
+        end_frame=100,
+        num_workers=1,
+        segment_size=40,
+    )
+    # only the frame counter needs the frames before each segment
+    assert sorted(EditedFrameNumsRecorder.edited_frame_nums) == list(range(100))
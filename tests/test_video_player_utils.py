@@ -0,0 +1,21 @@
+import numpy as np
+
+from test_utils import change_cwd_to_tests_dir, add_project_root_to_path
+
+change_cwd_to_tests_dir()
+add_project_root_to_path()
+
+from cvvideoplayer.utils.video_player_utils import hist_eq
+
+
+def test_hist_eq_with_max_value():
+    rng = np.random.default_rng(0)
+    for dtype, max_value in ((np.uint8, 255), (np.uint16, 65535)):
+        frame = rng.integers(0, max_value // 2, size=(40, 60, 3)).astype(dtype)
+        frame[0, 0] = max_value  # pixels of the maximal value used to be out of the look-up table
+        equalized_frame = hist_eq(frame, max_value)
+        assert equalized_frame.dtype == dtype and equalized_frame.shape == frame.shape
+        # the equalized values span the whole range and keep the order of the values
+        assert equalized_frame.min() == 0 and equalized_frame[0, 0, 0] == max_value
+        order = np.argsort(frame, axis=None, kind="stable")
+        assert np.all(np.diff(equalized_frame.flatten()[order].astype(int)) >= 0)